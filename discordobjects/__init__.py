@@ -1,6 +1,6 @@
 from . import exceptions
 from . import discordpermissions
-from .client import DiscordClientAsync
+from .client import DiscordClientAsync, Priority
 from .constants import SocketEventNames
 from .dynamic import (CommandHandle, LiveGuildRoles, LiveGuildMembers, LiveGuildChannels,
                       Canvas, CommandCallback, VoiceStateManager)
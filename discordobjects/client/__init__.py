@@ -1,2 +1,6 @@
+from .attachment_downloader import AttachmentDownloader
 from .client_async import DiscordClientAsync
 from .client_sync import DiscordClientSync
+from .priority import Priority
+from .negative_cache import NegativeCache
+from .rest_cache import RestCache
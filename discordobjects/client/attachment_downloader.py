@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import typing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import Session as RequestsSession
+
+
+class AttachmentDownloader:
+    """
+    Downloads attachments from Discord CDN into content-addressed disk cache.
+
+    Files are streamed to disk in chunks and stored under the sha256 hash of their contents,
+    so the same file posted several times is stored once. Index file maps URLs to the hashes.
+    Once the cache grows over max_size bytes the least recently used files are removed.
+
+    Concurrent downloads of the same URL share one request.
+    Downloads are made with their own requests session in the thread executor, without the bot token.
+    Checking and removing cached files and saving the index also run in the executor. The index is saved
+    at most once every index_save_delay seconds, URLs downloaded in the last index_save_delay seconds
+    before the process exits are downloaded again by the next process.
+    """
+    INDEX_FILE_NAME = 'index.json'
+
+    def __init__(self, cache_directory: str = None, max_size: int = 1024 * 1024 * 1024,
+                 chunk_size: int = 64 * 1024, max_workers: int = 4, timeout: float = 30,
+                 index_save_delay: float = 5):
+        if cache_directory is None:
+            cache_directory = os.path.join(tempfile.gettempdir(), 'discordobjects_attachments')
+        os.makedirs(cache_directory, exist_ok=True)
+
+        self.cache_directory = cache_directory
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.index_save_delay = index_save_delay
+        self.executor = ThreadPoolExecutor(max_workers, 'attachment_downloader thread executor')
+        self.session = RequestsSession()
+
+        self.downloads: typing.Dict[str, asyncio.Future] = {}
+        self.url_index: typing.Dict[str, str] = {}
+        # NOTE: file sizes ordered from least to most recently used
+        self.files: typing.MutableMapping[str, int] = OrderedDict()
+        self.size: int = 0
+        # NOTE: evicted files are removed in the executor, files of the same contents written by downloads
+        #  in the meantime are kept. Both sides check under files_lock.
+        self.files_lock = threading.Lock()
+        self.writing_hashes: typing.Dict[str, int] = {}
+        self.index_save_task: typing.Optional[asyncio.Task] = None
+        self.index_save_lock: typing.Optional[asyncio.Lock] = None
+        self._cache_load()
+
+    def _file_path_get(self, content_hash: str) -> str:
+        return os.path.join(self.cache_directory, content_hash[:2], content_hash)
+
+    def _cache_load(self) -> None:
+        stored_files = []
+        for directory_path, _, file_names in os.walk(self.cache_directory):
+            for file_name in file_names:
+                if directory_path == self.cache_directory:
+                    if file_name.endswith('.tmp'):
+                        # NOTE: left over from download that was interrupted
+                        os.remove(os.path.join(directory_path, file_name))
+                    continue
+                file_stat = os.stat(os.path.join(directory_path, file_name))
+                stored_files.append((file_stat.st_mtime, file_name, file_stat.st_size))
+
+        for _, content_hash, file_size in sorted(stored_files):
+            self.files[content_hash] = file_size
+            self.size += file_size
+
+        try:
+            with open(os.path.join(self.cache_directory, self.INDEX_FILE_NAME)) as index_file:
+                self.url_index = {k: v for k, v in json.load(index_file).items() if v in self.files}
+        except (FileNotFoundError, ValueError):
+            self.url_index = {}
+
+    def _index_save(self, url_index: typing.Dict[str, str]) -> None:
+        index_path = os.path.join(self.cache_directory, self.INDEX_FILE_NAME)
+        with open(index_path + '.tmp', 'w') as index_file:
+            json.dump(url_index, index_file)
+        os.replace(index_path + '.tmp', index_path)
+
+    def _index_save_schedule(self) -> None:
+        if self.index_save_task is None:
+            self.index_save_task = asyncio.ensure_future(self._index_save_delayed())
+
+    async def _index_save_delayed(self) -> None:
+        await asyncio.sleep(self.index_save_delay)
+        # NOTE: changes made from now on schedule the next save
+        self.index_save_task = None
+        if self.index_save_lock is None:
+            self.index_save_lock = asyncio.Lock()
+        # NOTE: index is copied under the lock so an older copy never replaces a newer one
+        async with self.index_save_lock:
+            await asyncio.get_event_loop().run_in_executor(self.executor, self._index_save, dict(self.url_index))
+
+    async def cached_path_get(self, url: str) -> typing.Optional[str]:
+        """
+        Returns path of the cached file of the URL or None if it was not downloaded.
+        """
+        content_hash = self.url_index.get(url)
+        if content_hash is None:
+            return None
+
+        file_path = self._file_path_get(content_hash)
+        if not await asyncio.get_event_loop().run_in_executor(self.executor, self._file_touch, file_path):
+            # NOTE: cache directory was cleaned from outside
+            if self.url_index.get(url) == content_hash:
+                del self.url_index[url]
+            self.size -= self.files.pop(content_hash, 0)
+            return None
+
+        if content_hash in self.files:
+            self.files.move_to_end(content_hash)
+        return file_path
+
+    @staticmethod
+    def _file_touch(file_path: str) -> bool:
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def download(self, url: str) -> str:
+        """
+        Returns path of the cached file with the contents of the URL, downloading it if needed.
+        File may be removed from the cache by later downloads, copy it if it has to be kept.
+        """
+        file_path = await self.cached_path_get(url)
+        if file_path is not None:
+            return file_path
+
+        try:
+            download_future = self.downloads[url]
+        except KeyError:
+            download_future = asyncio.ensure_future(self._download(url))
+            self.downloads[url] = download_future
+            download_future.add_done_callback(lambda _: self.downloads.pop(url, None))
+
+        # NOTE: cancelling one of the waiters does not cancel the download for the others
+        return await asyncio.shield(download_future)
+
+    async def read(self, url: str) -> bytes:
+        """
+        Returns contents of the URL, downloading it if needed.
+        """
+        file_path = await self.download(url)
+        return await asyncio.get_event_loop().run_in_executor(self.executor, self._file_read, file_path)
+
+    @staticmethod
+    def _file_read(file_path: str) -> bytes:
+        with open(file_path, 'rb') as file:
+            return file.read()
+
+    async def _download(self, url: str) -> str:
+        content_hash, file_size = await asyncio.get_event_loop().run_in_executor(
+            self.executor, self._download_blocking, url)
+
+        with self.files_lock:
+            if content_hash not in self.files:
+                self.size += file_size
+            self.files[content_hash] = file_size
+            self.files.move_to_end(content_hash)
+            self._writing_hash_release(content_hash)
+        self.url_index[url] = content_hash
+
+        evicted_hashes = self._evict()
+        self._index_save_schedule()
+        if evicted_hashes:
+            await asyncio.get_event_loop().run_in_executor(self.executor, self._files_remove, evicted_hashes)
+        return self._file_path_get(content_hash)
+
+    def _writing_hash_release(self, content_hash: str) -> None:
+        self.writing_hashes[content_hash] -= 1
+        if self.writing_hashes[content_hash] == 0:
+            del self.writing_hashes[content_hash]
+
+    def _download_blocking(self, url: str) -> typing.Tuple[str, int]:
+        content_hash = hashlib.sha256()
+        file_size = 0
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file, \
+                    self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(self.chunk_size):
+                    file.write(chunk)
+                    content_hash.update(chunk)
+                    file_size += len(chunk)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        content_hash = content_hash.hexdigest()
+        # NOTE: released by _download once the file is in the cache again
+        with self.files_lock:
+            self.writing_hashes[content_hash] = self.writing_hashes.get(content_hash, 0) + 1
+        try:
+            file_path = self._file_path_get(content_hash)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            with self.files_lock:
+                self._writing_hash_release(content_hash)
+            os.remove(temporary_path)
+            raise
+
+        return content_hash, file_size
+
+    def _evict(self) -> typing.Set[str]:
+        """
+        Drops least recently used files from the cache until it fits max_size. Returns hashes of the files to remove.
+        """
+        evicted_hashes = set()
+        # NOTE: the most recently used file is kept even if it alone is over the limit
+        while self.size > self.max_size and len(self.files) > 1:
+            content_hash, file_size = self.files.popitem(last=False)
+            self.size -= file_size
+            evicted_hashes.add(content_hash)
+
+        if evicted_hashes:
+            self.url_index = {k: v for k, v in self.url_index.items() if v not in evicted_hashes}
+        return evicted_hashes
+
+    def _files_remove(self, content_hashes: typing.Set[str]) -> None:
+        for content_hash in content_hashes:
+            with self.files_lock:
+                # NOTE: same contents were downloaded again after the file was evicted
+                if content_hash in self.files or content_hash in self.writing_hashes:
+                    continue
+                try:
+                    os.remove(self._file_path_get(content_hash))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,77 @@
+import asyncio
+import typing
+from collections import OrderedDict
+from inspect import signature
+
+from ..discordrest import Route
+
+CallArguments = typing.Union[tuple, dict]
+ProgressCallback = typing.Callable[[int, int], None]
+
+
+def _major_arguments_get(method_signature, call_arguments: CallArguments) -> tuple:
+    if isinstance(call_arguments, dict):
+        bound_arguments = method_signature.bind_partial(**call_arguments).arguments
+    else:
+        bound_arguments = method_signature.bind_partial(*call_arguments).arguments
+    return tuple(bound_arguments.get(x) for x in Route.MAJOR_PARAMETERS)
+
+
+async def batch_map(method: typing.Callable[..., typing.Awaitable],
+                    arguments_iterable: typing.Iterable[CallArguments],
+                    concurrency: int = 16,
+                    progress_callback: ProgressCallback = None,
+                    group_concurrency: int = 10) -> typing.List[typing.Any]:
+    """
+    Calls the client method with each of the arguments and returns results in the same order.
+    Exceptions raised by the calls are returned in place of the results.
+
+    Calls are grouped by their major parameters (channel_id, guild_id, webhook_id) which approximates
+    the rate limit buckets. Up to group_concurrency calls of a group are handed to the rate limiter at once,
+    the bucket runs as many of them in parallel as Discord reports remaining and queues the rest.
+    Up to concurrency groups are worked on at the same time, so one large group does not hold back the others.
+
+    :param method: client method, for example client.guild_member_role_add
+    :param arguments_iterable: tuples of positional arguments or dicts of keyword arguments
+    :param concurrency: number of groups called in parallel
+    :param progress_callback: called with number of completed calls and total number of calls
+    :param group_concurrency: number of calls of one group waiting for the rate limiter at the same time
+    """
+    arguments_list = list(arguments_iterable)
+    total = len(arguments_list)
+    results: typing.List[typing.Any] = [None] * total
+    completed = 0
+
+    method_signature = signature(method)
+    groups: typing.MutableMapping[tuple, typing.List[int]] = OrderedDict()
+    for index, call_arguments in enumerate(arguments_list):
+        groups.setdefault(_major_arguments_get(method_signature, call_arguments), []).append(index)
+
+    pending_groups = iter(groups.values())
+
+    async def call_worker(pending_indexes: typing.Iterator[int]) -> None:
+        nonlocal completed
+        for index in pending_indexes:
+            call_arguments = arguments_list[index]
+            try:
+                if isinstance(call_arguments, dict):
+                    results[index] = await method(**call_arguments)
+                else:
+                    results[index] = await method(*call_arguments)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[index] = e
+
+            completed += 1
+            if progress_callback is not None:
+                progress_callback(completed, total)
+
+    async def group_worker() -> None:
+        for group in pending_groups:
+            # NOTE: workers of the group share the iterator so every call is made once
+            pending_indexes = iter(group)
+            await asyncio.gather(*(call_worker(pending_indexes) for _ in range(min(group_concurrency, len(group)))))
+
+    await asyncio.gather(*(group_worker() for _ in range(min(concurrency, len(groups)))))
+    return results
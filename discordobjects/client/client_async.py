@@ -2,350 +2,228 @@ import asyncio
 import typing
 from _functools import partial as f_partial
 
-from .rate_limit_simple import RateLimitSimple
+from .attachment_downloader import AttachmentDownloader
+from .batch import batch_map, CallArguments, ProgressCallback
+from .history_scan import history_scan
+from .prefetch import prefetch_pages
+from .priority import Priority, request_priority
+from .rate_limit_buckets import RateLimitBuckets
+from .request_coalescing import RequestCoalescer, call_key_get
+from .negative_cache import NegativeCache
+from .rest_cache import RestCache
 from ..constants import SocketEventNames
-from ..discordrest import DiscordSession
+from ..discordrest import DiscordSession, Route, route_methods_generate
+from ..discordrest_aiohttp import DiscordSessionAiohttp
 from ..discordsocket_thread import DiscordSocketThread
+from ..shard_manager import ShardManager, ProcessShardManager, EventFilters
+from ..exceptions import RestError
+from ..multipart_body import FilesList
+from ..util import snowflake_age
 
 
 class DiscordClientAsync:
 
     def __init__(self, token: str, use_socket: bool = True, proxies: dict = None,
-                 event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()):
-        self.rest_session = DiscordSession(token, proxies)
+                 event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop(),
+                 transport: str = 'requests', executor_workers: int = 8,
+                 pool_connections: int = 10, pool_maxsize: int = 10, keep_alive: bool = True,
+                 coalesce_requests: bool = True, cache: RestCache = None,
+                 negative_cache: NegativeCache = None, attachment_downloader: AttachmentDownloader = None,
+                 shard_count: typing.Union[int, str] = None, shards_per_process: int = None,
+                 shard_event_filters: EventFilters = None):
+        """
+        :param transport: 'requests' runs REST calls with requests in the thread executor,
+            'aiohttp' runs them on the event loop (requires aiohttp)
+        :param executor_workers: number of threads running requests calls in parallel
+        :param pool_connections: number of hosts to keep connection pools for (requests transport)
+        :param pool_maxsize: maximum number of connections kept open to a single host
+        :param keep_alive: keep connections open between the calls (requests transport)
+        :param coalesce_requests: identical GET calls in flight at the same time share one request
+        :param cache: cache for GET calls. Entries are invalidated by socket events if socket is used.
+        :param negative_cache: remembers Unknown* errors and raises them without making the calls.
+            Entries are dropped by the create socket events if socket is used.
+        :param attachment_downloader: downloader with disk cache used by attachment_download and attachment_read.
+            Default one caching in the temporary directory is created on first use.
+        :param shard_count: number of gateway shards or 'auto' to use the number recommended by gateway_bot_get.
+            Single socket without sharding is used if None.
+        :param shards_per_process: run shards in worker processes with this many shards in each.
+            Shards run in the thread of this process if None.
+        :param shard_event_filters: event name to function called with the event dict in the worker process,
+            events for which it returns False are not sent to this process. Requires shards_per_process.
+        """
+        if transport == 'requests':
+            self.rest_session = DiscordSession(token, proxies, pool_connections, pool_maxsize, keep_alive)
+        elif transport == 'aiohttp':
+            self.rest_session = DiscordSessionAiohttp(token, proxies, pool_size=pool_maxsize)
+        else:
+            raise ValueError(f"Unknown REST transport: {transport}")
         self.event_loop = event_loop
         # TODO: custom rate limiters
-        self.rate_limit = RateLimitSimple(self.event_loop)
-        self.socket_thread = None
-        # TODO: sharding
+        self.rate_limit = RateLimitBuckets(self.event_loop, route_key_function=self.rest_session.route_key_get,
+                                           max_workers=executor_workers,
+                                           asynchronous_transport=transport == 'aiohttp')
+        self.request_coalescer = RequestCoalescer() if coalesce_requests else None
+        self.cache = cache
+        self.negative_cache = negative_cache
+        self.attachment_downloader = attachment_downloader
+        self.socket_thread: typing.Union[DiscordSocketThread, ShardManager] = None
         if use_socket:
-            self.socket_thread = DiscordSocketThread(token)
-
-    async def user_get(self, user_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.user_get, user_id))
-
-    # region Current User functions
-    async def me_get(self) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.me_get))
-
-    async def me_modify(self, username: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.me_modify, username))
-
-    async def me_guild_list(self, before: str = None, after: str = None, limit: int = None) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.me_guild_list, before, after, limit))
-
-    async def me_guild_leave(self, guild_id: str) -> bool:
-        return await self.rate_limit(f_partial(self.rest_session.me_guild_leave, guild_id))
-
-    async def me_connections_get(self) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.me_connections_get))
-
-    async def me_dm_list(self) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.me_dm_list))
-    # endregion
-
-    # region Direct Messaging (DM) functions
-    async def dm_create(self, recipient_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.dm_create, recipient_id))
-
-    async def dm_create_group(self, access_tokens: list, nicks: dict) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.dm_create_group, access_tokens, nicks))
-
-    async def dm_channel_user_add(self, channel_id: str, user_id: str, access_token: str, user_nick: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.dm_user_add,
-                                               channel_id, user_id, access_token, user_nick))
-
-    async def dm_channel_user_remove(self, channel_id: str, user_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.dm_user_remove, channel_id, user_id))
-    # endregion
-
-    # region Guild
-    async def guild_create(self, guild_name: str, region: str = None, icon: str = None, verification_level: int = None,
-                           default_message_notifications: int = None, roles=None, channels=None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_create,
-            guild_name, region, icon, verification_level, default_message_notifications, roles, channels))
-
-    async def guild_get(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_get, guild_id))
-
-    async def guild_modify(
-            self, guild_id: str, new_name: str = None, new_voice_region_id: str = None,
-            new_verification_level: int = None, new_default_level_notifications: int = None,
-            new_explicit_content_filter: int = None, new_afk_channel_id: str = None,
-            new_afk_timeout: int = None, new_icon: str = None, new_owner: str = None,
-            new_splash: str = None, new_system_channel_id: str = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_modify,
-            guild_id, new_name, new_voice_region_id,
-            new_verification_level, new_default_level_notifications,
-            new_explicit_content_filter, new_afk_channel_id,
-            new_afk_timeout, new_icon, new_owner,
-            new_splash, new_system_channel_id
-            ))
-
-    async def guild_delete(self, guild_id: str) -> bool:
-        return await self.rate_limit(f_partial(self.rest_session.guild_delete, guild_id))
-
-    # region Guild Channels
-    async def guild_channel_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_channel_list, guild_id))
-
-    async def guild_channel_create_text(
-            self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-            parent_id: str = None, nsfw: bool = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_channel_create_text,
-            guild_id, name, permission_overwrites, parent_id, nsfw))
-
-    async def guild_channel_create_voice(
-            self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-            parent_id: str = None, nsfw: bool = None, bitrate: int = None, user_limit: int = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_channel_create_voice,
-            guild_id, name, permission_overwrites, parent_id, nsfw, bitrate, user_limit))
-
-    async def guild_channel_create_category(
-            self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-            nsfw: bool = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_channel_create_category,
-            guild_id, name, permission_overwrites, nsfw))
-
-    async def guild_channels_position_modify(
-            self, guild_id: str,
-            list_of_channels: typing.List[typing.Dict[str, int]]) -> bool:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_channels_position_modify,
-            guild_id, list_of_channels))
+            if shard_count is None:
+                self.socket_thread = DiscordSocketThread(token)
+            elif shards_per_process is None:
+                self.socket_thread = ShardManager(token, None if shard_count == 'auto' else shard_count)
+            else:
+                self.socket_thread = ProcessShardManager(token, None if shard_count == 'auto' else shard_count,
+                                                         shards_per_process, shard_event_filters)
+            if self.cache is not None or self.negative_cache is not None:
+                self.event_loop.create_task(self._cache_invalidation())
+
+    async def _rest_call(self, api_call_partial: f_partial) -> typing.Union[dict, list, bool]:
+        if self.negative_cache is None:
+            return await self._rest_call_cached(api_call_partial)
+
+        self.negative_cache.check(api_call_partial)
+        try:
+            return await self._rest_call_cached(api_call_partial)
+        except RestError as e:
+            self.negative_cache.remember(api_call_partial, e)
+            raise
+
+    async def _rest_call_cached(self, api_call_partial: f_partial) -> typing.Union[dict, list, bool]:
+        route = self.rest_session.route_get(api_call_partial)
+        if route is None or route.method != 'GET':
+            return await self.rate_limit(api_call_partial)
+
+        call_key = call_key_get(api_call_partial)
+
+        if self.cache is not None and self.cache.is_cached_endpoint(call_key):
+            try:
+                return self.cache.get(call_key)
+            except KeyError:
+                pass
+            cache_generation = self.cache.generation
+        else:
+            cache_generation = None
 
-    # endregion
+        if self.request_coalescer is None:
+            response_data = await self.rate_limit(api_call_partial)
+        else:
+            response_data = await self.request_coalescer(call_key, f_partial(self.rate_limit, api_call_partial))
+
+        if cache_generation is not None:
+            self.cache.put(call_key, response_data, cache_generation)
+        return response_data
+
+    async def _cache_invalidation(self) -> None:
+        cache_events = frozenset(RestCache.INVALIDATING_EVENTS) if self.cache is not None else frozenset()
+        negative_cache_events = (frozenset(NegativeCache.CLEARING_EVENTS) if self.negative_cache is not None
+                                 else frozenset())
+
+        async for event_dict, event_name in self.event_gen_multiple(tuple(cache_events | negative_cache_events)):
+            if event_name in cache_events:
+                self.cache.event_handle(event_dict, event_name)
+            if event_name in negative_cache_events:
+                self.negative_cache.event_handle(event_dict, event_name)
+
+    @staticmethod
+    def priority(priority: Priority) -> typing.ContextManager:
+        """
+        Context manager that sets priority of REST calls made inside it.
+        Calls with INTERACTIVE priority overtake queued BULK calls of the same bucket.
+        """
+        return request_priority(priority)
+
+    async def map(self, method: typing.Callable[..., typing.Awaitable],
+                  arguments_iterable: typing.Iterable[CallArguments], concurrency: int = 16,
+                  progress_callback: ProgressCallback = None,
+                  group_concurrency: int = 10) -> typing.List[typing.Any]:
+        """
+        Runs many independent calls of the method concurrently across rate limit buckets.
+        Returns results (or raised exceptions) in the order of the arguments.
+
+        await client.map(client.guild_member_role_add, ((guild_id, x, role_id) for x in user_ids))
+        """
+        return await batch_map(method, arguments_iterable, concurrency, progress_callback, group_concurrency)
+
+    async def attachment_download(self, url: str) -> str:
+        """
+        Downloads attachment into the disk cache and returns path of the file.
+        """
+        return await self._attachment_downloader_get().download(url)
+
+    async def attachment_read(self, url: str) -> bytes:
+        """
+        Downloads attachment into the disk cache and returns its contents.
+        """
+        return await self._attachment_downloader_get().read(url)
+
+    def _attachment_downloader_get(self) -> AttachmentDownloader:
+        if self.attachment_downloader is None:
+            self.attachment_downloader = AttachmentDownloader()
+        return self.attachment_downloader
+
+    # NOTE: plain REST calls are generated from the routes, see _route_method_source_get
 
     # region Guild Members
-    async def guild_member_get(self, guild_id: str, user_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_member_get, guild_id, user_id))
-
-    async def guild_members_list(self, guild_id: str, limit: int = None, after: str = None) -> typing.List[dict]:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_member_list,
-            guild_id, limit, after))
-
-    async def guild_member_iter(self, guild_id: str, step_size: int = 1000) -> typing.AsyncGenerator[dict, None]:
-        downloaded_member_dicts: typing.List[dict] = await self.guild_members_list(guild_id, limit=step_size)
-
-        while len(downloaded_member_dicts) != 0:
+    async def guild_member_iter(self, guild_id: str, step_size: int = 1000, after: str = None,
+                                prefetch_depth: int = 1,
+                                prefetch_max_items: int = 10000) -> typing.AsyncGenerator[dict, None]:
+        async for downloaded_member_dicts in prefetch_pages(
+                lambda last_member_id: self.guild_members_list(guild_id, limit=step_size, after=last_member_id),
+                lambda page: page[-1]['user']['id'],
+                after, prefetch_depth, prefetch_max_items):
             for d in downloaded_member_dicts:
                 yield d
-            last_member_id = downloaded_member_dicts[-1]['user']['id']
-            downloaded_member_dicts[:] = await self.guild_members_list(guild_id, limit=step_size, after=last_member_id)
-
-    async def guild_member_add(self, guild_id: str, user_id: str, access_token: str, nick: str = None,
-                               roles: list = None, mute: bool = None, deaf: bool = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_member_add,
-            guild_id, user_id, access_token, nick, roles, mute, deaf))
-
-    async def guild_member_modify(
-            self, guild_id: str, user_id: str, new_nick: str = None, new_roles: list = None,
-            new_mute: bool = None, new_deaf: bool = None, new_channel_id: str = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_member_modify,
-                guild_id, user_id, new_nick, new_roles,
-                new_mute, new_deaf, new_channel_id,
-            ))
-
-    async def guild_member_me_nick_set(self, guild_id: str, nick_to_set: str) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_member_me_nick_set,
-                guild_id, nick_to_set))
-
-    async def guild_member_role_add(self, guild_id: str, user_id: str, role_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_member_role_add,
-                guild_id, user_id, role_id),
-            ("Guild member role manipulation: ", guild_id))
-
-    async def guild_member_role_remove(self, guild_id: str, user_id: str, role_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_member_role_remove,
-                guild_id, user_id, role_id),
-            ("Guild member role manipulation: ", guild_id))
-
-    async def guild_member_remove(self, guild_id: str, user_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_member_remove,
-                guild_id, user_id))
-
-    # endregion
-
-    async def guild_ban_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_ban_list, guild_id))
-
-    async def guild_ban_create(self, guild_id: str, user_id: str, delete_messages_days=None) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_ban_create,
-                guild_id, user_id, delete_messages_days))
-
-    async def guild_ban_remove(self, guild_id: str, user_id: str) -> bool:
-        return await self.rate_limit(f_partial(self.rest_session.guild_ban_remove, guild_id, user_id))
-
-    # region Guild Roles
-    async def guild_role_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_role_list, guild_id))
-
-    async def guild_role_create(self, guild_id: str, name: str = None, permissions: int = None,
-                                color: int = None, hoist: bool = None,
-                                mentionable: bool = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_role_create,
-                guild_id, name, permissions, color, hoist, mentionable))
-
-    async def guild_role_position_modify(self, guild_id: str,
-                                         list_of_role_positions: typing.List[typing.Dict[str, int]]) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_role_position_modify,
-                guild_id, list_of_role_positions))
-
-    async def guild_role_modify(
-            self,
-            guild_id: str, role_id: str, new_name: str = None, new_permissions: int = None, new_color: int = None,
-            new_hoist: bool = None, new_mentionable: bool = None) -> dict:
-        return await self.rate_limit(f_partial(
-            self.rest_session.guild_role_modify,
-            guild_id, role_id, new_name, new_permissions, new_color,
-            new_hoist, new_mentionable))
-
-    async def guild_role_delete(self, guild_id: str, role_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_role_delete, guild_id, role_id))
-
-    # endregion
-
-    async def guild_prune_get_count(self, guild_id: str, days: int) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_prune_get_count, guild_id, days))
-
-    async def guild_prune_begin(self, guild_id: str, days: int) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_prune_begin, guild_id, days))
-
-    async def guild_voice_region_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_voice_region_list, guild_id))
-
-    async def guild_invite_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_invite_list, guild_id))
-
-    async def guild_integration_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_integration_list, guild_id))
-
-    async def guild_integration_create(self, guild_id: str, integration_type: str, integration_id: str) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_integration_create,
-                guild_id, integration_type, integration_id))
-
-    async def guild_integration_modify(self, guild_id: str, integration_id: str,
-                                       expire_behavior: int, expire_grace_period: int, enable_emoticons: int) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_integration_modify,
-                guild_id, integration_id, expire_behavior, expire_grace_period, enable_emoticons))
-
-    async def guild_integration_delete(self, guild_id: str, integration_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_integration_delete, guild_id, integration_id))
-
-    async def guild_integration_sync(self, guild_id: str, integration_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_integration_sync, guild_id, integration_id))
-
-    async def guild_embed_get(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_embed_get, guild_id))
-
-    async def guild_embed_modify(self, guild_id: str, enabled: bool = None, channel_id: str = None) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_embed_modify, guild_id, enabled, channel_id))
-
-    # region Guild Emoji
-    async def guild_emoji_list(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_emoji_list, guild_id))
-
-    async def guild_emoji_get(self, guild_id: str, emoji_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_emoji_get, guild_id, emoji_id))
-
-    async def guild_emoji_create(self, guild_id: str, emoji_name: str, image: str, roles: tuple = ()) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_emoji_create,
-                guild_id, emoji_name, image, roles))
-
-    async def guild_emoji_modify(self, guild_id: str, emoji_id: str, emoji_name: str, roles: tuple = ()) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.guild_emoji_modify,
-                guild_id, emoji_id, emoji_name, roles))
-
-    async def guild_emoji_delete(self, guild_id: str, emoji_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.guild_emoji_delete, guild_id, emoji_id))
-
-    # endregion
     # endregion
 
     # region Channel functions
-    async def channel_get(self, channel_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.channel_get, channel_id))
-
-    async def channel_modify(
-            self, channel_id: str, new_name: str = None, new_position: int = None, new_topic: str = None,
-            new_nsfw: bool = None,
-            new_bitrate: int = None, new_user_limit: int = None, new_overwrite_array: list = None,
-            new_parent_id: str = None):
-        params = {}
-        if new_name is not None:
-            params['name'] = new_name
-        if new_position is not None:
-            params['position'] = new_position
-        if new_topic is not None:
-            params['topic'] = new_topic
-        if new_nsfw is not None:
-            params['nsfw'] = new_nsfw
-        if new_bitrate is not None:
-            params['bitrate'] = new_bitrate
-        if new_user_limit is not None:
-            params['userlimit'] = new_user_limit
-        if new_overwrite_array is not None:
-            params['permission_overwrites'] = new_overwrite_array
-        if new_parent_id is not None:
-            params['parent_id'] = new_parent_id
-        return await self.rate_limit(f_partial(self.rest_session.channel_modify, channel_id, params))
-
-    async def channel_delete(self, channel_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.channel_delete, channel_id))
-
-    async def channel_message_list(self, channel_id: str, limit: int = None,
-                                   around: int = None, before: str = None, after: str = None) -> typing.List[dict]:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_list,
-                channel_id, limit, around, before, after))
-
-    async def channel_message_iter(self, channel_id: str, step_size: int = 100) -> typing.AsyncGenerator[dict, None]:
-        downloaded_messages_dicts: typing.List[dict] = await self.channel_message_list(channel_id, limit=step_size)
-
-        while len(downloaded_messages_dicts) != 0:
+    async def channel_message_iter(self, channel_id: str, step_size: int = 100, before: str = None,
+                                   prefetch_depth: int = 1,
+                                   prefetch_max_items: int = 10000) -> typing.AsyncGenerator[dict, None]:
+        async for downloaded_messages_dicts in prefetch_pages(
+                lambda last_message_id: self.channel_message_list(channel_id, limit=step_size,
+                                                                  before=last_message_id),
+                lambda page: page[-1]['id'],
+                before, prefetch_depth, prefetch_max_items):
             for d in downloaded_messages_dicts:
                 yield d
-            last_message_id = downloaded_messages_dicts[-1]['id']
-            downloaded_messages_dicts[:] = await self.channel_message_list(channel_id,
-                                                                           limit=step_size, before=last_message_id)
 
-    async def channel_message_get(self, channel_id: str, message_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.channel_message_get, channel_id, message_id))
+    async def channel_message_scan(self, channel_id: str, window_count: int = 4, ordered: bool = True,
+                                   after: str = None, before: str = None,
+                                   step_size: int = 100) -> typing.AsyncGenerator[dict, None]:
+        """
+        Scans channel history split into window_count time windows that are downloaded in parallel.
+        The windows share the rate limit bucket of the channel, so at most as many pages are downloaded
+        at once as Discord reports remaining calls in that bucket.
+
+        By default scans from the creation of the channel up to the current time.
+        With ordered the messages are yielded newest first, otherwise as soon as they are downloaded.
+
+        :param after: only scan messages newer than this snowflake
+        :param before: only scan messages older than this snowflake
+        """
+        async def window_iter(window_after: str, window_before: str) -> typing.AsyncGenerator[dict, None]:
+            # NOTE: no prefetch and no page past the window start, the next window already downloads it
+            async for downloaded_messages_dicts in prefetch_pages(
+                    lambda last_message_id: self.channel_message_list(channel_id, limit=step_size,
+                                                                      before=last_message_id),
+                    lambda page: (page[-1]['id']
+                                  if len(page) == step_size and int(page[-1]['id']) > int(window_after)
+                                  else None),
+                    window_before, 0):
+                for d in downloaded_messages_dicts:
+                    yield d
+
+        async for message_dict in history_scan(window_iter, after if after is not None else channel_id,
+                                               before, window_count, ordered):
+            yield message_dict
 
     async def channel_message_create(self, channel_id: str, content: str, nonce: bool = None, tts: bool = None,
-                                     embed: dict = None, files_tuples: typing.Tuple[str, bytes] = None) -> dict:
+                                     embed: dict = None, files_tuples: FilesList = None) -> dict:
+        """
+        :param files_tuples: files in the format of requests files argument, for example [('file', ('a.png', data))].
+            Data can be bytes, memoryview, mmap, os.PathLike path or binary file object and is streamed without copying.
+        """
         if files_tuples is None:
             fp = f_partial(
                 self.rest_session.channel_message_create_json,
@@ -355,182 +233,86 @@ class DiscordClientAsync:
                 self.rest_session.channel_message_create_multipart,
                 channel_id, content, nonce, tts, files_tuples)
 
-        return await self.rate_limit(fp, ('Channel Message create|edit_async', channel_id))
-
-    async def channel_message_reaction_create(self, channel_id: str, message_id: str, emoji: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_reaction_create,
-                channel_id, message_id, emoji),
-            ('Emoji channel:', channel_id))
-
-    async def channel_message_reaction_my_delete(self, channel_id: str, message_id: str, emoji: int) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_reaction_my_delete,
-                channel_id, message_id, emoji))
-
-    async def channel_message_reaction_delete(self, channel_id: str, message_id: str, user_id: str,
-                                              emoji: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_reaction_delete,
-                channel_id, message_id, user_id, emoji))
-
-    async def channel_message_reaction_list_users(self, channel_id: str, message_id: str,
-                                                  emoji: str, before: str = None,
-                                                  after: str = None, limit: int = None) -> typing.List[dict]:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_reaction_list_users,
-                channel_id, message_id, emoji, before, after, limit))
+        return await self._rest_call(fp)
 
     async def channel_message_reaction_iter_users(self, channel_id: str, message_id: str, emoji: str,
-                                                  step_size: int = 100) -> typing.AsyncGenerator[dict, None]:
-        downloaded_users_dicts: typing.List[dict] = await self.channel_message_reaction_list_users(
-            channel_id, message_id, emoji, limit=step_size)
-
-        while len(downloaded_users_dicts) != 0:
+                                                  step_size: int = 100, prefetch_depth: int = 1,
+                                                  prefetch_max_items: int = 10000
+                                                  ) -> typing.AsyncGenerator[dict, None]:
+        async for downloaded_users_dicts in prefetch_pages(
+                lambda last_user_id: self.channel_message_reaction_list_users(
+                    channel_id, message_id, emoji, limit=step_size, after=last_user_id),
+                lambda page: page[-1]['id'],
+                None, prefetch_depth, prefetch_max_items):
             for d in downloaded_users_dicts:
                 yield d
-            last_user_id = downloaded_users_dicts[-1]['id']
-            downloaded_users_dicts[:] = await self.channel_message_reaction_list_users(
-                channel_id, message_id, emoji, limit=step_size, after=last_user_id)
-
-    async def channel_message_reaction_delete_all(self, channel_id: str, message_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_reaction_delete_all,
-                channel_id, message_id),
-            ('Emoji channel:', channel_id))
-
-    async def channel_message_edit(self, channel_id: str, message_id: str, content: str = None,
-                                   embed: dict = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_edit,
-                channel_id, message_id, content, embed),
-            ('Channel Message create|edit_async', channel_id))
-
-    async def channel_message_delete(self, channel_id: str, message_id: str) -> bool:
-        return await self.rate_limit(f_partial(self.rest_session.channel_message_delete, channel_id, message_id))
-
-    async def channel_message_bulk_delete(self, channel_id: str, messages_array: list) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_message_bulk_delete,
-                channel_id, messages_array))
-
-    async def channel_permissions_overwrite_edit(self, channel_id: str, overwrite_id: str, allow_permissions: int,
-                                                 deny_permissions: int, type_of_permissions: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_permissions_overwrite_edit,
-                channel_id, overwrite_id, allow_permissions, deny_permissions, type_of_permissions))
-
-    async def channel_permissions_overwrite_delete(self, channel_id: str, overwrite_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_permissions_overwrite_delete,
-                channel_id, overwrite_id))
-
-    async def channel_invite_list(self, channel_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.channel_invite_list, channel_id))
-
-    async def channel_invite_create(self, channel_id: str, max_age: int = None, max_uses: int = None,
-                                    temporary_invite: bool = None, unique: bool = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_invite_create,
-                channel_id, max_age, max_uses, temporary_invite, unique))
-
-    async def channel_typing_start(self, channel_id: str) -> bool:
-        return await self.rate_limit(f_partial(
-            self.rest_session.channel_typing_start, channel_id),
-            (self.rest_session.channel_typing_start, channel_id))
-
-    async def channel_pins_get(self, channel_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.channel_pins_get, channel_id))
-
-    async def channel_pins_add(self, channel_id: str, message_id: str) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_pins_add,
-                channel_id, message_id),
-            ('Channel pins', channel_id))
-
-    async def channel_pins_delete(self, channel_id: str, message_id: str) -> bool:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.channel_pins_delete,
-                channel_id, message_id),
-            ('Channel pins', channel_id))
 
+    BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60 - 60
+    BULK_DELETE_MAX_COUNT = 100
+
+    async def channel_message_purge(self, channel_id: str, message_filter: typing.Callable[[dict], bool] = None,
+                                    limit: int = None, before: str = None) -> int:
+        """
+        Deletes messages of the channel from newest to oldest. Returns number of messages deleted.
+
+        Messages younger than 14 days are deleted with bulk delete calls of up to 100 messages,
+        older messages are deleted one by one.
+        Next page of the history is downloaded while the previous batch is being deleted.
+
+        :param message_filter: called with message dict, only messages it returns True for are deleted
+        :param limit: maximum number of messages to delete
+        :param before: start from messages older than this message id
+        """
+        deleted_count = 0
+        batch: typing.List[str] = []
+        batch_is_old = False
+        delete_task: asyncio.Task = None
+
+        async def batch_delete(message_ids: typing.List[str], is_old: bool) -> int:
+            if is_old or len(message_ids) == 1:
+                results = await self.map(self.channel_message_delete, ((channel_id, x) for x in message_ids))
+                return sum(1 for x in results if not isinstance(x, Exception))
+
+            await self.channel_message_bulk_delete(channel_id, message_ids)
+            return len(message_ids)
+
+        async def batch_flush() -> None:
+            nonlocal deleted_count, delete_task, batch
+            if delete_task is not None:
+                deleted_count += await delete_task
+            delete_task = self.event_loop.create_task(batch_delete(batch, batch_is_old))
+            batch = []
+
+        selected_count = 0
+        try:
+            async for message_dict in self.channel_message_iter(channel_id, before=before):
+                if limit is not None and selected_count >= limit:
+                    break
+                if message_filter is not None and not message_filter(message_dict):
+                    continue
+                selected_count += 1
+
+                is_old = snowflake_age(message_dict['id']) > self.BULK_DELETE_MAX_AGE
+                if is_old != batch_is_old and batch:
+                    await batch_flush()
+                batch_is_old = is_old
+
+                batch.append(message_dict['id'])
+                if len(batch) == self.BULK_DELETE_MAX_COUNT:
+                    await batch_flush()
+
+            if batch:
+                await batch_flush()
+        finally:
+            if delete_task is not None:
+                deleted_count += await delete_task
+
+        return deleted_count
     # endregion
 
-    # region Invites functions
-    async def invite_get(self, invite_code: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.invite_get, invite_code))
-
-    async def invite_delete(self, invite_code: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.invite_delete, invite_code))
-
-    async def invite_accept(self, invite_code: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.invite_accept, invite_code))
-
-    # endregion
-
-    # region Webhook functions
-    async def webhook_create(self, channel_id: str, name: str, avatar: bytes = None) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_create, channel_id, name, avatar))
-
-    async def webhook_get_channel(self, channel_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_list_channel, channel_id))
-
-    async def webhook_guild_get(self, guild_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_list_guild, guild_id))
-
-    async def webhook_get(self, webhook_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_get, webhook_id))
-
-    async def webhook_token_get(self, webhook_id: str, webhook_token: int) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_token_get, webhook_id, webhook_token))
-
-    async def webhook_modify(self, webhook_id: str, name: str = None, avatar: bytes = None,
-                             channel_id: str = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.webhook_modify,
-                webhook_id, name, avatar, channel_id))
-
-    async def webhook_token_modify(self, webhook_id: str, webhook_token: int, name: str = None, avatar: bytes = None,
-                                   channel_id: str = None) -> dict:
-        return await self.rate_limit(
-            f_partial(self.rest_session.webhook_token_modify,
-                      webhook_id, webhook_token, name, avatar, channel_id))
-
-    async def webhook_delete(self, webhook_id: str) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_delete, webhook_id))
-
-    async def webhook_token_delete(self, webhook_id: str, webhook_token: int) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.webhook_token_delete, webhook_id, webhook_token))
-
-    async def webhook_execute(self, webhook_id: str, webhook_token: int, content: str, username: str = None,
-                              avatar_url: str = None, tts: bool = None, wait_response: bool = None) -> dict:
-        return await self.rate_limit(
-            f_partial(
-                self.rest_session.webhook_execute,
-                webhook_id, webhook_token, content, username, avatar_url, tts, wait_response),
-            ('webhook', webhook_id))
-
-    # endregion
-
-    async def voice_region_list(self) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.voice_region_list))
-
     async def audit_log_get(self, guild_id: str, filter_user_id: str = None, filter_action_type: int = None,
                             before: str = None, limit: int = None) -> typing.Tuple[dict, dict, dict]:
-        audit_response = await self.rate_limit(
+        audit_response = await self._rest_call(
             f_partial(
                 self.rest_session.audit_log_get,
                 guild_id, filter_user_id, filter_action_type, before, limit))
@@ -538,24 +320,33 @@ class DiscordClientAsync:
         return audit_response['audit_log_entries'], audit_response['users'], audit_response['webhooks']
 
     async def audit_log_iter(self, guild_id: str, filter_user_id: str = None, filter_action_type: int = None,
-                             step_size: int = 100) -> typing.AsyncGenerator[typing.Tuple[dict, dict, dict], None]:
-        audit_logs, users, webhooks = self.audit_log_get(guild_id, filter_user_id, filter_action_type,
-                                                         limit=step_size)
-
-        while len(audit_logs) != 0:
-            for d in audit_logs:
-                yield d, users, webhooks
-
-            if len(audit_logs) != step_size:
-                break
-
-            last_audit_log_id = audit_logs[-1]['id']
-            audit_logs, users, webhooks = self.audit_log_get(
+                             step_size: int = 100, prefetch_depth: int = 1, prefetch_max_items: int = 10000
+                             ) -> typing.AsyncGenerator[typing.Tuple[dict, dict, dict], None]:
+        async def audit_log_page_get(last_audit_log_id: str) -> typing.List[typing.Tuple[dict, dict, dict]]:
+            audit_logs, users, webhooks = await self.audit_log_get(
                 guild_id, filter_user_id, filter_action_type,
                 before=last_audit_log_id, limit=step_size)
+            return [(d, users, webhooks) for d in audit_logs]
+
+        async for audit_log_page in prefetch_pages(
+                audit_log_page_get,
+                lambda page: page[-1][0]['id'] if len(page) == step_size else None,
+                None, prefetch_depth, prefetch_max_items):
+            for audit_log_tuple in audit_log_page:
+                yield audit_log_tuple
+
+    async def warm_up(self, connection_count: int = 4) -> None:
+        """
+        Opens connections to Discord in advance so the first calls do not pay for the TLS handshakes.
+        Opened connections are kept in the pool, connection_count should not exceed pool_maxsize.
+        """
+        if self.rate_limit.asynchronous_transport:
+            warm_up_calls = (self.rest_session.gateway_get() for _ in range(connection_count))
+        else:
+            warm_up_calls = (self.event_loop.run_in_executor(self.rate_limit.executor, self.rest_session.gateway_get)
+                             for _ in range(connection_count))
 
-    async def gateway_bot_get(self) -> dict:
-        return await self.rate_limit(f_partial(self.rest_session.gateway_bot_get))
+        await asyncio.gather(*warm_up_calls, return_exceptions=True)
 
     # region Web socket functions
 
@@ -761,4 +552,32 @@ class DiscordClientAsync:
         while True:
             yield (await queue.get())
 
+    async def event_gen_sharded(self, event_names_tuple: typing.Tuple[str, ...]
+                                ) -> typing.AsyncGenerator[typing.Tuple[dict, str, int], None]:
+        """
+        Yields (event_dict, event_name, shard_num) tuples. Requires client created with shard_count.
+        """
+        if not isinstance(self.socket_thread, ShardManager):
+            raise ValueError('Shard numbers of the events are only known if client was created with shard_count')
+
+        queue = asyncio.Queue()
+        self.socket_thread.event_queue_add_sharded(queue, event_names_tuple)
+        while True:
+            (event_dict, shard_num), event_name = await queue.get()
+            yield event_dict, event_name, shard_num
+
     # endregion
+
+
+def _route_method_source_get(route_name: str, route: Route) -> typing.Optional[typing.Tuple[str, str]]:
+    if not route.client:
+        return None
+
+    method_name = route.client_name or route_name
+    call_arguments = ', '.join((f'self.rest_session.{route_name}',) + route.parameter_names)
+    return method_name, (f'async def {method_name}({route.parameters_source_get()}) -> {route.returns}:\n'
+                         f'    return await self._rest_call(f_partial({call_arguments}))')
+
+
+route_methods_generate(DiscordClientAsync, _route_method_source_get,
+                       {'typing': typing, 'f_partial': f_partial, 'FilesList': FilesList})
@@ -0,0 +1,92 @@
+import asyncio
+import typing
+from time import time
+
+from ..util import snowflake_to_timestamp, timestamp_to_snowflake
+
+MessageIterGet = typing.Callable[[str, str], typing.AsyncIterator[dict]]
+
+
+def windows_get(start_id: str, end_id: str, window_count: int) -> typing.List[typing.Tuple[str, str]]:
+    """
+    Splits the time between two snowflakes into window_count equal windows.
+    Returns (after, before) snowflake pairs from the newest window to the oldest.
+    Both snowflakes of a pair are exclusive, same as the after and before cursors.
+    Snowflake between two windows belongs to the older one, so every snowflake is in exactly one window.
+    """
+    start_time = snowflake_to_timestamp(start_id)
+    window_length = (snowflake_to_timestamp(end_id) - start_time) / window_count
+
+    boundaries = [start_id]
+    boundaries.extend(timestamp_to_snowflake(start_time + window_length * i) for i in range(1, window_count))
+    boundaries.append(end_id)
+    # NOTE: before of the older window is one past the boundary, after of the newer window is the boundary
+    return [(boundaries[i], boundaries[i + 1] if i == window_count - 1 else str(int(boundaries[i + 1]) + 1))
+            for i in reversed(range(window_count))]
+
+
+async def history_scan(message_iter_get: MessageIterGet, start_id: str, end_id: str = None,
+                       window_count: int = 4, ordered: bool = True,
+                       buffer_size: int = 1000) -> typing.AsyncGenerator[dict, None]:
+    """
+    Yields messages between two snowflakes, every time window is paged in parallel.
+
+    Windows only download faster than one pager when their calls are not queued behind each other.
+    Calls of one channel share a rate limit bucket, which runs as many calls at once as Discord reports
+    remaining, so the windows overlap only while the bucket has calls to spare.
+
+    With ordered the messages are yielded newest first, same as channel_message_iter.
+    Windows that are not being yielded yet buffer up to buffer_size messages and then wait.
+    Without ordered the messages are yielded as soon as any window downloads them.
+
+    :param message_iter_get: called with the window after and before snowflakes,
+        returns messages from newest to oldest and should not download pages past after
+    :param start_id: messages older than this snowflake are not scanned, for example the channel id
+    :param end_id: messages newer than this snowflake are not scanned, defaults to current time
+    """
+    if end_id is None:
+        end_id = timestamp_to_snowflake(time())
+
+    windows = windows_get(start_id, end_id, window_count)
+    # NOTE: None marks the end of a window, exception is reraised in the consumer
+    if ordered:
+        queues = [asyncio.Queue(maxsize=buffer_size) for _ in windows]
+    else:
+        queues = [asyncio.Queue(maxsize=buffer_size)] * len(windows)
+
+    async def window_scan(after_id: str, before_id: str, queue: asyncio.Queue) -> None:
+        try:
+            async for message_dict in message_iter_get(after_id, before_id):
+                if int(message_dict['id']) <= int(after_id):
+                    break
+                await queue.put(message_dict)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    window_tasks = [asyncio.ensure_future(window_scan(after_id, before_id, queue))
+                    for (after_id, before_id), queue in zip(windows, queues)]
+    try:
+        if ordered:
+            for queue in queues:
+                while True:
+                    message_dict = await queue.get()
+                    if message_dict is None:
+                        break
+                    if isinstance(message_dict, Exception):
+                        raise message_dict
+                    yield message_dict
+        else:
+            running_windows = len(window_tasks)
+            while running_windows:
+                message_dict = await queues[0].get()
+                if message_dict is None:
+                    running_windows -= 1
+                    continue
+                if isinstance(message_dict, Exception):
+                    raise message_dict
+                yield message_dict
+    finally:
+        for window_task in window_tasks:
+            window_task.cancel()
@@ -0,0 +1,136 @@
+import typing
+from _functools import partial as f_partial
+from collections import OrderedDict
+from inspect import signature
+from time import time
+
+from ..constants import SocketEventNames
+from ..exceptions import (RestError, UnknownChannel, UnknownGuild, UnknownMember, UnknownMessage, UnknownRole,
+                          UnknownUser, UnknownEmoji, UnknownInvite)
+
+ResourceKey = typing.Tuple[typing.Type[RestError], tuple]
+
+
+class NegativeCache:
+    """
+    Remembers resources Discord reported as unknown (deleted channels, departed members...)
+    and raises the same exception for the calls that use them without making the call.
+
+    Each exception class is identified by the call parameters listed in RESOURCE_PARAMETERS
+    and only applies to the routes listed in RESOURCE_ROUTES, the ones that read or change the existing resource.
+    Routes that create the resource or work without it (adding or banning departed member) are never blocked.
+    Entries expire after ttl seconds or are dropped by the socket events listed in CLEARING_EVENTS.
+    """
+    RESOURCE_PARAMETERS: typing.Dict[typing.Type[RestError], typing.Tuple[str, ...]] = {
+        UnknownChannel: ('channel_id',),
+        UnknownGuild: ('guild_id',),
+        UnknownMember: ('guild_id', 'user_id'),
+        UnknownMessage: ('channel_id', 'message_id'),
+        UnknownRole: ('guild_id', 'role_id'),
+        UnknownUser: ('user_id',),
+        UnknownEmoji: ('guild_id', 'emoji_id'),
+        UnknownInvite: ('invite_code',),
+    }
+
+    RESOURCE_ROUTES: typing.Dict[typing.Type[RestError], typing.FrozenSet[str]] = {
+        # NOTE: channel is not created by the message and invite create calls, they fail if it was deleted
+        UnknownChannel: frozenset((
+            'channel_get', 'channel_modify', 'channel_delete', 'channel_message_list', 'channel_message_get',
+            'channel_message_create_json', 'channel_message_create_multipart', 'channel_message_edit',
+            'channel_message_delete', 'channel_message_bulk_delete', 'channel_message_reaction_create',
+            'channel_message_reaction_my_delete', 'channel_message_reaction_delete',
+            'channel_message_reaction_list_users', 'channel_message_reaction_delete_all',
+            'channel_permissions_overwrite_edit', 'channel_permissions_overwrite_delete', 'channel_invite_list',
+            'channel_invite_create', 'channel_typing_start', 'channel_pins_get', 'channel_pins_add',
+            'channel_pins_delete', 'webhook_list_channel')),
+        UnknownGuild: frozenset((
+            'guild_get', 'guild_modify', 'guild_delete', 'guild_channel_list', 'guild_member_get', 'guild_member_list',
+            'guild_ban_list', 'guild_role_list', 'guild_prune_get_count', 'guild_voice_region_list',
+            'guild_invite_list', 'guild_integration_list', 'guild_embed_get', 'guild_emoji_list',
+            'webhook_list_guild', 'audit_log_get')),
+        UnknownMember: frozenset((
+            'guild_member_get', 'guild_member_modify', 'guild_member_role_add', 'guild_member_role_remove',
+            'guild_member_remove')),
+        UnknownMessage: frozenset((
+            'channel_message_get', 'channel_message_edit', 'channel_message_delete',
+            'channel_message_reaction_create', 'channel_message_reaction_my_delete',
+            'channel_message_reaction_delete', 'channel_message_reaction_list_users',
+            'channel_message_reaction_delete_all', 'channel_pins_add', 'channel_pins_delete')),
+        UnknownRole: frozenset((
+            'guild_role_modify', 'guild_role_delete', 'guild_member_role_add', 'guild_member_role_remove')),
+        UnknownUser: frozenset(('user_get',)),
+        UnknownEmoji: frozenset(('guild_emoji_get', 'guild_emoji_modify', 'guild_emoji_delete')),
+        UnknownInvite: frozenset(('invite_get', 'invite_delete', 'invite_accept')),
+    }
+
+    CLEARING_EVENTS: typing.Dict[str, typing.Callable[[dict], ResourceKey]] = {
+        SocketEventNames.CHANNEL_CREATE: lambda d: (UnknownChannel, (d['id'],)),
+        SocketEventNames.GUILD_CREATE: lambda d: (UnknownGuild, (d['id'],)),
+        SocketEventNames.GUILD_MEMBER_ADD: lambda d: (UnknownMember, (d['guild_id'], d['user']['id'])),
+        SocketEventNames.GUILD_ROLE_CREATE: lambda d: (UnknownRole, (d['guild_id'], d['role']['id'])),
+        SocketEventNames.MESSAGE_CREATE: lambda d: (UnknownMessage, (d['channel_id'], d['id'])),
+    }
+
+    def __init__(self, ttl: float = 300, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: typing.MutableMapping[ResourceKey, float] = OrderedDict()
+        self.parameter_names: typing.Dict[str, typing.Tuple[str, ...]] = {}
+
+    def _arguments_get(self, api_call_partial: f_partial) -> typing.Dict[str, typing.Any]:
+        function_name = api_call_partial.func.__name__
+        try:
+            parameter_names = self.parameter_names[function_name]
+        except KeyError:
+            parameter_names = tuple(signature(api_call_partial.func).parameters)
+            self.parameter_names[function_name] = parameter_names
+
+        arguments = dict(zip(parameter_names, api_call_partial.args))
+        arguments.update(api_call_partial.keywords)
+        return arguments
+
+    def check(self, api_call_partial: f_partial) -> None:
+        """
+        Raises remembered exception if the call uses resource known to be missing.
+        """
+        if not self.entries:
+            return
+
+        function_name = api_call_partial.func.__name__
+        arguments = self._arguments_get(api_call_partial)
+        for exception_class, resource_parameters in self.RESOURCE_PARAMETERS.items():
+            if function_name not in self.RESOURCE_ROUTES[exception_class]:
+                continue
+            try:
+                resource_key = (exception_class, tuple(arguments[x] for x in resource_parameters))
+                expiration_time = self.entries[resource_key]
+            except KeyError:
+                continue
+
+            if expiration_time < time():
+                del self.entries[resource_key]
+            else:
+                raise exception_class()
+
+    def remember(self, api_call_partial: f_partial, exception: RestError) -> None:
+        exception_class = type(exception)
+        try:
+            resource_parameters = self.RESOURCE_PARAMETERS[exception_class]
+        except KeyError:
+            return
+        if api_call_partial.func.__name__ not in self.RESOURCE_ROUTES[exception_class]:
+            return
+
+        arguments = self._arguments_get(api_call_partial)
+        try:
+            resource_key = (exception_class, tuple(arguments[x] for x in resource_parameters))
+        except KeyError:
+            return
+
+        self.entries[resource_key] = time() + self.ttl
+        self.entries.move_to_end(resource_key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def event_handle(self, event_dict: dict, event_name: str) -> None:
+        self.entries.pop(self.CLEARING_EVENTS[event_name](event_dict), None)
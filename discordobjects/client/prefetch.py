@@ -0,0 +1,76 @@
+import asyncio
+import typing
+
+Cursor = typing.Optional[str]
+
+
+async def prefetch_pages(page_get: typing.Callable[[Cursor], typing.Awaitable[list]],
+                         next_cursor_get: typing.Callable[[list], Cursor],
+                         cursor: Cursor = None,
+                         depth: int = 1,
+                         max_items: int = 10000) -> typing.AsyncGenerator[list, None]:
+    """
+    Yields pages of a paginated endpoint while the following pages are downloaded in the background.
+
+    Pages are downloaded one after another because each cursor comes from the previous page.
+    Up to depth pages are downloaded ahead of the consumer as long as
+    the pages waiting for the consumer hold less than max_items items.
+    With depth 0 the next page is downloaded only after the consumer is done with the current one.
+
+    :param page_get: called with the cursor, None for the first page
+    :param next_cursor_get: called with the non-empty page, returns cursor of the next page or None if it was the last
+    :param cursor: cursor of the first page
+    """
+    if depth < 1:
+        while True:
+            page = await page_get(cursor)
+            if not page:
+                return
+            yield page
+            cursor = next_cursor_get(page)
+            if cursor is None:
+                return
+
+    # NOTE: None marks the end of the pages, exception is reraised in the consumer
+    pages_queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    buffered_items = 0
+    buffer_drained = asyncio.Event()
+
+    async def producer() -> None:
+        nonlocal buffered_items
+        next_cursor = cursor
+        try:
+            while True:
+                while buffered_items >= max_items:
+                    buffer_drained.clear()
+                    await buffer_drained.wait()
+
+                page = await page_get(next_cursor)
+                if not page:
+                    break
+                buffered_items += len(page)
+                await pages_queue.put(page)
+
+                next_cursor = next_cursor_get(page)
+                if next_cursor is None:
+                    break
+        except Exception as e:
+            await pages_queue.put(e)
+            return
+        await pages_queue.put(None)
+
+    # NOTE: task inherits the context so the request priority of the consumer applies to the prefetched pages
+    producer_task = asyncio.ensure_future(producer())
+    try:
+        while True:
+            page = await pages_queue.get()
+            if page is None:
+                return
+            if isinstance(page, Exception):
+                raise page
+
+            buffered_items -= len(page)
+            buffer_drained.set()
+            yield page
+    finally:
+        producer_task.cancel()
@@ -0,0 +1,31 @@
+import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """
+    Priority classes of REST calls. Lower value is served first.
+    """
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+current_priority: ContextVar = ContextVar('discordobjects_request_priority', default=Priority.NORMAL)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> typing.Generator[None, None, None]:
+    """
+    All REST calls made inside the context (including tasks created inside it) use the priority.
+
+    with client.priority(Priority.BULK):
+        await client.guild_member_role_add(...)
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
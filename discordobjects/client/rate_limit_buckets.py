@@ -0,0 +1,249 @@
+import asyncio
+import typing
+from _functools import partial as f_partial
+from concurrent.futures import ThreadPoolExecutor
+from heapq import heappush, heappop
+from itertools import count
+from time import time
+
+from .priority import Priority, current_priority
+from .rate_limit_global import GlobalRateLimit
+from .retry_policy import RetryPolicy
+from ..exceptions import rest_exception_handler
+from ..util.json_codec import json_codec
+from requests import Response
+from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError
+
+
+class RateLimitBucket:
+    """
+    Queue of calls that share one rate limit.
+
+    Up to capacity calls of the bucket run at the same time. Capacity follows the number of remaining calls
+    Discord reports for the bucket, until the first response only one call runs.
+
+    Waiting calls are ordered by the time they arrived plus priority multiplied by aging_period.
+    Higher priority call arriving up to aging_period later overtakes the lower priority one,
+    but older low priority calls are never starved.
+    """
+
+    def __init__(self, aging_period: float, capacity: int = 1):
+        self.aging_period = aging_period
+        self.waiters: typing.List[typing.Tuple[float, int, asyncio.Future]] = []
+        self.waiters_counter = count()
+        self.capacity: int = max(1, capacity)
+        self.running: int = 0
+        self.waiting: int = 0
+
+    async def acquire(self, priority: Priority) -> None:
+        if self.running < self.capacity and not self.waiters:
+            self.running += 1
+            return
+
+        future = asyncio.get_event_loop().create_future()
+        heappush(self.waiters, (time() + priority * self.aging_period, next(self.waiters_counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # NOTE: slot was already handed over to this call
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.running -= 1
+        self._waiters_wake()
+
+    def capacity_set(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._waiters_wake()
+
+    def _waiters_wake(self) -> None:
+        while self.waiters and self.running < self.capacity:
+            _, _, future = heappop(self.waiters)
+            if not future.done():
+                # NOTE: slot is handed over directly so new calls can not take it first
+                self.running += 1
+                future.set_result(True)
+
+
+class RateLimitBuckets:
+    """
+    Rate limiter that keeps separate queue for every rate limit bucket.
+    Calls to different buckets are executed in parallel. Calls to the same bucket are executed in parallel
+    up to the number of calls Discord reports remaining in the bucket.
+
+    rate_limit_table maps bucket key to the tuple of remaining calls and reset time.
+    Limits of idle buckets are kept until their reset passes, so new bucket starts with them.
+    The table is swept at most once every TABLE_SWEEP_PERIOD seconds when a bucket goes idle.
+
+    If route_key_function is passed the bucket key is made from the route identifier and major parameters
+    of the call. Route identifiers are replaced by X-RateLimit-Bucket hash once Discord reports it,
+    so routes sharing a real bucket also share the key.
+
+    All buckets take a token from the shared global limit before each call.
+    429 responses are not raised but retried after retry_after. Global 429 pauses every bucket.
+
+    Server errors and connection errors are retried according to retry_policy.
+    While its circuit breaker is open calls raise DiscordUnavailable without reaching Discord.
+
+    Calls waiting for the same bucket are served by priority set with request_priority context.
+
+    With asynchronous_transport the call partials return awaitables and are awaited on the event loop
+    instead of being run in the thread executor.
+    """
+    TABLE_SWEEP_PERIOD = 60
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, retry_period: int = 4, max_workers: int = 8,
+                 route_key_function: typing.Callable[[f_partial], typing.Tuple[typing.Hashable, tuple]] = None,
+                 global_limit: GlobalRateLimit = None, retry_policy: RetryPolicy = None,
+                 aging_period: float = 5, asynchronous_transport: bool = False):
+        self.executor = ThreadPoolExecutor(max_workers, 'rate_limit_buckets thread executor')
+        self.retry_period = retry_period
+        self.rate_limit_table: typing.Dict[typing.Hashable, typing.Tuple[int, float]] = {'global': (-1, 0)}
+        self.table_sweep_time = time() + self.TABLE_SWEEP_PERIOD
+        self.buckets: typing.Dict[typing.Hashable, RateLimitBucket] = {}
+        self.route_key_function = route_key_function
+        self.route_buckets: typing.Dict[typing.Hashable, str] = {}
+        self.global_limit = global_limit if global_limit is not None else GlobalRateLimit()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.aging_period = aging_period
+        self.asynchronous_transport = asynchronous_transport
+        if loop is None:
+            self.event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        else:
+            self.event_loop: asyncio.AbstractEventLoop = loop
+
+    def route_key_get(self, api_call_partial: f_partial) -> typing.Tuple[typing.Hashable, tuple]:
+        if self.route_key_function is None:
+            # NOTE: defaults to rate limit look up by function
+            return api_call_partial.func, ()
+
+        return self.route_key_function(api_call_partial)
+
+    def bucket_key_get(self, api_call_partial: f_partial) -> typing.Hashable:
+        route_id, majors = self.route_key_get(api_call_partial)
+        return self.route_buckets.get(route_id, route_id), majors
+
+    async def __call__(self, api_call_partial: f_partial,
+                       table_position: tuple = None) -> typing.Union[dict, list, bool]:
+        if table_position is None:
+            route_id, majors = self.route_key_get(api_call_partial)
+            table_position = (self.route_buckets.get(route_id, route_id), majors)
+        else:
+            route_id = None
+
+        try:
+            bucket = self.buckets[table_position]
+        except KeyError:
+            remaining_limit, reset_time = self.rate_limit_table.get(table_position, (-1, 0))
+            bucket = RateLimitBucket(self.aging_period, remaining_limit if reset_time > time() else 1)
+            self.buckets[table_position] = bucket
+
+        bucket.waiting += 1
+        try:
+            await bucket.acquire(current_priority.get())
+            try:
+                return await self._call_in_bucket(api_call_partial, table_position, route_id)
+            finally:
+                bucket.release()
+        finally:
+            bucket.waiting -= 1
+            if bucket.waiting == 0:
+                # NOTE: idle buckets are dropped, their limits are kept in rate_limit_table until reset passes
+                del self.buckets[table_position]
+                if self.rate_limit_table.get(table_position, (-1, 0))[1] < time():
+                    self.rate_limit_table.pop(table_position, None)
+                self._rate_limit_table_sweep()
+
+    def _rate_limit_table_sweep(self) -> None:
+        """
+        Removes limits of idle buckets whose reset passed, including buckets that went idle before the reset.
+        """
+        current_time = time()
+        if current_time < self.table_sweep_time:
+            return
+        self.table_sweep_time = current_time + self.TABLE_SWEEP_PERIOD
+
+        expired_keys = [k for k, (_, reset_time) in self.rate_limit_table.items()
+                        if reset_time < current_time and k != 'global' and k not in self.buckets]
+        for key in expired_keys:
+            del self.rate_limit_table[key]
+
+    async def _call_in_bucket(self, api_call_partial: f_partial, table_position: typing.Hashable,
+                              route_id: typing.Hashable = None) -> typing.Union[dict, list, bool]:
+        circuit_breaker = self.retry_policy.circuit_breaker
+        deadline_time = self.retry_policy.deadline_get()
+        attempt = 0
+
+        while True:
+            remaining_limit, reset_time = self.rate_limit_table.get(table_position, (-1, 0))
+
+            if remaining_limit == 0:
+                sleep_time = reset_time - time()
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+                    continue
+
+            circuit_breaker.check()
+            await self.global_limit.acquire()
+
+            try:
+                if self.asynchronous_transport:
+                    response: Response = await api_call_partial()
+                else:
+                    response: Response = await self.event_loop.run_in_executor(self.executor, api_call_partial)
+            except (ConnectTimeout, ReadTimeout, ConnectionError) as e:
+                circuit_breaker.failure()
+                attempt += 1
+                await asyncio.sleep(self.retry_policy.delay_get(attempt, deadline_time, e))
+                continue
+
+            if route_id is not None and 'X-RateLimit-Bucket' in response.headers:
+                self.route_buckets[route_id] = response.headers['X-RateLimit-Bucket']
+
+            bucket = self.buckets[table_position]
+            if 'X-RateLimit-Remaining' in response.headers:
+                remaining_limit = int(response.headers['X-RateLimit-Remaining'])
+                self.rate_limit_table[table_position] = (remaining_limit, float(response.headers['X-RateLimit-Reset']))
+                # NOTE: calls still running are not counted by Discord yet, so capacity is at most remaining
+                bucket.capacity_set(remaining_limit)
+            else:
+                self.rate_limit_table[table_position] = (-1, 0)
+                bucket.capacity_set(1)
+
+            if response.status_code == 429:
+                self._too_many_requests(response, table_position)
+                continue
+            elif response.status_code in self.retry_policy.RETRY_STATUS_CODES:
+                # Discord servers are wonky
+                circuit_breaker.failure()
+                attempt += 1
+                await asyncio.sleep(self.retry_policy.delay_get(attempt, deadline_time, response))
+                continue
+
+            circuit_breaker.success()
+            if response.status_code >= 400:
+                # You made a bad request or something went wrong. Raise exception.
+                rest_exception_handler(response)
+
+            try:
+                return json_codec.loads(response.content)
+            except ValueError:
+                return True
+
+    def _too_many_requests(self, response: Response, table_position: typing.Hashable) -> None:
+        try:
+            response_data = json_codec.loads(response.content)
+            # NOTE: API v6 reports retry_after in milliseconds
+            reset_time = time() + response_data['retry_after'] / 1000
+            is_global = response_data.get('global', False)
+        except (ValueError, KeyError, TypeError):
+            reset_time = time() + self.retry_period
+            is_global = False
+
+        if is_global or 'X-RateLimit-Global' in response.headers:
+            self.rate_limit_table['global'] = (0, reset_time)
+            self.global_limit.pause(reset_time)
+        else:
+            self.rate_limit_table[table_position] = (0, reset_time)
@@ -0,0 +1,43 @@
+import asyncio
+from time import time
+
+
+class GlobalRateLimit:
+    """
+    Token bucket shared by all rate limit buckets.
+
+    Every call takes one token. Tokens refill at the rate of calls_per_second up to the same capacity.
+    When Discord reports global rate limit all calls are paused until the reported reset time.
+    """
+
+    def __init__(self, calls_per_second: int = 50):
+        self.calls_per_second = calls_per_second
+        self.tokens: float = calls_per_second
+        self.last_refill: float = time()
+        self.paused_until: float = 0
+
+    def _refill(self, current_time: float) -> None:
+        self.tokens = min(self.calls_per_second,
+                          self.tokens + (current_time - self.last_refill) * self.calls_per_second)
+        self.last_refill = current_time
+
+    async def acquire(self) -> None:
+        while True:
+            current_time = time()
+
+            if self.paused_until > current_time:
+                await asyncio.sleep(self.paused_until - current_time)
+                continue
+
+            self._refill(current_time)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.calls_per_second)
+
+    def pause(self, reset_time: float) -> None:
+        # NOTE: several 429 responses may arrive for the same global limit, keep the latest reset
+        if reset_time > self.paused_until:
+            self.paused_until = reset_time
+        self.tokens = 0
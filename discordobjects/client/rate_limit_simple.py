@@ -4,11 +4,11 @@ import logging
 from _functools import partial as f_partial
 from concurrent.futures import ThreadPoolExecutor
 # IDEA: use multiprocess executor in the future?
-from json import JSONDecodeError
 from time import time
 
 
 from ..exceptions import rest_exception_handler
+from ..util.json_codec import json_codec
 from requests import Response
 from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError
 
@@ -76,8 +76,8 @@ class RateLimitSimple:
                     # You made a bad request or something went wrong. Raise exception.
                     rest_exception_handler(response)
                 try:
-                    response_data = response.json()
-                except JSONDecodeError:
+                    response_data = json_codec.loads(response.content)
+                except ValueError:
                     response_data = True
         finally:
             self.lock.release()
@@ -0,0 +1,52 @@
+import asyncio
+import typing
+from _functools import partial as f_partial
+from copy import deepcopy
+
+
+def call_key_get(api_call_partial: f_partial) -> typing.Hashable:
+    return (api_call_partial.func.__name__, api_call_partial.args,
+            tuple(sorted(api_call_partial.keywords.items())))
+
+
+class RequestCoalescer:
+    """
+    Shares a single call between identical calls that are in flight at the same time.
+
+    Every caller except the last one to resume receives its own deep copy of the decoded response,
+    taken before the response itself is handed to the last caller,
+    so the callers can modify the results independently.
+    Cancelling one of the callers does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self.in_flight: typing.Dict[typing.Hashable, asyncio.Future] = {}
+        self.waiting_counts: typing.Dict[asyncio.Future, int] = {}
+
+    async def __call__(self, call_key: typing.Hashable,
+                       call_function: typing.Callable[[], typing.Awaitable]) -> typing.Any:
+        try:
+            shared_call = self.in_flight[call_key]
+        except KeyError:
+            shared_call = asyncio.ensure_future(call_function())
+            self.in_flight[call_key] = shared_call
+            self.waiting_counts[shared_call] = 0
+
+            def in_flight_remove(_: asyncio.Future) -> None:
+                del self.in_flight[call_key]
+
+            shared_call.add_done_callback(in_flight_remove)
+
+        self.waiting_counts[shared_call] += 1
+        try:
+            result = await asyncio.shield(shared_call)
+        finally:
+            self.waiting_counts[shared_call] -= 1
+            is_last = self.waiting_counts[shared_call] == 0
+            if is_last:
+                del self.waiting_counts[shared_call]
+
+        # NOTE: callers can only join before the call is done, so nobody else receives the result after the last one
+        if is_last:
+            return result
+        return deepcopy(result)
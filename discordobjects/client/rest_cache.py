@@ -0,0 +1,127 @@
+import typing
+from collections import OrderedDict
+from copy import deepcopy
+from time import time
+
+from ..constants import SocketEventNames
+
+CallKey = typing.Tuple[str, tuple, tuple]
+
+
+def _channel_keys(event_dict: dict) -> typing.List[CallKey]:
+    keys = [('channel_get', (event_dict['id'],), ())]
+    if event_dict.get('guild_id') is not None:
+        keys.append(('guild_channel_list', (event_dict['guild_id'],), ()))
+    return keys
+
+
+def _guild_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('guild_get', (event_dict['id'],), ())]
+
+
+def _guild_role_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('guild_role_list', (event_dict['guild_id'],), ()),
+            ('guild_get', (event_dict['guild_id'],), ())]
+
+
+def _guild_member_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('guild_member_get', (event_dict['guild_id'], event_dict['user']['id']), ())]
+
+
+def _guild_emoji_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('guild_emoji_list', (event_dict['guild_id'],), ()),
+            ('guild_get', (event_dict['guild_id'],), ())]
+
+
+def _guild_ban_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('guild_ban_list', (event_dict['guild_id'],), ())]
+
+
+def _user_keys(event_dict: dict) -> typing.List[CallKey]:
+    return [('me_get', (), ()), ('user_get', (event_dict['id'],), ())]
+
+
+class RestCache:
+    """
+    Read-through cache of REST GET calls with time to live per endpoint and least recently used eviction.
+
+    Entries are keyed the same way as request coalescing: by the method name and arguments.
+    Only the endpoints listed in ttls are cached.
+    Socket events listed in INVALIDATING_EVENTS drop the entries they make stale.
+    """
+    DEFAULT_TTLS: typing.Dict[str, float] = {
+        'guild_get': 60,
+        'guild_channel_list': 60,
+        'guild_role_list': 60,
+        'guild_member_get': 60,
+        'guild_emoji_list': 300,
+        'guild_ban_list': 60,
+        'channel_get': 60,
+        'user_get': 300,
+        'me_get': 300,
+    }
+
+    INVALIDATING_EVENTS: typing.Dict[str, typing.Callable[[dict], typing.List[CallKey]]] = {
+        SocketEventNames.CHANNEL_CREATE: _channel_keys,
+        SocketEventNames.CHANNEL_UPDATE: _channel_keys,
+        SocketEventNames.CHANNEL_DELETE: _channel_keys,
+        SocketEventNames.GUILD_UPDATE: _guild_keys,
+        SocketEventNames.GUILD_DELETE: _guild_keys,
+        SocketEventNames.GUILD_ROLE_CREATE: _guild_role_keys,
+        SocketEventNames.GUILD_ROLE_UPDATE: _guild_role_keys,
+        SocketEventNames.GUILD_ROLE_DELETE: _guild_role_keys,
+        SocketEventNames.GUILD_MEMBER_ADD: _guild_member_keys,
+        SocketEventNames.GUILD_MEMBER_UPDATE: _guild_member_keys,
+        SocketEventNames.GUILD_MEMBER_REMOVE: _guild_member_keys,
+        SocketEventNames.GUILD_EMOJIS_UPDATE: _guild_emoji_keys,
+        SocketEventNames.GUILD_BAN_ADD: _guild_ban_keys,
+        SocketEventNames.GUILD_BAN_REMOVE: _guild_ban_keys,
+        SocketEventNames.USER_UPDATE: _user_keys,
+    }
+
+    def __init__(self, ttls: typing.Dict[str, float] = None, max_size: int = 10000):
+        self.ttls = ttls if ttls is not None else self.DEFAULT_TTLS.copy()
+        self.max_size = max_size
+        self.entries: typing.MutableMapping[CallKey, typing.Tuple[float, typing.Any]] = OrderedDict()
+        # NOTE: invalidations are remembered so calls that were in flight during the invalidation are not stored
+        self.generation: int = 0
+        self.invalidations: typing.MutableMapping[CallKey, int] = OrderedDict()
+
+    def is_cached_endpoint(self, call_key: CallKey) -> bool:
+        return call_key[0] in self.ttls
+
+    def get(self, call_key: CallKey) -> typing.Any:
+        """
+        Returns copy of the cached data. Raises KeyError if there is no entry or it expired.
+        """
+        expiration_time, data = self.entries[call_key]
+        if expiration_time < time():
+            del self.entries[call_key]
+            raise KeyError(call_key)
+
+        self.entries.move_to_end(call_key)
+        return deepcopy(data)
+
+    def put(self, call_key: CallKey, data: typing.Any, generation: int) -> None:
+        """
+        :param generation: value of the generation attribute before the call started
+        """
+        if self.invalidations.get(call_key, 0) > generation:
+            return
+
+        self.entries[call_key] = (time() + self.ttls[call_key[0]], deepcopy(data))
+        self.entries.move_to_end(call_key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, call_key: CallKey) -> None:
+        self.generation += 1
+        self.entries.pop(call_key, None)
+        self.invalidations[call_key] = self.generation
+        self.invalidations.move_to_end(call_key)
+        while len(self.invalidations) > self.max_size:
+            self.invalidations.popitem(last=False)
+
+    def event_handle(self, event_dict: dict, event_name: str) -> None:
+        for call_key in self.INVALIDATING_EVENTS[event_name](event_dict):
+            self.invalidate(call_key)
@@ -0,0 +1,75 @@
+import random
+import typing
+from time import time
+
+from ..exceptions import RetriesExhausted, DiscordUnavailable
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failed calls. After failure_threshold failures in a row the circuit opens
+    and all calls fail immediately for recovery_time seconds.
+    After recovery_time calls are let through again. First success closes the circuit,
+    first failure opens it for another recovery_time.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.consecutive_failures: int = 0
+        self.opened_at: float = None
+
+    def is_open(self) -> bool:
+        return self.opened_at is not None and time() < self.opened_at + self.recovery_time
+
+    def check(self) -> None:
+        if self.is_open():
+            raise DiscordUnavailable(
+                f"Circuit is open after {self.consecutive_failures} failed calls in a row")
+
+    def success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time()
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for server errors and connection errors.
+
+    Call is retried at most max_attempts times in total and never past the deadline
+    seconds since the first attempt.
+    """
+    RETRY_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+    def __init__(self, max_attempts: int = 5, backoff_base: float = 0.5, backoff_max: float = 30,
+                 deadline: float = 60, circuit_breaker: CircuitBreaker = None):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+
+    def deadline_get(self) -> float:
+        return time() + self.deadline
+
+    def delay_get(self, attempt: int, deadline_time: float, last_error: typing.Any) -> float:
+        """
+        Returns time to sleep before next attempt or raises RetriesExhausted.
+
+        :param attempt: number of attempts already made
+        :param deadline_time: absolute time after which the call is abandoned
+        :param last_error: exception or response of the failed attempt
+        """
+        if attempt >= self.max_attempts:
+            raise RetriesExhausted(f"Call failed {attempt} times. Last error: {last_error}")
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if time() + delay > deadline_time:
+            raise RetriesExhausted(f"Call deadline passed after {attempt} attempts. Last error: {last_error}")
+
+        return delay
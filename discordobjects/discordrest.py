@@ -1,20 +1,173 @@
 from requests import Response as RequestsResponse
 from requests import Session as RequestsSession
+from requests.adapters import HTTPAdapter
+from _functools import partial as f_partial
+import ast
 import typing
 
+from .multipart_body import MultipartBody, FilesList
+from .util.json_codec import json_codec
+
+
+class Route:
+    """
+    Declarative description of the REST API endpoint.
+
+    Major parameters are the path parameters Discord uses to split the rate limits.
+    Calls with different major parameters never share a bucket.
+
+    DiscordSession, DiscordClientAsync and DiscordClientSync methods are generated from the routes:
+    parameters is the parameter list of the methods, query and json name the parameters sent
+    as query string and JSON body. They are either tuples of parameter names or dicts mapping
+    parameter names to the field names. Parameters that default to None are not sent while None.
+    json can also be a single parameter name which is then sent as the whole body.
+    json_constants are fields always added to the body.
+
+    returns is the return annotation of the client methods, client_name overrides the name of the client methods.
+    Routes with client set to False get session method only.
+    """
+    MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'webhook_id')
+
+    def __init__(self, method: str, path: str, parameters: str = '',
+                 query: typing.Union[typing.Tuple[str, ...], typing.Dict[str, str]] = (),
+                 json: typing.Union[typing.Tuple[str, ...], typing.Dict[str, str], str] = (),
+                 json_constants: typing.Dict[str, typing.Any] = None, returns: str = 'dict',
+                 client_name: str = None, client: bool = True):
+        self.method = method
+        self.path = path
+        self.route_id = (method, path)
+        self.parameters = parameters
+        self.query = query if isinstance(query, dict) else {x: x for x in query}
+        self.json = json if isinstance(json, (dict, str)) else {x: x for x in json}
+        self.json_constants = json_constants
+        self.returns = returns
+        self.client_name = client_name
+        self.client = client
+
+        function_arguments = ast.parse(f'def f({parameters}): pass').body[0].args
+        self.parameter_names = tuple(x.arg for x in function_arguments.args)
+        # NOTE: parameters with None default are left out of the request when they are None
+        defaults = [None] * (len(function_arguments.args) - len(function_arguments.defaults))
+        defaults.extend(function_arguments.defaults)
+        self.optional_names = frozenset(
+            x.arg for x, default in zip(function_arguments.args, defaults) if self._is_none_default(default))
+
+        self.major_names = tuple(x for x in self.MAJOR_PARAMETERS if f'{{{x}}}' in path)
+        self.major_positions = tuple(self.parameter_names.index(x) for x in self.major_names)
+
+    @staticmethod
+    def _is_none_default(default: typing.Optional[ast.expr]) -> bool:
+        if default is None:
+            return False
+        # NOTE: None is ast.NameConstant before Python 3.8 and ast.Constant after
+        try:
+            return ast.literal_eval(default) is None
+        except ValueError:
+            return False
+
+    def majors_get(self, args: tuple, kwargs: dict) -> tuple:
+        return tuple(args[p] if p < len(args) else kwargs[n] for p, n in zip(self.major_positions, self.major_names))
+
+    def parameters_source_get(self) -> str:
+        return f'self, {self.parameters}' if self.parameters else 'self'
+
+    def arguments_source_get(self) -> str:
+        return ', '.join(self.parameter_names)
+
+    def session_source_get(self, name: str) -> str:
+        """
+        Returns source of the DiscordSession method that makes the request of the route.
+        URL is an f-string so it is formatted without any lookups.
+        """
+        lines = [f'def {name}({self.parameters_source_get()}) -> RequestsResponse:']
+        request_arguments = ''
+
+        if self.query:
+            lines.append('    query = {}')
+            lines.extend(self._fields_source_get('query', self.query))
+            request_arguments += ', params=query or None'
+
+        if isinstance(self.json, str):
+            request_arguments += f', json={self.json}'
+        elif self.json or self.json_constants:
+            lines.append(f'    body = {self.json_constants or {}!r}')
+            lines.extend(self._fields_source_get('body', self.json))
+            request_arguments += ', json=body'
+
+        lines.append(f"    return self.{self.method.lower()}(f'{{self.API_URL}}{self.path}'{request_arguments})")
+        return '\n'.join(lines)
+
+    def _fields_source_get(self, dict_name: str, fields: typing.Dict[str, str]) -> typing.List[str]:
+        lines = []
+        for parameter_name, field_name in fields.items():
+            if parameter_name in self.optional_names:
+                lines.append(f'    if {parameter_name} is not None:')
+                lines.append(f'        {dict_name}[{field_name!r}] = {parameter_name}')
+            else:
+                lines.append(f'    {dict_name}[{field_name!r}] = {parameter_name}')
+        return lines
+
+    def __repr__(self) -> str:
+        return f"Route: {self.method} {self.path}"
+
+
+def route_methods_generate(target_class: type,
+                           source_get: typing.Callable[[str, Route], typing.Optional[typing.Tuple[str, str]]],
+                           namespace: typing.Dict[str, typing.Any]) -> None:
+    """
+    Adds methods generated from ROUTES to the class. Methods written by hand in the class are kept.
+
+    :param source_get: called with route name and route, returns method name and its source or None to skip
+    :param namespace: globals of the generated methods
+    """
+    for route_name, route in ROUTES.items():
+        method_source = source_get(route_name, route)
+        if method_source is None:
+            continue
+
+        method_name, source = method_source
+        if method_name in target_class.__dict__:
+            continue
+
+        exec(compile(source, f'<{target_class.__name__}.{method_name}>', 'exec'), namespace)
+        method = namespace.pop(method_name)
+        method.__module__ = target_class.__module__
+        method.__qualname__ = f'{target_class.__qualname__}.{method_name}'
+        setattr(target_class, method_name, method)
+
 
 class DiscordSession(RequestsSession):
 
-    def __init__(self, token: str, proxies: dict = None):
+    def __init__(self, token: str, proxies: dict = None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 keep_alive: bool = True):
+        """
+        :param pool_connections: number of hosts to keep connection pools for
+        :param pool_maxsize: maximum number of connections kept open to a single host.
+            Should be at least the number of threads making calls in parallel.
+        :param keep_alive: keep connections open between the calls
+        """
         super(DiscordSession, self).__init__()
         self.headers.update({'Authorization': 'Bot ' + token})
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
         if proxies is not None:
             self.proxies = proxies
 
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
     API_URL = 'https://discordapp.com/api/v6'
     API_URL_LENGTH = len(API_URL)
     TIMEOUT_OVERWRITE = 5
 
+    def request(self, method: str, url: str, *args, json: typing.Any = None, **kwargs) -> RequestsResponse:
+        if json is not None:
+            # NOTE: body is encoded with json_codec instead of the standard library json requests uses
+            kwargs['data'] = json_codec.dumps_bytes(json)
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'Content-Type': 'application/json'})
+        return super().request(method, url, *args, **kwargs)
+
     # region Timeout overwrites
     def get(self, *args, **kwargs) -> RequestsResponse:
         return super().get(*args, **kwargs, timeout=self.TIMEOUT_OVERWRITE)
@@ -32,391 +185,25 @@ class DiscordSession(RequestsSession):
         return super().put(*args, **kwargs, timeout=self.TIMEOUT_OVERWRITE)
     # endregion
 
-    # region Current User REST API calls
-
-    def me_get(self) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/users/@me')
-
-    def user_get(self, user_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/users/{user_id}')
-
-    def me_modify(self, username: str) -> RequestsResponse:
-        # TODO: add avatar change support
-        return self.patch(f'{self.API_URL}/users/@me', json={'username': username})
-
-    def me_guild_list(self, before: str = None, after: str = None, limit: int = None) -> RequestsResponse:
-        params = {}
-        if before is not None:
-            params['before'] = before
-        if after is not None:
-            params['after'] = after
-        if limit is not None:
-            params['limit'] = limit
-        return self.get(f'{self.API_URL}/users/@me/guilds', params=params or None)
-
-    def me_guild_leave(self, guild_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/users/@me/guilds/{guild_id}')
-
-    def me_connections_get(self) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/users/@me/connections')
-
-    def me_dm_list(self) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/users/@me/channels')
-
-    # Direct Messaging (DM) calls
-
-    def dm_create(self, recipient_id: str) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/users/@me/channels', json={'recipient_id': recipient_id})
-
-    def dm_create_group(self, access_tokens: list, nicks: dict) -> RequestsResponse:
-        # NOTE: Have not been tested.
-        return self.post(f'{self.API_URL}/users/@me/channels', json={'access_tokens': access_tokens, 'nicks': nicks})
-
-    def dm_user_add(self, channel_id: str, user_id: str, access_token: str, user_nick: str) -> RequestsResponse:
-        return self.put(f'{self.API_URL}/channels/{channel_id}/recipients/{user_id}',
-                        json={'access_token': access_token, 'nick': user_nick})
-
-    def dm_user_remove(self, channel_id: str, user_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/recipients/{user_id}')
-    # endregion
-
-    # region Guild REST API calls
-
-    def guild_create(self, guild_name: str, region: str = None, icon: str = None, verification_level: int = None,
-                     default_message_notifications: int = None, roles=None, channels=None) -> RequestsResponse:
-        json_params = {'name': guild_name}
-        if region is not None:
-            json_params['region'] = region
-        if icon is not None:
-            json_params['icon'] = icon
-        if verification_level is not None:
-            json_params['verification_level'] = verification_level
-        if default_message_notifications is not None:
-            json_params['default_message_notifications'] = default_message_notifications
-        if roles is not None:
-            json_params['roles'] = roles
-        if channels is not None:
-            json_params['channels'] = channels
-
-        return self.post(f'{self.API_URL}/guilds', json=json_params)
-
-    def guild_get(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}')
-
-    def guild_modify(
-            self, guild_id: str, new_name: str = None, new_voice_region_id: str = None,
-            new_verification_level: int = None, new_default_level_notifications: int = None,
-            new_explicit_content_filter: int = None, new_afk_channel_id: str = None,
-            new_afk_timeout: int = None, new_icon: str = None, new_owner: str = None,
-            new_splash: str = None, new_system_channel_id: str = None) -> RequestsResponse:
-        params = {}
-        if new_name is not None:
-            params['name'] = new_name
-        if new_voice_region_id is not None:
-            params['voice_region_id'] = new_voice_region_id
-        if new_verification_level is not None:
-            params['verification_level'] = new_verification_level
-        if new_default_level_notifications is not None:
-            params['default_level_notifications'] = new_default_level_notifications
-        if new_explicit_content_filter is not None:
-            params['explicit_content_filter'] = new_explicit_content_filter
-        if new_afk_channel_id is not None:
-            params['afk_channel_id'] = new_afk_channel_id
-        if new_afk_timeout is not None:
-            params['afk_timeout'] = new_afk_timeout
-        if new_icon is not None:
-            params['icon'] = new_icon
-        if new_owner is not None:
-            params['owner_id'] = new_owner
-        if new_splash is not None:
-            params['splash'] = new_splash
-        if new_system_channel_id is not None:
-            params['system_channel_id'] = new_system_channel_id
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}', json=params)
-
-    def guild_delete(self, guild_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}')
-
-    # region Guild Channels
-    def guild_channel_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/channels')
-
-    def _guild_channel_create(self, guild_id: str, params: dict) -> RequestsResponse:
-        # NOTE: this function should not be called directly
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/channels', json=params)
-
-    def guild_channel_create_text(self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-                                  parent_id: str = None, nsfw: bool = None) -> RequestsResponse:
-        new_channel_params = {'name': name, 'type': 0}
-        if permission_overwrites is not None:
-            new_channel_params['permission_overwrites'] = permission_overwrites
-        if parent_id is not None:
-            new_channel_params['parent_id'] = parent_id
-        if nsfw is not None:
-            new_channel_params['nsfw'] = nsfw
-
-        return self._guild_channel_create(guild_id, new_channel_params)
-
-    def guild_channel_create_voice(self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-                                   parent_id: str = None, nsfw: bool = None,
-                                   bitrate: int = None, user_limit: int = None) -> RequestsResponse:
-        new_channel_params = {'name': name, 'type': 2}
-        if permission_overwrites is not None:
-            new_channel_params['permission_overwrites'] = permission_overwrites
-        if parent_id is not None:
-            new_channel_params['parent_id'] = parent_id
-        if nsfw is not None:
-            new_channel_params['nsfw'] = nsfw
-        if bitrate is not None:
-            new_channel_params['bitrate'] = bitrate
-        if user_limit is not None:
-            new_channel_params['user_limit'] = user_limit
-
-        return self._guild_channel_create(guild_id, new_channel_params)
-
-    def guild_channel_create_category(self, guild_id: str, name: str, permission_overwrites: typing.List[dict] = None,
-                                      nsfw: bool = None) -> RequestsResponse:
-        # NOTE: Category channels can't have parents. Not documented in API reference but was found experimentally
-        new_channel_params = {'name': name, 'type': 4}
-        if permission_overwrites is not None:
-            new_channel_params['permission_overwrites'] = permission_overwrites
-        if nsfw is not None:
-            new_channel_params['nsfw'] = nsfw
-
-        return self._guild_channel_create(guild_id, new_channel_params)
-
-    def guild_channels_position_modify(
-            self, guild_id: str,
-            list_of_channels: typing.List[typing.Dict[str, int]]) -> RequestsResponse:
-        # NOTE: This call requires list of dictionaries with with field of id of the channel and its position.
-        # Position integers are independent of each other.
-        # Multiple channels can have same position. There can be gaps between them.
-        # Position integer can also be negative.
-        # Unlike what documentation says you can pass a single channel to this call.
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/channels', json=list_of_channels)
-    # endregion
-
-    # region Guild Member
-    def guild_member_get(self, guild_id: str, user_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}')
-
-    def guild_member_list(self, guild_id: str, limit: int = None, after: str = None) -> RequestsResponse:
-        # NOTE: default amount of users returned is just one
-        params = {}
-        if limit is not None:
-            params['limit'] = limit
-        if after is not None:
-            params['after'] = after
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/members', params=params or None)
-
-    def guild_member_add(self, guild_id: str, user_id: str, access_token: str, nick: str = None, roles: list = None,
-                         mute: bool = None, deaf: bool = None) -> RequestsResponse:
-        params = {'access_token': access_token}
-        if nick is not None:
-            params['nick'] = nick
-        if roles is not None:
-            params['roles'] = roles
-        if mute is not None:
-            params['mute'] = mute
-        if deaf is not None:
-            params['deaf'] = deaf
-        return self.put(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}', json=params)
-
-    def guild_member_modify(
-            self, guild_id: str, user_id: str, new_nick: str = None, new_roles: list = None,
-            new_mute: bool = None, new_deaf: bool = None, new_channel_id: str = None) -> RequestsResponse:
-        params = {}
-        if new_nick is not None:
-            params['nick'] = new_nick
-        if new_roles is not None:
-            params['roles'] = new_roles
-        if new_mute is not None:
-            params['mute'] = new_mute
-        if new_deaf is not None:
-            params['deaf'] = new_deaf
-        if new_channel_id is not None:
-            params['channel_id'] = new_channel_id
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}', json=params)
-
-    def guild_member_me_nick_set(self, guild_id: str, nick_to_set: str) -> RequestsResponse:
-        # IDEA: move to other me functions?
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/members/@me/nick', json={'nick': nick_to_set})
-
-    def guild_member_role_add(self, guild_id: str, user_id: str, role_id: str) -> RequestsResponse:
-        return self.put(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}/roles/{role_id}')
-
-    def guild_member_role_remove(self, guild_id: str, user_id: str, role_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}/roles/{role_id}')
-
-    def guild_member_remove(self, guild_id: str, user_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/members/{user_id}')
-    # endregion
-
-    # region Guild Ban
-    def guild_ban_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/bans')
-
-    def guild_ban_create(self, guild_id: str, user_id: str, delete_messages_days=None) -> RequestsResponse:
-        if delete_messages_days is not None:
-            delete_messages_days = {'delete-message-days': delete_messages_days}
-        return self.put(f'{self.API_URL}/guilds/{guild_id}/bans/{user_id}', params=delete_messages_days)
-
-    def guild_ban_remove(self, guild_id: str, user_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/bans/{user_id}')
-    # endregion
-
-    # region Guild Role
-    def guild_role_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/roles')
-
-    def guild_role_create(self, guild_id: str, name: str = None, permissions: int = None, color: int = None,
-                          hoist: bool = None, mentionable: bool = None) -> RequestsResponse:
-        params = {}
-        if name is not None:
-            params['name'] = name
-        if permissions is not None:
-            params['permissions'] = permissions
-        if permissions is not None:
-            params['color'] = color
-        if permissions is not None:
-            params['hoist'] = hoist
-        if permissions is not None:
-            params['mentionable'] = mentionable
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/roles', json=params or None)
-
-    def guild_role_position_modify(
-            self, guild_id: str,
-            list_of_role_positions: typing.List[typing.Dict[str, int]]) -> RequestsResponse:
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/roles', json=list_of_role_positions)
-
-    def guild_role_modify(
-            self, guild_id: str, role_id: str, new_name: str = None, new_permissions: int = None, new_color: int = None,
-            new_hoist: bool = None, new_mentionable: bool = None):
-        params = {}
-        if new_name is not None:
-            params['name'] = new_name
-        if new_permissions is not None:
-            params['permissions'] = new_permissions
-        if new_color is not None:
-            params['color'] = new_color
-        if new_hoist is not None:
-            params['hoist'] = new_hoist
-        if new_mentionable is not None:
-            params['mentionable'] = new_mentionable
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/roles/{role_id}', json=params)
-
-    def guild_role_delete(self, guild_id: str, role_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/roles/{role_id}')
-    # endregion
+    @staticmethod
+    def route_get(api_call_partial: f_partial) -> typing.Optional[Route]:
+        return ROUTES.get(api_call_partial.func.__name__)
 
-    def guild_prune_get_count(self, guild_id: str, days: int) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/prune', params={'days': days})
+    def route_key_get(self, api_call_partial: f_partial) -> typing.Tuple[typing.Hashable, tuple]:
+        """
+        Returns route identifier and major parameters of the call.
+        Calls that are not in the routes registry are identified by the function.
+        """
+        try:
+            route = ROUTES[api_call_partial.func.__name__]
+        except KeyError:
+            return api_call_partial.func, ()
 
-    def guild_prune_begin(self, guild_id: str, days: int) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/prune', params={'days': days})
-
-    def guild_voice_region_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/regions')
-
-    def guild_invite_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/invites')
-
-    # NOTE: guild integration calls had not been tested.
-
-    def guild_integration_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/integrations')
-
-    def guild_integration_create(self, guild_id: str, integration_type: str, integration_id: str) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/integrations', json={'type': integration_type,
-                                                                                 'id': integration_id})
-
-    def guild_integration_modify(self, guild_id: str, integration_id: str, expire_behavior: int,
-                                 expire_grace_period: int, enable_emoticons: int) -> RequestsResponse:
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/integrations/{integration_id}',
-                          json={
-                              'expire_behavior': expire_behavior,
-                              'expire_grace_period': expire_grace_period,
-                              'enable_emoticons': enable_emoticons
-                          })
-
-    def guild_integration_delete(self, guild_id: str, integration_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/integrations/{integration_id}')
-
-    def guild_integration_sync(self, guild_id: str, integration_id: str) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/integrations/{integration_id}/sync')
-
-    def guild_embed_get(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/embed')
-
-    def guild_embed_modify(self, guild_id: str, enabled: bool = None, channel_id: str = None) -> RequestsResponse:
-        params = {}
-        if enabled is not None:
-            params['enabled'] = enabled
-        if channel_id is not None:
-            params['channel_id'] = channel_id
-
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/embed', json=params)
-
-    # region Guild emoji
-    def guild_emoji_list(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/emojis')
-
-    def guild_emoji_get(self, guild_id: str, emoji_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/emojis/{emoji_id}')
-
-    def guild_emoji_create(self, guild_id: str, emoji_name: str, image: str, roles: tuple = ()) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/guilds/{guild_id}/emojis',
-                         json={
-                             'name': emoji_name,
-                             'image': image,
-                             'roles': roles
-                         })
-
-    def guild_emoji_modify(self, guild_id: str, emoji_id: str, emoji_name: str, roles: tuple = ()) -> RequestsResponse:
-        return self.patch(f'{self.API_URL}/guilds/{guild_id}/emojis/{emoji_id}',
-                          json={
-                              'name': emoji_name,
-                              'roles': roles
-                          })
-
-    def guild_emoji_delete(self, guild_id: str, emoji_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/guilds/{guild_id}/emojis/{emoji_id}')
-    # endregion
-    # endregion
+        return route.route_id, route.majors_get(api_call_partial.args, api_call_partial.keywords)
 
-    # region Channels REST API calls.
+    # region Hand-written REST API calls
+    # NOTE: the rest of the calls are generated from ROUTES
 
-    def channel_get(self, channel_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/channels/{channel_id}')
-
-    def channel_modify(
-            self, channel_id: str, new_name: str = None, new_position: int = None, new_topic: str = None,
-            new_nsfw: bool = None, new_bitrate: int = None, new_user_limit: int = None,
-            new_overwrite_array: typing.List[dict] = None,
-            new_parent_id: str = None):
-        params = {}
-        if new_name is not None:
-            params['name'] = new_name
-        if new_position is not None:
-            params['position'] = new_position
-        if new_topic is not None:
-            params['topic'] = new_topic
-        if new_nsfw is not None:
-            params['nsfw'] = new_nsfw
-        if new_bitrate is not None:
-            params['bitrate'] = new_bitrate
-        if new_user_limit is not None:
-            params['userlimit'] = new_user_limit
-        if new_overwrite_array is not None:
-            params['permission_overwrites'] = new_overwrite_array
-        if new_parent_id is not None:
-            params['parent_id'] = new_parent_id
-        return self.patch(f'{self.API_URL}/channels/{channel_id}', json=params)
-
-    def channel_delete(self, channel_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}')
-
-    # region Messages
     def channel_message_list(self, channel_id: str, limit: int = None, around: str = None,
                              before: str = None, after: str = None) -> RequestsResponse:
         params = {}
@@ -430,23 +217,9 @@ class DiscordSession(RequestsSession):
             params['after'] = after
         return self.get(f'{self.API_URL}/channels/{channel_id}/messages', params=params or None)
 
-    def channel_message_get(self, channel_id: str, message_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}')
-
-    def channel_message_create_json(self, channel_id: str, content: str, nonce: bool = None, tts: bool = None,
-                                    embed: dict = None) -> RequestsResponse:
-        params = {'content': content}
-        if nonce is not None:
-            params['nonce'] = nonce
-        if tts is not None:
-            params['tts'] = tts
-        if embed is not None:
-            params['embed'] = embed
-        return self.post(f'{self.API_URL}/channels/{channel_id}/messages', json=params)
-
     def channel_message_create_multipart(self, channel_id: str, content: str = None,
                                          nonce: bool = None, tts: bool = None,
-                                         files: list = None) -> RequestsResponse:
+                                         files: FilesList = None) -> RequestsResponse:
         params = {}
         if content is not None:
             params['content'] = content
@@ -454,187 +227,271 @@ class DiscordSession(RequestsSession):
             params['nonce'] = nonce
         if tts is not None:
             params['tts'] = tts
-        return self.post(f'{self.API_URL}/channels/{channel_id}/messages', data=params or None, files=files or None)
-
-    def channel_message_reaction_create(self, channel_id: str, message_id: str, emoji: str) -> RequestsResponse:
-        return self.put(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me')
-
-    def channel_message_reaction_my_delete(self, channel_id: str, message_id: str, emoji: int) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me')
-
-    def channel_message_reaction_delete(self, channel_id: str, message_id: str, user_id: str,
-                                        emoji: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id}')
-
-    def channel_message_reaction_list_users(self, channel_id: str, message_id: str, emoji: int, before: str = None,
-                                            after: str = None, limit: int = None) -> RequestsResponse:
-        params = {}
-        if before is not None:
-            params['before'] = before
-        if after is not None:
-            params['after'] = after
-        if limit is not None:
-            params['limit'] = limit
-        return self.get(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}/reactions/{emoji}',
-                        params=params or None)
-
-    def channel_message_reaction_delete_all(self, channel_id: str, message_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}/reactions')
-
-    def channel_message_edit(self, channel_id: str, message_id: str, content: str = None,
-                             embed: dict = None) -> RequestsResponse:
-        params = {}
-        if content is not None:
-            params['content'] = content
-        if embed is not None:
-            params['embed'] = embed
-        return self.patch(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}',
-                          json=params or None)
-
-    def channel_message_delete(self, channel_id: str, message_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/messages/{message_id}')
-
-    def channel_message_bulk_delete(self, channel_id: str, messages_array: list) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/channels/{channel_id}/messages/bulk-delete',
-                         json={'messages': messages_array})
+        # NOTE: files are streamed from their sources, body is built anew on every call so retries resend it
+        body = MultipartBody(params, files)
+        return self.post(f'{self.API_URL}/channels/{channel_id}/messages', data=body,
+                         headers={'Content-Type': body.content_type})
     # endregion
 
-    def channel_permissions_overwrite_edit(self, channel_id: str, overwrite_id: str, allow_permissions: int,
-                                           deny_permissions: int, type_of_permissions: str) -> RequestsResponse:
-        return self.put(f'{self.API_URL}/channels/{channel_id}/permissions/{overwrite_id}',
-                        json={'allow': allow_permissions, 'deny': deny_permissions, 'type': type_of_permissions})
 
-    def channel_permissions_overwrite_delete(self, channel_id: str, overwrite_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/permissions/{overwrite_id}')
+ROUTES: typing.Dict[str, Route] = {
+    # Current user
+    'me_get': Route('GET', '/users/@me'),
+    'user_get': Route('GET', '/users/{user_id}', 'user_id: str'),
+    'me_modify': Route('PATCH', '/users/@me', 'username: str', json=('username',)),
+    'me_guild_list': Route(
+        'GET', '/users/@me/guilds', 'before: str = None, after: str = None, limit: int = None',
+        query=('before', 'after', 'limit')),
+    'me_guild_leave': Route('DELETE', '/users/@me/guilds/{guild_id}', 'guild_id: str', returns='bool'),
+    'me_connections_get': Route('GET', '/users/@me/connections'),
+    'me_dm_list': Route('GET', '/users/@me/channels'),
+    # Direct Messaging (DM)
+    'dm_create': Route('POST', '/users/@me/channels', 'recipient_id: str', json=('recipient_id',)),
+    'dm_create_group': Route(
+        'POST', '/users/@me/channels', 'access_tokens: list, nicks: dict', json=('access_tokens', 'nicks')),
+    'dm_user_add': Route(
+        'PUT', '/channels/{channel_id}/recipients/{user_id}',
+        'channel_id: str, user_id: str, access_token: str, user_nick: str',
+        json={'access_token': 'access_token', 'user_nick': 'nick'}, client_name='dm_channel_user_add'),
+    'dm_user_remove': Route(
+        'DELETE', '/channels/{channel_id}/recipients/{user_id}', 'channel_id: str, user_id: str',
+        client_name='dm_channel_user_remove'),
+    # Guild
+    'guild_create': Route(
+        'POST', '/guilds',
+        'guild_name: str, region: str = None, icon: str = None, verification_level: int = None, '
+        'default_message_notifications: int = None, roles=None, channels=None',
+        json={'guild_name': 'name', 'region': 'region', 'icon': 'icon', 'verification_level': 'verification_level',
+              'default_message_notifications': 'default_message_notifications', 'roles': 'roles',
+              'channels': 'channels'}),
+    'guild_get': Route('GET', '/guilds/{guild_id}', 'guild_id: str'),
+    'guild_modify': Route(
+        'PATCH', '/guilds/{guild_id}',
+        'guild_id: str, new_name: str = None, new_voice_region_id: str = None, new_verification_level: int = None, '
+        'new_default_level_notifications: int = None, new_explicit_content_filter: int = None, '
+        'new_afk_channel_id: str = None, new_afk_timeout: int = None, new_icon: str = None, new_owner: str = None, '
+        'new_splash: str = None, new_system_channel_id: str = None',
+        json={'new_name': 'name', 'new_voice_region_id': 'voice_region_id',
+              'new_verification_level': 'verification_level',
+              'new_default_level_notifications': 'default_level_notifications',
+              'new_explicit_content_filter': 'explicit_content_filter', 'new_afk_channel_id': 'afk_channel_id',
+              'new_afk_timeout': 'afk_timeout', 'new_icon': 'icon', 'new_owner': 'owner_id', 'new_splash': 'splash',
+              'new_system_channel_id': 'system_channel_id'}),
+    'guild_delete': Route('DELETE', '/guilds/{guild_id}', 'guild_id: str', returns='bool'),
+    'guild_channel_list': Route('GET', '/guilds/{guild_id}/channels', 'guild_id: str'),
+    'guild_channel_create_text': Route(
+        'POST', '/guilds/{guild_id}/channels',
+        'guild_id: str, name: str, permission_overwrites: typing.List[dict] = None, parent_id: str = None, '
+        'nsfw: bool = None',
+        json=('name', 'permission_overwrites', 'parent_id', 'nsfw'), json_constants={'type': 0}),
+    'guild_channel_create_voice': Route(
+        'POST', '/guilds/{guild_id}/channels',
+        'guild_id: str, name: str, permission_overwrites: typing.List[dict] = None, parent_id: str = None, '
+        'nsfw: bool = None, bitrate: int = None, user_limit: int = None',
+        json=('name', 'permission_overwrites', 'parent_id', 'nsfw', 'bitrate', 'user_limit'),
+        json_constants={'type': 2}),
+    'guild_channel_create_category': Route(
+        'POST', '/guilds/{guild_id}/channels',
+        'guild_id: str, name: str, permission_overwrites: typing.List[dict] = None, nsfw: bool = None',
+        json=('name', 'permission_overwrites', 'nsfw'), json_constants={'type': 4}),
+    'guild_channels_position_modify': Route(
+        'PATCH', '/guilds/{guild_id}/channels', 'guild_id: str, list_of_channels: typing.List[typing.Dict[str, int]]',
+        json='list_of_channels', returns='bool'),
+    'guild_member_get': Route('GET', '/guilds/{guild_id}/members/{user_id}', 'guild_id: str, user_id: str'),
+    'guild_member_list': Route(
+        'GET', '/guilds/{guild_id}/members', 'guild_id: str, limit: int = None, after: str = None',
+        query=('limit', 'after'), client_name='guild_members_list', returns='typing.List[dict]'),
+    'guild_member_add': Route(
+        'PUT', '/guilds/{guild_id}/members/{user_id}',
+        'guild_id: str, user_id: str, access_token: str, nick: str = None, roles: list = None, mute: bool = None, '
+        'deaf: bool = None',
+        json=('access_token', 'nick', 'roles', 'mute', 'deaf')),
+    'guild_member_modify': Route(
+        'PATCH', '/guilds/{guild_id}/members/{user_id}',
+        'guild_id: str, user_id: str, new_nick: str = None, new_roles: list = None, new_mute: bool = None, '
+        'new_deaf: bool = None, new_channel_id: str = None',
+        json={'new_nick': 'nick', 'new_roles': 'roles', 'new_mute': 'mute', 'new_deaf': 'deaf',
+              'new_channel_id': 'channel_id'}),
+    'guild_member_me_nick_set': Route(
+        'PATCH', '/guilds/{guild_id}/members/@me/nick', 'guild_id: str, nick_to_set: str',
+        json={'nick_to_set': 'nick'}),
+    'guild_member_role_add': Route(
+        'PUT', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}', 'guild_id: str, user_id: str, role_id: str',
+        returns='bool'),
+    'guild_member_role_remove': Route(
+        'DELETE', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}', 'guild_id: str, user_id: str, role_id: str',
+        returns='bool'),
+    'guild_member_remove': Route(
+        'DELETE', '/guilds/{guild_id}/members/{user_id}', 'guild_id: str, user_id: str', returns='bool'),
+    'guild_ban_list': Route('GET', '/guilds/{guild_id}/bans', 'guild_id: str'),
+    'guild_ban_create': Route(
+        'PUT', '/guilds/{guild_id}/bans/{user_id}', 'guild_id: str, user_id: str, delete_messages_days=None',
+        query={'delete_messages_days': 'delete-message-days'}, returns='bool'),
+    'guild_ban_remove': Route(
+        'DELETE', '/guilds/{guild_id}/bans/{user_id}', 'guild_id: str, user_id: str', returns='bool'),
+    'guild_role_list': Route('GET', '/guilds/{guild_id}/roles', 'guild_id: str'),
+    'guild_role_create': Route(
+        'POST', '/guilds/{guild_id}/roles',
+        'guild_id: str, name: str = None, permissions: int = None, color: int = None, hoist: bool = None, '
+        'mentionable: bool = None',
+        json=('name', 'permissions', 'color', 'hoist', 'mentionable')),
+    'guild_role_position_modify': Route(
+        'PATCH', '/guilds/{guild_id}/roles',
+        'guild_id: str, list_of_role_positions: typing.List[typing.Dict[str, int]]', json='list_of_role_positions'),
+    'guild_role_modify': Route(
+        'PATCH', '/guilds/{guild_id}/roles/{role_id}',
+        'guild_id: str, role_id: str, new_name: str = None, new_permissions: int = None, new_color: int = None, '
+        'new_hoist: bool = None, new_mentionable: bool = None',
+        json={'new_name': 'name', 'new_permissions': 'permissions', 'new_color': 'color', 'new_hoist': 'hoist',
+              'new_mentionable': 'mentionable'}),
+    'guild_role_delete': Route('DELETE', '/guilds/{guild_id}/roles/{role_id}', 'guild_id: str, role_id: str'),
+    'guild_prune_get_count': Route('GET', '/guilds/{guild_id}/prune', 'guild_id: str, days: int', query=('days',)),
+    'guild_prune_begin': Route('POST', '/guilds/{guild_id}/prune', 'guild_id: str, days: int', query=('days',)),
+    'guild_voice_region_list': Route('GET', '/guilds/{guild_id}/regions', 'guild_id: str'),
+    'guild_invite_list': Route('GET', '/guilds/{guild_id}/invites', 'guild_id: str'),
+    'guild_integration_list': Route('GET', '/guilds/{guild_id}/integrations', 'guild_id: str'),
+    'guild_integration_create': Route(
+        'POST', '/guilds/{guild_id}/integrations', 'guild_id: str, integration_type: str, integration_id: str',
+        json={'integration_type': 'type', 'integration_id': 'id'}),
+    'guild_integration_modify': Route(
+        'PATCH', '/guilds/{guild_id}/integrations/{integration_id}',
+        'guild_id: str, integration_id: str, expire_behavior: int, expire_grace_period: int, enable_emoticons: int',
+        json=('expire_behavior', 'expire_grace_period', 'enable_emoticons')),
+    'guild_integration_delete': Route(
+        'DELETE', '/guilds/{guild_id}/integrations/{integration_id}', 'guild_id: str, integration_id: str'),
+    'guild_integration_sync': Route(
+        'POST', '/guilds/{guild_id}/integrations/{integration_id}/sync', 'guild_id: str, integration_id: str'),
+    'guild_embed_get': Route('GET', '/guilds/{guild_id}/embed', 'guild_id: str'),
+    'guild_embed_modify': Route(
+        'PATCH', '/guilds/{guild_id}/embed', 'guild_id: str, enabled: bool = None, channel_id: str = None',
+        json=('enabled', 'channel_id')),
+    'guild_emoji_list': Route('GET', '/guilds/{guild_id}/emojis', 'guild_id: str'),
+    'guild_emoji_get': Route('GET', '/guilds/{guild_id}/emojis/{emoji_id}', 'guild_id: str, emoji_id: str'),
+    'guild_emoji_create': Route(
+        'POST', '/guilds/{guild_id}/emojis', 'guild_id: str, emoji_name: str, image: str, roles: tuple = ()',
+        json={'emoji_name': 'name', 'image': 'image', 'roles': 'roles'}),
+    'guild_emoji_modify': Route(
+        'PATCH', '/guilds/{guild_id}/emojis/{emoji_id}',
+        'guild_id: str, emoji_id: str, emoji_name: str, roles: tuple = ()',
+        json={'emoji_name': 'name', 'roles': 'roles'}),
+    'guild_emoji_delete': Route('DELETE', '/guilds/{guild_id}/emojis/{emoji_id}', 'guild_id: str, emoji_id: str'),
+    # Channels
+    'channel_get': Route('GET', '/channels/{channel_id}', 'channel_id: str'),
+    'channel_modify': Route(
+        'PATCH', '/channels/{channel_id}',
+        'channel_id: str, new_name: str = None, new_position: int = None, new_topic: str = None, '
+        'new_nsfw: bool = None, new_bitrate: int = None, new_user_limit: int = None, '
+        'new_overwrite_array: typing.List[dict] = None, new_parent_id: str = None',
+        json={'new_name': 'name', 'new_position': 'position', 'new_topic': 'topic', 'new_nsfw': 'nsfw',
+              'new_bitrate': 'bitrate', 'new_user_limit': 'userlimit', 'new_overwrite_array': 'permission_overwrites',
+              'new_parent_id': 'parent_id'}),
+    'channel_delete': Route('DELETE', '/channels/{channel_id}', 'channel_id: str'),
+    'channel_message_list': Route(
+        'GET', '/channels/{channel_id}/messages',
+        'channel_id: str, limit: int = None, around: str = None, before: str = None, after: str = None',
+        query=('limit', 'around', 'before', 'after'), returns='typing.List[dict]'),
+    'channel_message_get': Route(
+        'GET', '/channels/{channel_id}/messages/{message_id}', 'channel_id: str, message_id: str'),
+    'channel_message_create_json': Route(
+        'POST', '/channels/{channel_id}/messages',
+        'channel_id: str, content: str, nonce: bool = None, tts: bool = None, embed: dict = None',
+        json=('content', 'nonce', 'tts', 'embed'), client=False),
+    'channel_message_create_multipart': Route(
+        'POST', '/channels/{channel_id}/messages',
+        'channel_id: str, content: str = None, nonce: bool = None, tts: bool = None, files: FilesList = None',
+        client=False),
+    'channel_message_reaction_create': Route(
+        'PUT', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+        'channel_id: str, message_id: str, emoji: str', returns='bool'),
+    'channel_message_reaction_my_delete': Route(
+        'DELETE', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+        'channel_id: str, message_id: str, emoji: int', returns='bool'),
+    'channel_message_reaction_delete': Route(
+        'DELETE', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id}',
+        'channel_id: str, message_id: str, user_id: str, emoji: str', returns='bool'),
+    'channel_message_reaction_list_users': Route(
+        'GET', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}',
+        'channel_id: str, message_id: str, emoji: str, before: str = None, after: str = None, limit: int = None',
+        query=('before', 'after', 'limit'), returns='typing.List[dict]'),
+    'channel_message_reaction_delete_all': Route(
+        'DELETE', '/channels/{channel_id}/messages/{message_id}/reactions', 'channel_id: str, message_id: str',
+        returns='bool'),
+    'channel_message_edit': Route(
+        'PATCH', '/channels/{channel_id}/messages/{message_id}',
+        'channel_id: str, message_id: str, content: str = None, embed: dict = None', json=('content', 'embed')),
+    'channel_message_delete': Route(
+        'DELETE', '/channels/{channel_id}/messages/{message_id}', 'channel_id: str, message_id: str', returns='bool'),
+    'channel_message_bulk_delete': Route(
+        'POST', '/channels/{channel_id}/messages/bulk-delete', 'channel_id: str, messages_array: list',
+        json={'messages_array': 'messages'}, returns='bool'),
+    'channel_permissions_overwrite_edit': Route(
+        'PUT', '/channels/{channel_id}/permissions/{overwrite_id}',
+        'channel_id: str, overwrite_id: str, allow_permissions: int, deny_permissions: int, type_of_permissions: str',
+        json={'allow_permissions': 'allow', 'deny_permissions': 'deny', 'type_of_permissions': 'type'}, returns='bool'),
+    'channel_permissions_overwrite_delete': Route(
+        'DELETE', '/channels/{channel_id}/permissions/{overwrite_id}', 'channel_id: str, overwrite_id: str',
+        returns='bool'),
+    'channel_invite_list': Route('GET', '/channels/{channel_id}/invites', 'channel_id: str'),
+    'channel_invite_create': Route(
+        'POST', '/channels/{channel_id}/invites',
+        'channel_id: str, max_age: int = None, max_uses: int = None, temporary_invite: bool = None, '
+        'unique: bool = None',
+        json={'max_age': 'max_age', 'max_uses': 'max_uses', 'temporary_invite': 'temporary', 'unique': 'unique'}),
+    'channel_typing_start': Route('POST', '/channels/{channel_id}/typing', 'channel_id: str', returns='bool'),
+    'channel_pins_get': Route('GET', '/channels/{channel_id}/pins', 'channel_id: str'),
+    'channel_pins_add': Route('PUT', '/channels/{channel_id}/pins/{message_id}', 'channel_id: str, message_id: str'),
+    'channel_pins_delete': Route(
+        'DELETE', '/channels/{channel_id}/pins/{message_id}', 'channel_id: str, message_id: str', returns='bool'),
+    # Invites
+    'invite_get': Route('GET', '/invites/{invite_code}', 'invite_code: str'),
+    'invite_delete': Route('DELETE', '/invites/{invite_code}', 'invite_code: str'),
+    'invite_accept': Route('POST', '/invites/{invite_code}', 'invite_code: str'),
+    # Webhooks
+    'webhook_create': Route(
+        'POST', '/channels/{channel_id}/webhooks', 'channel_id: str, name: str, avatar: bytes = None',
+        json=('name', 'avatar')),
+    'webhook_list_channel': Route(
+        'GET', '/channels/{channel_id}/webhooks', 'channel_id: str', client_name='webhook_get_channel'),
+    'webhook_list_guild': Route('GET', '/guilds/{guild_id}/webhooks', 'guild_id: str', client_name='webhook_guild_get'),
+    'webhook_get': Route('GET', '/webhooks/{webhook_id}', 'webhook_id: str'),
+    'webhook_token_get': Route('GET', '/webhooks/{webhook_id}/{webhook_token}', 'webhook_id: str, webhook_token: int'),
+    'webhook_modify': Route(
+        'PATCH', '/webhooks/{webhook_id}',
+        'webhook_id: str, name: str = None, avatar: bytes = None, channel_id: str = None',
+        json=('name', 'avatar', 'channel_id')),
+    'webhook_token_modify': Route(
+        'PATCH', '/webhooks/{webhook_id}/{webhook_token}',
+        'webhook_id: str, webhook_token: int, name: str = None, avatar: bytes = None, channel_id: str = None',
+        json=('name', 'avatar', 'channel_id')),
+    'webhook_delete': Route('DELETE', '/webhooks/{webhook_id}', 'webhook_id: str'),
+    'webhook_token_delete': Route(
+        'DELETE', '/webhooks/{webhook_id}/{webhook_token}', 'webhook_id: str, webhook_token: int'),
+    'webhook_execute': Route(
+        'POST', '/webhooks/{webhook_id}/{webhook_token}',
+        'webhook_id: str, webhook_token: int, content: str, username: str = None, avatar_url: str = None, '
+        'tts: bool = None, wait_response: bool = None',
+        json=('content', 'username', 'avatar_url', 'tts', 'wait_response')),
+    # Special
+    'voice_region_list': Route('GET', '/voice/regions'),
+    'audit_log_get': Route(
+        'GET', '/guilds/{guild_id}/audit-logs',
+        'guild_id: str, filter_user_id: str = None, filter_action_type: int = None, '
+        'filter_before_entry_id: str = None, limit: int = None',
+        query={'limit': 'limit', 'filter_user_id': 'user_id', 'filter_action_type': 'action_type',
+               'filter_before_entry_id': 'before'},
+        returns='typing.Tuple[dict, dict, dict]'),
+    'gateway_get': Route('GET', '/gateway'),
+    'gateway_bot_get': Route('GET', '/gateway/bot'),
+}
 
-    def channel_invite_list(self, channel_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/channels/{channel_id}/invites')
-
-    def channel_invite_create(self, channel_id: str, max_age: int = None, max_uses: int = None,
-                              temporary_invite: bool = None, unique: bool = None) -> RequestsResponse:
-        params = {}
-        if max_age is not None:
-            params['max_age'] = max_age
-        if max_uses is not None:
-            params['max_uses'] = max_uses
-        if temporary_invite is not None:
-            params['temporary'] = temporary_invite
-        if unique is not None:
-            params['unique'] = unique
-        return self.post(f'{self.API_URL}/channels/{channel_id}/invites', json=params)
-
-    def channel_typing_start(self, channel_id: str) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/channels/{channel_id}/typing')
-
-    def channel_pins_get(self, channel_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/channels/{channel_id}/pins')
-
-    def channel_pins_add(self, channel_id: str, message_id: str) -> RequestsResponse:
-        return self.put(f'{self.API_URL}/channels/{channel_id}/pins/{message_id}')
-
-    def channel_pins_delete(self, channel_id: str, message_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/channels/{channel_id}/pins/{message_id}')
-    # endregion
 
-    # region Invite REST API calls
-
-    def invite_get(self, invite_code: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/invites/{invite_code}')
-
-    def invite_delete(self, invite_code: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/invites/{invite_code}')
-
-    def invite_accept(self, invite_code: str) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/invites/{invite_code}')
-    # endregion
-
-    # region Webhook REST API calls
-
-    def webhook_create(self, channel_id: str, name: str, avatar: bytes = None) -> RequestsResponse:
-        return self.post(f'{self.API_URL}/channels/{channel_id}/webhooks',
-                         json={'name': name, 'avatar': avatar})
-
-    def webhook_list_channel(self, channel_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/channels/{channel_id}/webhooks')
-
-    def webhook_list_guild(self, guild_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/webhooks')
-
-    def webhook_get(self, webhook_id: str) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/webhooks/{webhook_id}')
-
-    def webhook_token_get(self, webhook_id: str, webhook_token: int) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/webhooks/{webhook_id}/{webhook_token}')
-
-    def webhook_modify(self, webhook_id: str, name: str = None, avatar: bytes = None,
-                       channel_id: str = None) -> RequestsResponse:
-        params = {}
-        if name is not None:
-            params['name'] = name
-        if avatar is not None:
-            params['avatar'] = avatar
-        if channel_id is not None:
-            params['channel_id'] = channel_id
-        return self.patch(f'{self.API_URL}/webhooks/{webhook_id}', json=params)
-
-    def webhook_token_modify(self, webhook_id: str, webhook_token: int, name: str = None, avatar: bytes = None,
-                             channel_id: str = None) -> RequestsResponse:
-        params = {}
-        if name is not None:
-            params['name'] = name
-        if avatar is not None:
-            params['avatar'] = avatar
-        if channel_id is not None:
-            params['channel_id'] = channel_id
-        return self.patch(f'{self.API_URL}/webhooks/{webhook_id}/{webhook_token}', json=params)
-
-    def webhook_delete(self, webhook_id: str) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/webhooks/{webhook_id}')
-
-    def webhook_token_delete(self, webhook_id: str, webhook_token: int) -> RequestsResponse:
-        return self.delete(f'{self.API_URL}/webhooks/{webhook_id}/{webhook_token}')
-
-    def webhook_execute(self, webhook_id: str, webhook_token: int, content: str,
-                        username: str = None, avatar_url: str = None, tts: bool = None,
-                        wait_response: bool = None) -> RequestsResponse:
-        # TODO: add support for uploading files and embeds
-        json_params = {'content': content}
-        if username is not None:
-            json_params['username'] = username
-        if avatar_url is not None:
-            json_params['avatar_url'] = avatar_url
-        if tts is not None:
-            json_params['tts'] = tts
-        if wait_response is not None:
-            json_params['wait_response'] = wait_response
+def authorization_url_get(bot_id: str) -> str:
+    return f'https://discordapp.com/api/oauth2/authorize?client_id={bot_id}&scope=bot&permissions=0'
 
-        return self.post(f'{self.API_URL}/webhooks/{webhook_id}/{webhook_token}', json=json_params)
 
-    # TODO: slack and github webhooks
-    # endregion
+def _session_method_source_get(route_name: str, route: Route) -> typing.Tuple[str, str]:
+    return route_name, route.session_source_get(route_name)
 
-    # region Special calls
 
-    def voice_region_list(self) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/voice/regions')
-
-    def audit_log_get(self, guild_id: str, filter_user_id: str = None, filter_action_type: int = None,
-                      filter_before_entry_id: str = None, limit: int = None) -> RequestsResponse:
-        params = {}
-        if limit is not None:
-            params['limit'] = limit
-        if filter_user_id is not None:
-            params['user_id'] = filter_user_id
-        if filter_action_type is not None:
-            params['action_type'] = filter_action_type
-        if filter_before_entry_id is not None:
-            params['before'] = filter_before_entry_id
-        return self.get(f'{self.API_URL}/guilds/{guild_id}/audit-logs', params=params or None)
-
-    def gateway_bot_get(self) -> RequestsResponse:
-        return self.get(f'{self.API_URL}/gateway/bot')
-    # endregion
-
-
-def authorization_url_get(bot_id: str) -> str:
-    return f'https://discordapp.com/api/oauth2/authorize?client_id={bot_id}&scope=bot&permissions=0'
+route_methods_generate(DiscordSession, _session_method_source_get,
+                       {'typing': typing, 'RequestsResponse': RequestsResponse, 'FilesList': FilesList})
@@ -0,0 +1,115 @@
+import asyncio
+import typing
+
+from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError, HTTPError
+
+from .discordrest import DiscordSession
+from .multipart_body import MultipartBody
+from .util.json_codec import json_codec
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AiohttpResponse:
+    """
+    Response of the aiohttp transport with the same interface rate limiters use from requests responses.
+    """
+
+    def __init__(self, status_code: int, headers: typing.Mapping[str, str], content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return str(self.content, encoding='UTF-8')
+
+    def json(self) -> typing.Union[dict, list]:
+        return json_codec.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class DiscordSessionAiohttp(DiscordSession):
+    """
+    DiscordSession that sends requests with aiohttp on the event loop instead of requests in a thread.
+
+    All the REST API calls return coroutines that resolve to AiohttpResponse.
+    Connections are pooled and kept alive between the calls.
+    Network errors are reraised as requests exceptions so rate limiters handle both transports the same way.
+    """
+
+    def __init__(self, token: str, proxies: dict = None, pool_size: int = 100, keep_alive_timeout: float = 60):
+        if aiohttp is None:
+            raise ImportError('aiohttp transport requires aiohttp package to be installed')
+
+        super().__init__(token, proxies)
+        self.pool_size = pool_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self.client_session: 'aiohttp.ClientSession' = None
+
+    def _client_session_get(self) -> 'aiohttp.ClientSession':
+        # NOTE: aiohttp session has to be created inside of the running event loop
+        if self.client_session is None or self.client_session.closed:
+            self.client_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keep_alive_timeout),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT_OVERWRITE),
+                headers=dict(self.headers))
+        return self.client_session
+
+    async def close_async(self) -> None:
+        if self.client_session is not None:
+            await self.client_session.close()
+
+    # region Timeout overwrites
+    def get(self, *args, **kwargs) -> typing.Awaitable[AiohttpResponse]:
+        return self._request_async('GET', *args, **kwargs)
+
+    def post(self, *args, **kwargs) -> typing.Awaitable[AiohttpResponse]:
+        return self._request_async('POST', *args, **kwargs)
+
+    def patch(self, *args, **kwargs) -> typing.Awaitable[AiohttpResponse]:
+        return self._request_async('PATCH', *args, **kwargs)
+
+    def delete(self, *args, **kwargs) -> typing.Awaitable[AiohttpResponse]:
+        return self._request_async('DELETE', *args, **kwargs)
+
+    def put(self, *args, **kwargs) -> typing.Awaitable[AiohttpResponse]:
+        return self._request_async('PUT', *args, **kwargs)
+    # endregion
+
+    async def _request_async(self, method: str, url: str, params: dict = None, json: typing.Any = None,
+                             data: typing.Union[dict, MultipartBody] = None,
+                             headers: dict = None) -> AiohttpResponse:
+        if params is not None:
+            # NOTE: aiohttp does not accept bool and None query values
+            params = {k: str(v).lower() if isinstance(v, bool) else str(v) for k, v in params.items()}
+
+        request_arguments = {}
+        if json is not None:
+            data = json_codec.dumps_bytes(json)
+            headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+        elif isinstance(data, MultipartBody):
+            # NOTE: uploads are streamed with known length, total timeout would cut off large files
+            headers = dict(headers or {}, **{'Content-Length': str(len(data))})
+            request_arguments['timeout'] = aiohttp.ClientTimeout(sock_connect=self.TIMEOUT_OVERWRITE,
+                                                                 sock_read=self.TIMEOUT_OVERWRITE)
+            data = data.__aiter__()
+
+        try:
+            async with self._client_session_get().request(
+                    method, url, params=params, data=data, headers=headers,
+                    proxy=self.proxies.get('https') if self.proxies else None, **request_arguments) as response:
+                return AiohttpResponse(response.status, response.headers, await response.read(), str(response.url))
+        except aiohttp.ClientConnectorError as e:
+            raise ConnectTimeout(e)
+        except asyncio.TimeoutError as e:
+            raise ReadTimeout(e)
+        except aiohttp.ClientConnectionError as e:
+            raise ConnectionError(e)
@@ -18,9 +18,14 @@ class DiscordSocketThread:
     def __init__(self, token: str):
         self.local_event_loop = asyncio.get_event_loop()
 
+        self.event_dispatcher = QueueDispenser([x for x in SocketEventNames])
+        self.event_dispatcher_running = False
+
         self.discord_socket_loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        # NOTE: events nobody waits for are not decoded
         self.discord_socket = discordsocket.DiscordSocket(token, event_loop=self.discord_socket_loop,
-                                                          event_handler=dummy_plug)
+                                                          event_handler=dummy_plug,
+                                                          event_filter=self.event_dispatcher.is_subscribed)
 
         self.thread = ThreadPoolExecutor(max_workers=1)
         self.thread_future = self.thread.submit(self.discord_socket_loop.run_forever)
@@ -31,9 +36,6 @@ class DiscordSocketThread:
 
         self.discord_socket_future.add_done_callback(self._socket_future_complete)
 
-        self.event_dispatcher = QueueDispenser([x for x in SocketEventNames])
-        self.event_dispatcher_running = False
-
         self.failure_count = 0
 
         finalize(self, self.stop)
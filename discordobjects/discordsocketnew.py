@@ -1,12 +1,15 @@
 import asyncio
-import json
 import logging
+import re
 import typing
 import zlib
 from functools import partial
 
 import websockets
 
+from .util.etf import etf_loads, etf_dumps
+from .util.json_codec import json_codec
+
 identity_template = {
     'properties':
         {
@@ -19,18 +22,79 @@ identity_template = {
 }
 
 
+class ZlibStreamInflator:
+    """
+    Decompressor of the zlib-stream gateway transport compression.
+
+    Whole connection is one zlib stream, every payload ends with Z_SYNC_FLUSH marker.
+    Payload may be split between several frames so data is buffered until the marker.
+    New inflator has to be used for every connection.
+    """
+    ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
+    def __init__(self):
+        self.decompressor = zlib.decompressobj()
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> typing.Optional[bytes]:
+        """
+        Returns decompressed payload or None if the payload is not complete yet.
+        """
+        if not self.buffer and data.endswith(self.ZLIB_SUFFIX):
+            # NOTE: most payloads fit in a single frame, no need to copy them to the buffer
+            return self.decompressor.decompress(data)
+
+        self.buffer.extend(data)
+        if not self.buffer.endswith(self.ZLIB_SUFFIX):
+            return None
+
+        payload = self.decompressor.decompress(self.buffer)
+        self.buffer.clear()
+        return payload
+
+
 class DiscordSocket:
+    # NOTE: gateway sends t, s and op before d so they can be read without decoding the whole payload
+    PAYLOAD_HEADER_REGEX = re.compile(rb'\{\s*"t":\s*(?:null|"(\w+)"),\s*"s":\s*(?:null|(\d+)),\s*"op":\s*(\d+),\s*"d"')
+    ALWAYS_DECODED_EVENTS = frozenset(('READY', 'RESUMED'))
 
     def __init__(self, token,
                  socket_url='wss://gateway.discord.gg/?v=6&encoding=json',
                  presence={'status': 'online', 'afk': False}.copy(),
                  shard_num: int = 0, shard_total: int = 1,
                  event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop(),
-                 event_handler: typing.Callable[[dict], None] = print
+                 event_handler: typing.Callable[[dict], None] = print,
+                 zlib_stream: bool = True,
+                 encoding: str = 'json',
+                 identify_throttle: typing.Callable[[int], typing.Awaitable[None]] = None,
+                 event_filter: typing.Callable[[str], bool] = None
                  ):
+        """
+        :param zlib_stream: compress the whole connection with zlib-stream instead of compressing
+            only the large payloads one by one
+        :param encoding: 'json' or 'etf'. Payloads are decoded to the same dicts with both encodings.
+        :param identify_throttle: awaited with the shard number before every identify,
+            used to keep several shards within the identify rate limit
+        :param event_filter: called with the event name, events it returns False for are neither decoded
+            nor passed to event_handler. Only the sequence number is read from them.
+        """
 
         self.token = token
+        self.zlib_stream = zlib_stream
+        if encoding == 'etf':
+            socket_url = socket_url.replace('encoding=json', 'encoding=etf')
+            self.payload_loads: typing.Callable[[typing.Union[str, bytes]], dict] = etf_loads
+            self.payload_dumps: typing.Callable[[dict], typing.Union[str, bytes]] = etf_dumps
+        elif encoding == 'json':
+            self.payload_loads = json_codec.loads
+            self.payload_dumps = json_codec.dumps
+        else:
+            raise ValueError(f"Unknown gateway encoding {encoding}")
+        self.encoding = encoding
+        if zlib_stream and 'compress=' not in socket_url:
+            socket_url += '&compress=zlib-stream'
         self.socket_url = socket_url
+        self.inflator: ZlibStreamInflator = None
         self.presence = presence
         self.shard_num = shard_num
         self.shard_total = shard_total
@@ -46,6 +110,8 @@ class DiscordSocket:
         self.session_id = None
 
         self.event_handler = event_handler
+        self.identify_throttle = identify_throttle
+        self.event_filter = event_filter
 
     async def init(self) -> None:
         heart_beat = None
@@ -58,7 +124,10 @@ class DiscordSocket:
         while self.running:
             try:
                 async with websockets.connect(self.socket_url, timeout=1, loop=self.event_loop) as discord_socket:
-                    self.hello_payload = json.loads(await discord_socket.recv())
+                    self.inflator = ZlibStreamInflator() if self.zlib_stream else None
+                    self.hello_payload = None
+                    while self.hello_payload is None:
+                        self.hello_payload = self._payload_decode(await discord_socket.recv())
                     self.heartbeat_interval = self.hello_payload['d']['heartbeat_interval'] / 1000
 
                     if self.session_id is None:
@@ -69,9 +138,9 @@ class DiscordSocket:
                     heart_beat = self.event_loop.create_task(self._heartbeat_cycle(discord_socket))
 
                     async for message in discord_socket:
-                        if isinstance(message, bytes):
-                            message = str(zlib.decompress(message), encoding='UTF-8')
-                        payload = json.loads(message)
+                        payload = self._payload_decode(message)
+                        if payload is None:
+                            continue
                         if 's' in payload:
                             self.heartbeat_sequence = payload['s']
                         if payload['op'] == 11:  # discarding the op11 heartbeat ACK
@@ -100,21 +169,57 @@ class DiscordSocket:
                 self.running = False
                 cancel_heartbeat()
 
+    def _payload_decode(self, message: typing.Union[str, bytes]) -> typing.Optional[dict]:
+        if isinstance(message, bytes):
+            if self.inflator is not None:
+                message = self.inflator.feed(message)
+                if message is None:
+                    return None
+            elif self.encoding == 'json':
+                message = zlib.decompress(message)
+
+        if self.event_filter is not None and self.encoding == 'json' and not self._payload_is_wanted(message):
+            return None
+        return self.payload_loads(message)
+
+    def _payload_is_wanted(self, message: typing.Union[str, bytes]) -> bool:
+        if isinstance(message, str):
+            message = message.encode()
+
+        header = self.PAYLOAD_HEADER_REGEX.match(message)
+        if header is None or header.group(3) != b'0' or header.group(1) is None:
+            # NOTE: fields are in an unexpected order, decoding the payload to be sure
+            return True
+
+        event_name = header.group(1).decode()
+        if event_name in self.ALWAYS_DECODED_EVENTS or self.event_filter(event_name):
+            return True
+
+        if header.group(2) is not None:
+            self.heartbeat_sequence = int(header.group(2))
+        return False
+
     async def _heartbeat_cycle(self, websocket) -> None:
         while self.running:
             await asyncio.sleep(self.heartbeat_interval)
-            await websocket.send(json.dumps({'op': 1, 'd': self.heartbeat_sequence}))
+            await websocket.send(self.payload_dumps({'op': 1, 'd': self.heartbeat_sequence}))
 
     async def _reconnect(self, websocket) -> None:
-        await websocket.send(json.dumps(
+        await websocket.send(self.payload_dumps(
             {'op': 6, 'd': {'token': self.token, 'session_id': self.session_id, 'seq': self.heartbeat_sequence}}))
 
     async def _identify(self, websocket) -> None:
+        if self.identify_throttle is not None:
+            await self.identify_throttle(self.shard_num)
+
         identify_payload = identity_template.copy()
         identify_payload['token'] = self.token
         identify_payload['presence'] = self.presence
         identify_payload['shard'] = [self.shard_num, self.shard_total]
-        await websocket.send(json.dumps({'op': 2, 'd': identify_payload}))
+        # NOTE: payload compression can not be used together with transport compression
+        # NOTE: ETF frames are always binary so only JSON ones can be told apart by compression
+        identify_payload['compress'] = not self.zlib_stream and self.encoding == 'json'
+        await websocket.send(self.payload_dumps({'op': 2, 'd': identify_payload}))
 
     async def set_event_handler(self, new_event_handler: typing.Callable[[dict], None]):
         self.event_handler = new_event_handler
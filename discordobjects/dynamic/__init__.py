@@ -8,6 +8,9 @@ from .guild_members import LiveGuildMembers
 from .guild_roles import LiveGuildRoles
 from .voice_state import VoiceStateManager, VoiceEvents, VoiceState
 from .guild_channels import LiveGuildChannels
+from .bulk_role_assignment import BulkRoleAssignment
+from .channel_archiver import ChannelArchiver
 
 __all__ = ['LiveGuildMembers', 'LiveGuildRoles',  'LiveGuildChannels',
-           'CommandHandle', 'Canvas', 'CommandCallback', 'VoiceStateManager']
+           'CommandHandle', 'Canvas', 'CommandCallback', 'VoiceStateManager', 'BulkRoleAssignment',
+           'ChannelArchiver']
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import os
+import typing
+
+from ..client import DiscordClientAsync, Priority
+from ..exceptions import DiscordUnavailable, RetriesExhausted, UnknownMember
+
+MemberRoles = typing.Tuple[str, typing.List[str]]
+
+
+class BulkRoleAssignment:
+    """
+    Gives roles to many guild members and can resume after crash or restart.
+
+    Members are processed in the order of their ids in pages of page_size.
+    Members that already have the roles are skipped. Member missing a single role gets it with
+    role add call, member missing several roles gets all of them with one member modify call.
+    Calls are made with BULK priority at the maximum rate of the guild bucket.
+
+    After each page the id of the last processed member and the ids of the members the calls failed for
+    are written to the checkpoint file. Next run with the same checkpoint file skips the members up to that id
+    except the failed ones, which are tried again. Failed members that left the guild or no longer pass
+    the member filter are dropped. If Discord is unavailable or retries are exhausted
+    the run stops with that exception after the page, so it can be resumed later.
+    Checkpoint file is written in the default executor and removed once all members are processed without failures.
+
+    Member modify call replaces all roles of the member with the roles from the member listing
+    plus the missing ones. Roles given to or removed from the member after it was listed are overwritten.
+    Pass members with fresh roles or use a single role to avoid it.
+    """
+
+    def __init__(self, client_bind: DiscordClientAsync, guild_id: str, role_ids: typing.Iterable[str],
+                 checkpoint_path: str = None, page_size: int = 1000):
+        self.client_bind = client_bind
+        self.guild_id = guild_id
+        self.role_ids = list(role_ids)
+        self.checkpoint_path = checkpoint_path
+        self.page_size = page_size
+
+        self.last_member_id: str = None
+        self.changed_count: int = 0
+        self.failed_member_ids: typing.Set[str] = set()
+        self._checkpoint_load()
+
+    def _checkpoint_load(self) -> None:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        if checkpoint['guild_id'] != self.guild_id or checkpoint['role_ids'] != self.role_ids:
+            raise ValueError(f"Checkpoint file {self.checkpoint_path} belongs to a different assignment")
+
+        self.last_member_id = checkpoint['last_member_id']
+        self.changed_count = checkpoint['changed_count']
+        self.failed_member_ids = set(checkpoint.get('failed_member_ids', ()))
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.failed_member_ids)
+
+    async def _checkpoint_save(self) -> None:
+        if self.checkpoint_path is None:
+            return
+
+        checkpoint = {
+            'guild_id': self.guild_id,
+            'role_ids': self.role_ids,
+            'last_member_id': self.last_member_id,
+            'changed_count': self.changed_count,
+            'failed_member_ids': sorted(self.failed_member_ids, key=int),
+        }
+        await asyncio.get_event_loop().run_in_executor(None, self._checkpoint_write, checkpoint)
+
+    def _checkpoint_write(self, checkpoint: dict) -> None:
+        # NOTE: written to temporary file first so crash during write does not corrupt the checkpoint
+        temporary_path = self.checkpoint_path + '.tmp'
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _checkpoint_remove(self) -> None:
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    async def run_from_rest(self, member_filter: typing.Callable[[dict], bool] = None) -> int:
+        """
+        Downloads guild members and gives roles to ones member_filter returns True for.
+        Members that failed in the previous run are downloaded again first.
+        Returns number of members changed.
+
+        :param member_filter: called with member dict, all members are processed if None
+        """
+        async def members_gen() -> typing.AsyncGenerator[MemberRoles, None]:
+            for user_id in sorted(self.failed_member_ids, key=int):
+                try:
+                    member_dict = await self.client_bind.guild_member_get(self.guild_id, user_id)
+                except UnknownMember:
+                    # NOTE: member left the guild since the failure
+                    self.failed_member_ids.discard(user_id)
+                    continue
+                if member_filter is None or member_filter(member_dict):
+                    yield member_dict['user']['id'], member_dict['roles']
+
+            async for member_dict in self.client_bind.guild_member_iter(self.guild_id, after=self.last_member_id):
+                if member_filter is None or member_filter(member_dict):
+                    yield member_dict['user']['id'], member_dict['roles']
+
+        return await self.run(members_gen())
+
+    async def run(self, members: typing.AsyncIterable[MemberRoles]) -> int:
+        """
+        Gives roles to the members. Returns number of members changed.
+
+        :param members: user ids and current role ids of the members in ascending order of user ids.
+            Members that failed in the previous run can come before the rest,
+            the ones that are not passed are no longer tried.
+        """
+        page: typing.List[MemberRoles] = []
+        previously_failed_ids = set(self.failed_member_ids)
+        with self.client_bind.priority(Priority.BULK):
+            async for user_id, roles_ids in members:
+                if (self.last_member_id is not None and int(user_id) <= int(self.last_member_id)
+                        and user_id not in self.failed_member_ids):
+                    continue
+
+                previously_failed_ids.discard(user_id)
+
+                page.append((user_id, roles_ids))
+                if len(page) == self.page_size:
+                    await self._page_process(page)
+                    page = []
+
+            if page:
+                await self._page_process(page)
+
+        # NOTE: failed members left out by the caller left the guild or no longer pass its filter
+        self.failed_member_ids -= previously_failed_ids
+        if self.failed_member_ids:
+            await self._checkpoint_save()
+        elif self.checkpoint_path is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._checkpoint_remove)
+        return self.changed_count
+
+    async def _page_process(self, page: typing.List[MemberRoles]) -> None:
+        role_add_arguments = []
+        modify_arguments = []
+        for user_id, roles_ids in page:
+            missing_roles = [x for x in self.role_ids if x not in roles_ids]
+            if len(missing_roles) == 1:
+                role_add_arguments.append((self.guild_id, user_id, missing_roles[0]))
+            elif missing_roles:
+                # NOTE: roles changed since the member was listed are overwritten, see class docstring
+                modify_arguments.append({'guild_id': self.guild_id, 'user_id': user_id,
+                                         'new_roles': list(roles_ids) + missing_roles})
+            else:
+                self.failed_member_ids.discard(user_id)
+
+        role_add_results, modify_results = await asyncio.gather(
+            self.client_bind.map(self.client_bind.guild_member_role_add, role_add_arguments),
+            self.client_bind.map(self.client_bind.guild_member_modify, modify_arguments))
+
+        user_ids = [x[1] for x in role_add_arguments] + [x['user_id'] for x in modify_arguments]
+        unavailable_exception = None
+        failed_exceptions = []
+        for user_id, result in zip(user_ids, role_add_results + modify_results):
+            if isinstance(result, UnknownMember):
+                # NOTE: member left the guild after it was listed, nothing to retry
+                self.failed_member_ids.discard(user_id)
+            elif isinstance(result, Exception):
+                self.failed_member_ids.add(user_id)
+                failed_exceptions.append(result)
+                if isinstance(result, (DiscordUnavailable, RetriesExhausted)):
+                    unavailable_exception = result
+            else:
+                self.failed_member_ids.discard(user_id)
+                self.changed_count += 1
+
+        if failed_exceptions:
+            logging.warning(f"Bulk role assignment in guild {self.guild_id} failed for {len(failed_exceptions)} "
+                            f"members of the page. Last error: {failed_exceptions[-1]!r}")
+
+        # NOTE: page can start with the members retried from the previous run, checkpoint never moves back
+        page_last_member_id = max((x[0] for x in page), key=int)
+        if self.last_member_id is None or int(page_last_member_id) > int(self.last_member_id):
+            self.last_member_id = page_last_member_id
+        await self._checkpoint_save()
+
+        if unavailable_exception is not None:
+            # NOTE: the rest of the members would fail the same way, failed ones are retried by the next run
+            raise unavailable_exception
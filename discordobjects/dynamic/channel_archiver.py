@@ -0,0 +1,177 @@
+import asyncio
+import gzip
+import logging
+import os
+import typing
+from time import time
+
+from ..client import DiscordClientAsync, Priority
+from ..client.prefetch import prefetch_pages
+from ..util.json_codec import json_codec
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ArchiveFileWriter:
+    """
+    Writes message dicts as JSON lines to compressed files of one channel.
+    New file is started once the current one grows over max_file_size bytes of uncompressed data.
+    Files are named by the id of their first message and the time the writer was created in milliseconds,
+    so a run repeating the page of a failed run does not collide with its file.
+    """
+
+    def __init__(self, directory: str, compression: str, max_file_size: int):
+        self.directory = directory
+        self.run_id = str(int(time() * 1000))
+        self.compression = compression
+        self.max_file_size = max_file_size
+        self.file: typing.BinaryIO = None
+        self.compressed_stream: typing.BinaryIO = None
+        self.file_size: int = 0
+
+    def _open(self, first_message_id: str) -> None:
+        if self.compression == 'zstd':
+            self.file = open(os.path.join(self.directory, f"{first_message_id}.{self.run_id}.jsonl.zst"), 'xb')
+            self.compressed_stream = zstandard.ZstdCompressor().stream_writer(self.file)
+        else:
+            self.file = open(os.path.join(self.directory, f"{first_message_id}.{self.run_id}.jsonl.gz"), 'xb')
+            self.compressed_stream = gzip.GzipFile(fileobj=self.file, mode='wb')
+        self.file_size = 0
+
+    def write(self, message_dicts: typing.List[dict]) -> None:
+        for message_dict in message_dicts:
+            if self.file is None:
+                self._open(message_dict['id'])
+
+            line = json_codec.dumps_bytes(message_dict) + b'\n'
+            self.compressed_stream.write(line)
+            self.file_size += len(line)
+
+            if self.file_size >= self.max_file_size:
+                self.close()
+
+    def flush(self) -> None:
+        """
+        Makes everything written so far readable from the file even if the process is killed afterwards.
+        """
+        if self.file is None:
+            return
+
+        if self.compression == 'zstd':
+            self.compressed_stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self.compressed_stream.flush()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+
+        self.compressed_stream.close()
+        if not self.file.closed:
+            self.file.close()
+        self.file = None
+        self.compressed_stream = None
+
+
+class ChannelArchiver:
+    """
+    Archives history of text channels to compressed JSONL files.
+
+    Every channel gets its own directory inside archive_directory. Messages are written from oldest to newest,
+    one page at a time, so memory use does not depend on the size of the history.
+    After each page the id of the newest archived message is written to the cursor file of the channel,
+    next run continues after it. Each run starts new files, existing files are never appended to.
+
+    Compression is zstd if zstandard package is installed and gzip otherwise.
+    Compression and disk writes run in the default executor.
+    Channels are archived in parallel with BULK priority.
+    """
+    CURSOR_FILE_NAME = 'cursor'
+
+    def __init__(self, client_bind: DiscordClientAsync, archive_directory: str, compression: str = None,
+                 max_file_size: int = 256 * 1024 * 1024, step_size: int = 100):
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        elif compression == 'zstd' and zstandard is None:
+            raise ImportError('zstd compression requires zstandard package to be installed')
+        elif compression not in ('zstd', 'gzip'):
+            raise ValueError(f"Unknown compression {compression}")
+
+        self.client_bind = client_bind
+        self.archive_directory = archive_directory
+        self.compression = compression
+        self.max_file_size = max_file_size
+        self.step_size = step_size
+
+    def cursor_get(self, channel_id: str) -> str:
+        """
+        Returns id of the newest archived message of the channel or '0' if nothing was archived.
+        """
+        try:
+            with open(os.path.join(self.archive_directory, channel_id, self.CURSOR_FILE_NAME)) as cursor_file:
+                return cursor_file.read().strip()
+        except FileNotFoundError:
+            return '0'
+
+    def _cursor_save(self, channel_id: str, message_id: str) -> None:
+        cursor_path = os.path.join(self.archive_directory, channel_id, self.CURSOR_FILE_NAME)
+        # NOTE: written to temporary file first so crash during write does not corrupt the cursor
+        with open(cursor_path + '.tmp', 'w') as cursor_file:
+            cursor_file.write(message_id)
+        os.replace(cursor_path + '.tmp', cursor_path)
+
+    def _page_save(self, writer: ArchiveFileWriter, channel_id: str, message_dicts: typing.List[dict]) -> None:
+        writer.write(message_dicts)
+        writer.flush()
+        self._cursor_save(channel_id, message_dicts[-1]['id'])
+
+    async def archive_channel(self, channel_id: str) -> int:
+        """
+        Archives messages of the channel posted after the previous run. Returns number of messages archived.
+        """
+        channel_directory = os.path.join(self.archive_directory, channel_id)
+        os.makedirs(channel_directory, exist_ok=True)
+
+        cursor = self.cursor_get(channel_id)
+        event_loop = asyncio.get_event_loop()
+        writer = ArchiveFileWriter(channel_directory, self.compression, self.max_file_size)
+        archived_count = 0
+        try:
+            with self.client_bind.priority(Priority.BULK):
+                async for message_dicts in prefetch_pages(
+                        lambda after_id: self.client_bind.channel_message_list(
+                            channel_id, limit=self.step_size, after=after_id),
+                        lambda page: max(page, key=lambda x: int(x['id']))['id']
+                        if len(page) == self.step_size else None,
+                        cursor):
+                    # NOTE: page after the cursor is returned newest first
+                    message_dicts.sort(key=lambda x: int(x['id']))
+                    await event_loop.run_in_executor(None, self._page_save, writer, channel_id, message_dicts)
+                    archived_count += len(message_dicts)
+        finally:
+            await event_loop.run_in_executor(None, writer.close)
+
+        return archived_count
+
+    async def archive(self, channel_ids: typing.Iterable[str], concurrency: int = 4) -> typing.Dict[str, int]:
+        """
+        Archives several channels in parallel. Returns number of archived messages per channel.
+        Channel that failed is logged and its number is the exception instead.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        channel_ids = list(channel_ids)
+
+        async def archive_limited(channel_id: str) -> int:
+            async with semaphore:
+                return await self.archive_channel(channel_id)
+
+        results = await asyncio.gather(*(archive_limited(x) for x in channel_ids), return_exceptions=True)
+        for channel_id, result in zip(channel_ids, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Archiving channel {channel_id} failed: {result!r}")
+        return dict(zip(channel_ids, results))
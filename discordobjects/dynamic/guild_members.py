@@ -8,6 +8,7 @@ from ..constants import SocketEventNames
 from ..static import GuildMember
 from ..static import User
 from .base_dynamic import BaseDynamic
+from .bulk_role_assignment import BulkRoleAssignment
 from ..exceptions import MemberNotInGuild
 
 
@@ -85,6 +86,22 @@ class LiveGuildMembers(BaseDynamic):
         while True:
             yield (await queue.get())[0]
 
+    async def bulk_roles_add(self, roles_ids: typing.Iterable[str],
+                             member_filter: typing.Callable[[GuildMember], bool] = None,
+                             checkpoint_path: str = None) -> int:
+        """
+        Gives roles to every member member_filter returns True for. Returns number of members changed.
+        Interrupted run continues from the checkpoint file if the same path is passed again.
+        """
+        assignment = BulkRoleAssignment(self.client_bind, self.guild_id, roles_ids, checkpoint_path)
+
+        async def members_gen() -> typing.AsyncGenerator[typing.Tuple[str, typing.List[str]], None]:
+            for member in sorted(self.members.values(), key=lambda x: int(x.snowflake)):
+                if member_filter is None or member_filter(member):
+                    yield member.snowflake, member.roles_ids
+
+        return await assignment.run(members_gen())
+
     @typing.overload
     def __getitem__(self, user: User) -> GuildMember:
         ...
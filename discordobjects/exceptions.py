@@ -1,8 +1,9 @@
 import typing
-from json import JSONDecodeError
 
 from requests import Response
 
+from .util.json_codec import json_codec
+
 
 class DiscordObjectsException(Exception):
     pass
@@ -43,7 +44,7 @@ class UnknownInvite(RestError):
 
 
 class UnknownMember(RestError):
-    code = 10006
+    code = 10007
     pass
 
 
@@ -264,10 +265,18 @@ class MemberNotInGuild(DiscordObjectsException):
     pass
 
 
+class RetriesExhausted(DiscordObjectsException):
+    pass
+
+
+class DiscordUnavailable(DiscordObjectsException):
+    pass
+
+
 def rest_exception_handler(request: Response):
     try:
-        json_dict: dict = request.json()
-    except JSONDecodeError:
+        json_dict: dict = json_codec.loads(request.content)
+    except ValueError:
         raise request.raise_for_status()
 
     error_code = json_dict.get('code', None)
@@ -0,0 +1,116 @@
+import mimetypes
+import os
+import typing
+from mmap import mmap
+from uuid import uuid4
+
+from .util.json_codec import json_codec
+
+FileSource = typing.Union[bytes, bytearray, memoryview, mmap, os.PathLike, typing.BinaryIO]
+FilesList = typing.Union[typing.Dict[str, typing.Any], typing.List[typing.Tuple[str, typing.Any]]]
+
+
+class _FilePart:
+    """
+    File of the multipart body. Contents are read when the body is sent, not when it is created.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, source: FileSource):
+        self.source = source
+        if isinstance(source, os.PathLike):
+            self.size = os.path.getsize(source)
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap)):
+            self.size = len(memoryview(source).cast('B'))
+        else:
+            # NOTE: file objects are read from their current position every time the body is sent
+            self.start_position = source.tell()
+            self.size = source.seek(0, os.SEEK_END) - self.start_position
+            source.seek(self.start_position)
+
+    def __iter__(self) -> typing.Iterator[typing.Union[bytes, memoryview]]:
+        if isinstance(self.source, (bytes, bytearray, memoryview, mmap)):
+            view = memoryview(self.source).cast('B')
+            for position in range(0, self.size, self.CHUNK_SIZE):
+                yield view[position:position + self.CHUNK_SIZE]
+        elif isinstance(self.source, os.PathLike):
+            with open(self.source, 'rb') as file:
+                yield from self._file_read(file)
+        else:
+            self.source.seek(self.start_position)
+            yield from self._file_read(self.source)
+
+    def _file_read(self, file: typing.BinaryIO) -> typing.Iterator[bytes]:
+        remaining = self.size
+        while remaining > 0:
+            chunk = file.read(min(self.CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ValueError('File was truncated while being uploaded')
+            remaining -= len(chunk)
+            yield chunk
+
+
+class MultipartBody:
+    """
+    multipart/form-data request body that streams files instead of copying them into memory.
+
+    Files can be bytes, memoryview or mmap which are sent without copying,
+    os.PathLike paths which are opened when the body is sent, or binary file objects.
+    Files are accepted in the same format as requests files argument:
+    (field_name, file) or (field_name, (file_name, file)) or (field_name, (file_name, file, content_type)).
+
+    Length is known in advance so the body is sent with Content-Length.
+    Body can be iterated several times so the requests can be retried.
+    """
+
+    def __init__(self, fields: typing.Dict[str, typing.Any] = None, files: FilesList = None):
+        self.boundary = uuid4().hex
+        self.parts: typing.List[typing.Union[bytes, _FilePart]] = []
+
+        for field_name, value in (fields or {}).items():
+            if isinstance(value, (dict, list)):
+                value = json_codec.dumps(value)
+            elif isinstance(value, bool):
+                value = str(value).lower()
+            self._header_add(f'Content-Disposition: form-data; name="{field_name}"\r\n')
+            self.parts.append(str(value).encode())
+
+        for field_name, file_value in ((files or {}).items() if isinstance(files, dict) else (files or ())):
+            if isinstance(file_value, tuple):
+                file_name, source = file_value[0], file_value[1]
+                content_type = file_value[2] if len(file_value) > 2 else None
+            else:
+                file_name, source, content_type = field_name, file_value, None
+
+            if isinstance(source, str):
+                source = source.encode()
+            if content_type is None:
+                content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+
+            self._header_add(f'Content-Disposition: form-data; name="{field_name}"; filename="{file_name}"\r\n'
+                             f'Content-Type: {content_type}\r\n')
+            self.parts.append(_FilePart(source))
+
+        self.parts.append(f'\r\n--{self.boundary}--\r\n'.encode())
+
+    def _header_add(self, headers: str) -> None:
+        separator = '\r\n' if self.parts else ''
+        self.parts.append(f'{separator}--{self.boundary}\r\n{headers}\r\n'.encode())
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return sum(len(x) if isinstance(x, bytes) else x.size for x in self.parts)
+
+    def __iter__(self) -> typing.Iterator[typing.Union[bytes, memoryview]]:
+        for part in self.parts:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from part
+
+    async def __aiter__(self) -> typing.AsyncIterator[typing.Union[bytes, memoryview]]:
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,502 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+import threading
+import typing
+from concurrent.futures import Future as ConcurrentFuture, wait as concurrent_wait, ThreadPoolExecutor
+from functools import partial
+from multiprocessing.connection import Connection, wait as connections_wait
+from time import time, sleep
+from weakref import finalize
+
+from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError
+
+from . import discordsocketnew as discordsocket
+from .client.retry_policy import RetryPolicy
+from .constants import SocketEventNames
+from .discordrest import DiscordSession
+from .exceptions import rest_exception_handler
+from .util import QueueDispenser
+from .util.json_codec import json_codec
+
+GATEWAY_QUERY = '/?v=6&encoding=json'
+MAX_SHARD_FAILURES = 3
+EVENT_BUFFER_SIZE = 10000
+
+EventFilters = typing.Dict[str, typing.Callable[[dict], bool]]
+
+
+class IdentifyThrottle:
+    """
+    Keeps identifies of several shards within the gateway limit.
+
+    Shards with the same shard_num % max_concurrency share a rate limit key,
+    only one identify per key is allowed every IDENTIFY_PERIOD seconds.
+    """
+    IDENTIFY_PERIOD = 5
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self.locks: typing.Dict[int, asyncio.Lock] = {}
+        self.next_identify_times: typing.Dict[int, float] = {}
+
+    async def __call__(self, shard_num: int) -> None:
+        rate_limit_key = shard_num % self.max_concurrency
+        try:
+            lock = self.locks[rate_limit_key]
+        except KeyError:
+            lock = asyncio.Lock()
+            self.locks[rate_limit_key] = lock
+
+        async with lock:
+            delay = self.next_identify_times.get(rate_limit_key, 0) - time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_identify_times[rate_limit_key] = time() + self.IDENTIFY_PERIOD
+
+
+class ProcessIdentifyThrottle:
+    """
+    IdentifyThrottle shared by the shards of several processes. Has to be passed to the processes when they start.
+    """
+    IDENTIFY_PERIOD = IdentifyThrottle.IDENTIFY_PERIOD
+
+    def __init__(self, max_concurrency: int = 1, context: multiprocessing.context.BaseContext = multiprocessing):
+        self.max_concurrency = max_concurrency
+        self.locks = [context.Lock() for _ in range(max_concurrency)]
+        self.next_identify_times = context.Array('d', max_concurrency, lock=False)
+
+    async def __call__(self, shard_num: int) -> None:
+        rate_limit_key = shard_num % self.max_concurrency
+        lock = self.locks[rate_limit_key]
+        # NOTE: lock of the other process can not be awaited, waiting for it in the thread executor
+        await asyncio.get_event_loop().run_in_executor(None, lock.acquire)
+        try:
+            delay = self.next_identify_times[rate_limit_key] - time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_identify_times[rate_limit_key] = time() + self.IDENTIFY_PERIOD
+        finally:
+            lock.release()
+
+
+def gateway_bot_get(token: str, retry_policy: RetryPolicy = None,
+                    is_running: typing.Callable[[], bool] = lambda: True) -> typing.Optional[dict]:
+    """
+    Returns gateway_bot_get response. Blocks the thread.
+
+    Server errors, connection errors and 429 responses are retried according to retry_policy,
+    RetriesExhausted is raised once it gives up. Returns None if is_running returns False while waiting to retry.
+    """
+    if retry_policy is None:
+        retry_policy = RetryPolicy()
+    deadline_time = retry_policy.deadline_get()
+    attempt = 0
+
+    rest_session = DiscordSession(token)
+    try:
+        while True:
+            try:
+                response = rest_session.gateway_bot_get()
+            except (ConnectTimeout, ReadTimeout, ConnectionError) as e:
+                last_error = e
+            else:
+                if response.status_code != 429 and response.status_code not in retry_policy.RETRY_STATUS_CODES:
+                    break
+                last_error = response
+
+            attempt += 1
+            retry_time = time() + retry_policy.delay_get(attempt, deadline_time, last_error)
+            if getattr(last_error, 'status_code', None) == 429:
+                try:
+                    # NOTE: API v6 reports retry_after in milliseconds
+                    retry_time = time() + json_codec.loads(last_error.content)['retry_after'] / 1000
+                except (ValueError, KeyError, TypeError):
+                    pass
+            logging.warning(f"Failed to get gateway: {last_error!r}. Retrying in {retry_time - time():.1f} seconds")
+
+            # NOTE: sleeps in short steps so stopping the manager is not delayed by the whole backoff
+            while time() < retry_time:
+                if not is_running():
+                    return None
+                sleep(min(1.0, max(0.0, retry_time - time())))
+    finally:
+        rest_session.close()
+
+    if response.status_code >= 400:
+        rest_exception_handler(response)
+    return json_codec.loads(response.content)
+
+
+def session_start_delay_get(gateway_bot: dict, shard_count: int) -> float:
+    """
+    Returns seconds to wait before starting the shards so they do not run out of session starts.
+    """
+    session_start_limit = gateway_bot['session_start_limit']
+    if session_start_limit['remaining'] >= shard_count:
+        return 0
+
+    reset_after = session_start_limit['reset_after'] / 1000
+    logging.warning(f"Only {session_start_limit['remaining']} session starts left for "
+                    f"{shard_count} shards. Waiting {reset_after} seconds for the reset.")
+    return reset_after
+
+
+async def shard_run(discord_socket: discordsocket.DiscordSocket, is_running: typing.Callable[[], bool]) -> None:
+    """
+    Runs the socket restarting it when it fails until it fails MAX_SHARD_FAILURES times.
+    """
+    failure_count = 0
+    while True:
+        try:
+            await discord_socket.init()
+        except Exception as e:
+            logging.exception(f"Shard {discord_socket.shard_num} raised exception {repr(e)}")
+        else:
+            # NOTE: socket returns instead of raising when it is cancelled
+            if not is_running():
+                return
+            logging.warning(f"Shard {discord_socket.shard_num} unexpectedly closed")
+
+        failure_count += 1
+        if failure_count == MAX_SHARD_FAILURES:
+            logging.critical(f"Failed to reinitialize shard {discord_socket.shard_num} {failure_count} times. "
+                             f"Shutting it down.")
+            return
+        discord_socket.running = True
+
+
+class ShardManager:
+    """
+    Runs several gateway shards in the event loop of its own thread.
+
+    Shard count, gateway URL and identify concurrency are read from gateway_bot_get
+    unless shard_count is given. Failures of gateway_bot_get are retried according to retry_policy.
+    Events of all shards are merged into one dispatcher,
+    queues added with event_queue_add_sharded also receive the shard number of the event.
+
+    Has the same event queue interface as DiscordSocketThread.
+    """
+
+    def __init__(self, token: str, shard_count: int = None, retry_policy: RetryPolicy = None, **socket_kwargs):
+        """
+        :param shard_count: number of shards, recommended number from gateway_bot_get is used if None
+        :param retry_policy: retries of gateway_bot_get, default RetryPolicy if None
+        :param socket_kwargs: passed to every DiscordSocket
+        """
+        self.token = token
+        self.shard_count = shard_count
+        self.retry_policy = retry_policy
+        self.socket_kwargs = socket_kwargs
+        self.running = True
+        self.local_event_loop = asyncio.get_event_loop()
+
+        self.event_dispatcher = QueueDispenser([x for x in SocketEventNames], self._queue_removed)
+        self.sharded_event_dispatcher = QueueDispenser([x for x in SocketEventNames], self._queue_removed)
+        self.event_dispatcher_running = False
+
+        self.thread = ThreadPoolExecutor(max_workers=1)
+        self._start()
+
+        finalize(self, self.stop)
+
+    def _start(self) -> None:
+        self.sockets: typing.List[discordsocket.DiscordSocket] = []
+        self.discord_socket_loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.thread_future = self.thread.submit(self.discord_socket_loop.run_forever)
+
+        self.shards_future = asyncio.run_coroutine_threadsafe(self._shards_run(), self.discord_socket_loop)
+        self.shards_future.add_done_callback(self._shards_future_complete)
+
+    async def _shards_run(self) -> None:
+        gateway_bot = await self.discord_socket_loop.run_in_executor(
+            None, gateway_bot_get, self.token, self.retry_policy, lambda: self.running)
+        if gateway_bot is None:
+            return
+        if self.shard_count is None:
+            self.shard_count = gateway_bot['shards']
+        await asyncio.sleep(session_start_delay_get(gateway_bot, self.shard_count))
+
+        identify_throttle = IdentifyThrottle(gateway_bot['session_start_limit'].get('max_concurrency', 1))
+        socket_url = gateway_bot['url'] + GATEWAY_QUERY
+        self.sockets = [
+            discordsocket.DiscordSocket(self.token, socket_url, shard_num=shard_num, shard_total=self.shard_count,
+                                        event_loop=self.discord_socket_loop,
+                                        event_handler=partial(self._event_hook, shard_num),
+                                        identify_throttle=identify_throttle, event_filter=self._is_subscribed,
+                                        **self.socket_kwargs)
+            for shard_num in range(self.shard_count)]
+
+        await asyncio.gather(*(shard_run(x, lambda: self.running) for x in self.sockets))
+
+    def _shards_future_complete(self, finished_future: ConcurrentFuture) -> None:
+        if finished_future.cancelled():
+            logging.info("Shards were canceled")
+            return
+
+        exception: BaseException = finished_future.exception()
+        if exception is not None:
+            logging.critical(f"Shard manager {repr(self)} failed to start shards: {repr(exception)}")
+
+    def _event_hook(self, shard_num: int, payload: dict) -> None:
+        if payload['op'] == 0 and self.event_dispatcher_running:
+            asyncio.run_coroutine_threadsafe(self._event_put(payload['t'], payload['d'], shard_num),
+                                             self.local_event_loop)
+
+    async def _event_put(self, event_name: str, event_data: dict, shard_num: int) -> None:
+        await self.event_dispatcher.event_put(event_name, event_data)
+        await self.sharded_event_dispatcher.event_put(event_name, (event_data, shard_num))
+
+    def _subscriptions_changed(self) -> None:
+        self.event_dispatcher_running = True
+
+    def _queue_removed(self) -> None:
+        # NOTE: shards in the thread check the dispatchers for every event
+        pass
+
+    def event_queue_add_multiple(self, queue: asyncio.Queue, event_names_tuple: typing.Tuple[str, ...]) -> None:
+        self.event_dispatcher.queue_add_multiple_slots(queue, event_names_tuple)
+        self._subscriptions_changed()
+
+    def event_queue_add_single(self, queue: asyncio.Queue, event_name: str) -> None:
+        self.event_dispatcher.queue_add_single_slot(queue, event_name)
+        self._subscriptions_changed()
+
+    def event_queue_add_sharded(self, queue: asyncio.Queue, event_names_tuple: typing.Tuple[str, ...]) -> None:
+        """
+        Queue receives ((event_data, shard_num), event_name) tuples.
+        """
+        self.sharded_event_dispatcher.queue_add_multiple_slots(queue, event_names_tuple)
+        self._subscriptions_changed()
+
+    def _is_subscribed(self, event_name: str) -> bool:
+        return self.event_dispatcher.is_subscribed(event_name) or self.sharded_event_dispatcher.is_subscribed(event_name)
+
+    def subscribed_event_names_get(self) -> typing.FrozenSet[str]:
+        """
+        Returns names of the events that have queues waiting for them.
+        """
+        return frozenset(x for x in SocketEventNames if self._is_subscribed(x))
+
+    def stop(self) -> None:
+        self.running = False
+        self.shards_future.cancel()
+        concurrent_wait((self.shards_future,))
+
+        def stop_loop():
+            self.discord_socket_loop.stop()
+
+        self.discord_socket_loop.call_soon_threadsafe(stop_loop)
+        concurrent_wait((self.thread_future,))
+        self.thread.shutdown()
+
+
+def _shard_process_main(token: str, socket_url: str, shard_nums: typing.List[int], shard_total: int,
+                        identify_throttle: ProcessIdentifyThrottle, event_connection: Connection,
+                        command_connection: Connection, subscribed_event_names: typing.FrozenSet[str],
+                        event_filters: EventFilters, event_buffer_size: int, socket_kwargs: dict) -> None:
+    event_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(event_loop)
+    running = True
+
+    # NOTE: send blocks once the pipe is full, events are sent from a separate thread so the shards keep
+    #  heartbeating while the parent is busy. Events that do not fit in the buffer are dropped.
+    events_buffer: queue.Queue = queue.Queue(maxsize=event_buffer_size)
+    events_sending = True
+    dropped_count = 0
+
+    def events_send() -> None:
+        while events_sending or not events_buffer.empty():
+            try:
+                event = events_buffer.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                event_connection.send(event)
+            except OSError:
+                # NOTE: parent process exited
+                return
+
+    events_send_thread = threading.Thread(target=events_send, name='discordobjects events send', daemon=True)
+    events_send_thread.start()
+
+    def event_hook(shard_num: int, payload: dict) -> None:
+        if payload['op'] != 0 or payload['t'] not in subscribed_event_names:
+            return
+
+        event_filter = event_filters.get(payload['t'])
+        if event_filter is not None and not event_filter(payload['d']):
+            return
+        nonlocal dropped_count
+        try:
+            events_buffer.put_nowait((payload['t'], payload['d'], shard_num))
+        except queue.Full:
+            if dropped_count == 0:
+                logging.warning(f"Event buffer of shards {shard_nums} is full, dropping events")
+            dropped_count += 1
+            return
+
+        if dropped_count:
+            logging.warning(f"Shards {shard_nums} dropped {dropped_count} events")
+            dropped_count = 0
+
+    def command_receive() -> None:
+        nonlocal subscribed_event_names, running
+        try:
+            while command_connection.poll():
+                command = command_connection.recv()
+                if command is None:
+                    running = False
+                    shards_task.cancel()
+                    return
+                subscribed_event_names = command
+        except EOFError:
+            # NOTE: parent process exited
+            running = False
+            shards_task.cancel()
+
+    sockets = [discordsocket.DiscordSocket(token, socket_url, shard_num=shard_num, shard_total=shard_total,
+                                           event_loop=event_loop, event_handler=partial(event_hook, shard_num),
+                                           identify_throttle=identify_throttle,
+                                           event_filter=lambda x: x in subscribed_event_names, **socket_kwargs)
+               for shard_num in shard_nums]
+
+    async def shards_run() -> None:
+        await asyncio.gather(*(shard_run(x, lambda: running) for x in sockets))
+
+    shards_task = event_loop.create_task(shards_run())
+    event_loop.add_reader(command_connection.fileno(), command_receive)
+    try:
+        event_loop.run_until_complete(shards_task)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        events_sending = False
+        events_send_thread.join(timeout=5)
+        event_connection.close()
+        event_loop.close()
+
+
+class ProcessShardManager(ShardManager):
+    """
+    ShardManager that runs the shards in worker processes, shards_per_process shards in each.
+
+    Workers decompress and decode the payloads themselves and only send the parent the events
+    that have queues waiting for them and pass the event_filters.
+    event_filters map event names to functions called with the event data dict in the worker,
+    events for which they return False are dropped. Filters have to be picklable, module level functions.
+    Every worker buffers up to event_buffer_size events the manager has not read yet and drops new events
+    while the buffer is full, so slow consumers do not stall the shards.
+
+    Events are read from the workers by the thread of the manager and dispatched in the same way as ShardManager does.
+    """
+
+    def __init__(self, token: str, shard_count: int = None, shards_per_process: int = 1,
+                 event_filters: EventFilters = None, retry_policy: RetryPolicy = None,
+                 event_buffer_size: int = EVENT_BUFFER_SIZE, **socket_kwargs):
+        self.shards_per_process = shards_per_process
+        self.event_buffer_size = event_buffer_size
+        self.event_filters = event_filters or {}
+        self.process_context = multiprocessing.get_context('spawn')
+        self.processes: typing.List[multiprocessing.Process] = []
+        self.command_connections: typing.List[Connection] = []
+        # NOTE: subscriptions are sent both from the thread of the manager and the thread adding the queues
+        self.command_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.subscriptions_outdated = False
+        super().__init__(token, shard_count, retry_policy, **socket_kwargs)
+
+    def _start(self) -> None:
+        self.thread_future = self.thread.submit(self._processes_run)
+        self.thread_future.add_done_callback(self._shards_future_complete)
+
+    def _processes_run(self) -> None:
+        gateway_bot = gateway_bot_get(self.token, self.retry_policy, lambda: self.running)
+        if gateway_bot is None:
+            return
+        if self.shard_count is None:
+            self.shard_count = gateway_bot['shards']
+        # NOTE: session start reset may be hours away, stop has to interrupt the wait
+        if self.stop_event.wait(session_start_delay_get(gateway_bot, self.shard_count)):
+            return
+
+        identify_throttle = ProcessIdentifyThrottle(gateway_bot['session_start_limit'].get('max_concurrency', 1),
+                                                    self.process_context)
+        socket_url = gateway_bot['url'] + GATEWAY_QUERY
+
+        event_connections = []
+        for first_shard_num in range(0, self.shard_count, self.shards_per_process):
+            if not self.running:
+                return
+
+            event_receive_connection, event_send_connection = self.process_context.Pipe(duplex=False)
+            command_receive_connection, command_send_connection = self.process_context.Pipe(duplex=False)
+            process = self.process_context.Process(
+                target=_shard_process_main, daemon=True,
+                name=f"discordobjects shards from {first_shard_num}",
+                args=(self.token, socket_url,
+                      list(range(first_shard_num, min(first_shard_num + self.shards_per_process, self.shard_count))),
+                      self.shard_count, identify_throttle, event_send_connection, command_receive_connection,
+                      self.subscribed_event_names_get(), self.event_filters, self.event_buffer_size,
+                      self.socket_kwargs))
+            process.start()
+            # NOTE: ends used by the worker are closed in the parent so closing the worker is noticed
+            event_send_connection.close()
+            command_receive_connection.close()
+
+            self.processes.append(process)
+            with self.command_lock:
+                self.command_connections.append(command_send_connection)
+            event_connections.append(event_receive_connection)
+
+        self._subscriptions_changed()
+        while event_connections and self.running:
+            self._subscriptions_sync()
+            for event_connection in connections_wait(event_connections, timeout=1):
+                try:
+                    event_name, event_data, shard_num = event_connection.recv()
+                except EOFError:
+                    event_connections.remove(event_connection)
+                    if self.running:
+                        logging.critical(f"Shard process of {repr(self)} exited")
+                    continue
+
+                if self.event_dispatcher_running:
+                    asyncio.run_coroutine_threadsafe(self._event_put(event_name, event_data, shard_num),
+                                                     self.local_event_loop)
+
+    def _subscriptions_changed(self) -> None:
+        super()._subscriptions_changed()
+        self._command_send(self.subscribed_event_names_get())
+
+    def _queue_removed(self) -> None:
+        # NOTE: queues may be collected in the middle of sending a command, the manager thread sends the removal
+        self.subscriptions_outdated = True
+
+    def _subscriptions_sync(self) -> None:
+        if self.subscriptions_outdated:
+            self.subscriptions_outdated = False
+            self._command_send(self.subscribed_event_names_get())
+
+    def _command_send(self, command: typing.Optional[typing.FrozenSet[str]]) -> None:
+        with self.command_lock:
+            for command_connection in self.command_connections:
+                try:
+                    command_connection.send(command)
+                except OSError:
+                    # NOTE: worker process already exited
+                    pass
+
+    def stop(self) -> None:
+        self.running = False
+        self.stop_event.set()
+        self._command_send(None)
+
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        concurrent_wait((self.thread_future,))
+        self.thread.shutdown()
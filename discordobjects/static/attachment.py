@@ -17,3 +17,12 @@ class Attachment(DiscordObject):
 
     def is_image(self) -> bool:
         return self.height is not None
+
+    async def download_async(self) -> str:
+        """
+        Returns path of the downloaded file in the attachment cache of the client.
+        """
+        return await self.client_bind.attachment_download(self.url)
+
+    async def read_async(self) -> bytes:
+        return await self.client_bind.attachment_read(self.url)
@@ -3,6 +3,7 @@ import typing
 from .channel import Channel
 from .message import Message
 from ..client import DiscordClientAsync
+from ..multipart_body import FileSource
 
 
 class TextChannel(Channel):
@@ -38,10 +39,10 @@ class TextChannel(Channel):
         await self.post_message_async(content[curr_pos:])
         return messages
 
-    async def post_file_async(self, file_name: str, file_bytes: bytes) -> Message:
+    async def post_file_async(self, file_name: str, file_source: FileSource, content: str = None) -> Message:
         return Message(self.client_bind,
-                       **(await self.client_bind.channel_message_create_file(
-                           self.snowflake, file_name, file_bytes))
+                       **(await self.client_bind.channel_message_create(
+                           self.snowflake, content, files_tuples=[('file', (file_name, file_source))]))
                        )
 
     async def message_iter_async_gen(self) -> typing.AsyncGenerator[Message, None]:
@@ -52,6 +53,9 @@ class TextChannel(Channel):
         async for message_dict in self.client_bind.channel_message_iter(self.snowflake):
             yield message_dict
 
+    async def purge_async(self, message_filter: typing.Callable[[dict], bool] = None, limit: int = None) -> int:
+        return await self.client_bind.channel_message_purge(self.snowflake, message_filter, limit)
+
     async def get_last_message_async(self) -> Message:
         return Message(self.client_bind,
                        **(await self.client_bind.channel_message_get(self.snowflake, self.last_message_id)))
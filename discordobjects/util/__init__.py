@@ -1,5 +1,10 @@
 from .enum_str import StrEnum
 from .deprecated_dispencers import SingularEvent, QueueDispenser
 from .event_dispenser import EventDispenser
+from .snowflake import snowflake_to_timestamp, timestamp_to_snowflake, snowflake_age
+from .json_codec import JsonCodec, json_codec
+from .etf import etf_loads, etf_dumps
 
-__all__ = ['StrEnum', 'SingularEvent', 'QueueDispenser']
\ No newline at end of file
+__all__ = ['StrEnum', 'SingularEvent', 'QueueDispenser',
+           'snowflake_to_timestamp', 'timestamp_to_snowflake', 'snowflake_age',
+           'JsonCodec', 'json_codec', 'etf_loads', 'etf_dumps']
\ No newline at end of file
@@ -6,11 +6,17 @@ import logging
 
 class QueueDispenser:
 
-    def __init__(self, slot_names: typing.Iterable[typing.Hashable]):
+    def __init__(self, slot_names: typing.Iterable[typing.Hashable],
+                 queue_removed_callback: typing.Callable[[], None] = None):
+        """
+        :param queue_removed_callback: called after the queue was garbage collected and removed from its slots.
+            Called from whichever thread collected the queue.
+        """
         self.queue_count: int = 0
         self.task = None
         self.is_running: bool = False
         self.slots: typing.Dict[str, list] = {x: [] for x in slot_names}
+        self.queue_removed_callback = queue_removed_callback
 
     def queue_add_multiple_slots(self, queue: asyncio.Queue, slot_names: typing.Tuple[str, ...]):
 
@@ -23,12 +29,20 @@ class QueueDispenser:
             for event_name in slot_names:
                 self.slots[event_name].remove(new_weak_ref)
                 self.queue_count -= 1
+            if self.queue_removed_callback is not None:
+                self.queue_removed_callback()
 
         weakref.finalize(queue, queue_cleanup)
 
     def queue_add_single_slot(self, queue: asyncio.Queue, slot_name: str):
         self.queue_add_multiple_slots(queue, (slot_name,))
 
+    def is_subscribed(self, event_name: str) -> bool:
+        """
+        Returns True if any queue that is still alive waits for the event.
+        """
+        return any(x() is not None for x in self.slots.get(event_name, ()))
+
     async def event_put(self, event_name: str, event_data: typing.Any):
         try:
             # print(f"Socket event with name {event_name} and data {event_data}")
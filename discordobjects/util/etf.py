@@ -0,0 +1,195 @@
+import struct
+import typing
+import zlib
+
+# NOTE: only the terms used by Discord gateway are supported
+FORMAT_VERSION = 131
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_ATOM_VALUES = {'nil': None, 'true': True, 'false': False}
+# NOTE: integers above this can not be represented in JSON numbers, Discord sends them as strings in JSON
+MAX_JSON_SAFE_INTEGER = 2 ** 53 - 1
+
+_unpack_uint16 = struct.Struct('>H').unpack_from
+_unpack_uint32 = struct.Struct('>I').unpack_from
+_unpack_int32 = struct.Struct('>i').unpack_from
+_unpack_double = struct.Struct('>d').unpack_from
+
+
+def _decode(data: bytes, position: int) -> typing.Tuple[typing.Any, int]:
+    tag = data[position]
+    position += 1
+
+    if tag == BINARY_EXT:
+        length, = _unpack_uint32(data, position)
+        position += 4
+        return data[position:position + length].decode(), position + length
+    elif tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+        length = data[position]
+        position += 1
+        atom = data[position:position + length].decode()
+        return _ATOM_VALUES.get(atom, atom), position + length
+    elif tag == MAP_EXT:
+        length, = _unpack_uint32(data, position)
+        position += 4
+        map_dict = {}
+        for _ in range(length):
+            key, position = _decode(data, position)
+            map_dict[key], position = _decode(data, position)
+        return map_dict, position
+    elif tag == SMALL_INTEGER_EXT:
+        return data[position], position + 1
+    elif tag == INTEGER_EXT:
+        return _unpack_int32(data, position)[0], position + 4
+    elif tag == SMALL_BIG_EXT or tag == LARGE_BIG_EXT:
+        if tag == SMALL_BIG_EXT:
+            length = data[position]
+            position += 1
+        else:
+            length, = _unpack_uint32(data, position)
+            position += 4
+        sign = data[position]
+        position += 1
+        value = int.from_bytes(data[position:position + length], 'little')
+        if sign:
+            value = -value
+        # NOTE: Discord sends snowflakes as big integers in ETF, the rest of the package expects them as strings.
+        #  Smaller big integers such as millisecond timestamps are numbers in JSON and stay int.
+        if abs(value) > MAX_JSON_SAFE_INTEGER:
+            return str(value), position + length
+        return value, position + length
+    elif tag == LIST_EXT:
+        length, = _unpack_uint32(data, position)
+        position += 4
+        term_list = []
+        for _ in range(length):
+            term, position = _decode(data, position)
+            term_list.append(term)
+        # NOTE: tail of the proper list is always NIL_EXT
+        _, position = _decode(data, position)
+        return term_list, position
+    elif tag == NIL_EXT:
+        return [], position
+    elif tag == NEW_FLOAT_EXT:
+        return _unpack_double(data, position)[0], position + 8
+    elif tag == ATOM_UTF8_EXT or tag == ATOM_EXT:
+        length, = _unpack_uint16(data, position)
+        position += 2
+        atom = data[position:position + length].decode()
+        return _ATOM_VALUES.get(atom, atom), position + length
+    elif tag == STRING_EXT:
+        length, = _unpack_uint16(data, position)
+        position += 2
+        # NOTE: Erlang sends lists of small integers as strings
+        return list(data[position:position + length]), position + length
+    elif tag == SMALL_TUPLE_EXT or tag == LARGE_TUPLE_EXT:
+        if tag == SMALL_TUPLE_EXT:
+            length = data[position]
+            position += 1
+        else:
+            length, = _unpack_uint32(data, position)
+            position += 4
+        term_list = []
+        for _ in range(length):
+            term, position = _decode(data, position)
+            term_list.append(term)
+        return tuple(term_list), position
+    elif tag == FLOAT_EXT:
+        return float(data[position:position + 31].rstrip(b'\x00')), position + 31
+    else:
+        raise ValueError(f"Unsupported ETF tag {tag} at position {position - 1}")
+
+
+def etf_loads(data: bytes) -> typing.Any:
+    """
+    Decodes Erlang external term format used by the gateway with encoding=etf.
+
+    Binaries and atoms are returned as str, nil, true and false atoms as None, True and False.
+    Integers too big for JSON numbers, such as snowflakes, are returned as str, same way they are sent in JSON.
+    Raises ValueError if data is not valid ETF.
+    """
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown ETF version {data[0]}")
+
+    try:
+        if data[1] == COMPRESSED:
+            data = bytes((FORMAT_VERSION,)) + zlib.decompress(data[6:])
+        value, position = _decode(data, 1)
+    except (IndexError, struct.error, UnicodeDecodeError, zlib.error) as e:
+        raise ValueError(f"Invalid ETF data: {e!r}") from e
+
+    if position != len(data):
+        raise ValueError(f"Invalid ETF data: {len(data) - position} bytes after the term")
+    return value
+
+
+def _encode(value: typing.Any, buffer: bytearray) -> None:
+    if isinstance(value, str):
+        encoded = value.encode()
+        buffer.append(BINARY_EXT)
+        buffer += struct.pack('>I', len(encoded))
+        buffer += encoded
+    elif value is None or isinstance(value, bool):
+        atom = 'nil' if value is None else 'true' if value else 'false'
+        buffer.append(SMALL_ATOM_UTF8_EXT)
+        buffer.append(len(atom))
+        buffer += atom.encode()
+    elif isinstance(value, int):
+        if 0 <= value < 256:
+            buffer.append(SMALL_INTEGER_EXT)
+            buffer.append(value)
+        elif -2 ** 31 <= value < 2 ** 31:
+            buffer.append(INTEGER_EXT)
+            buffer += struct.pack('>i', value)
+        else:
+            magnitude = abs(value)
+            encoded = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, 'little')
+            buffer.append(SMALL_BIG_EXT)
+            buffer.append(len(encoded))
+            buffer.append(1 if value < 0 else 0)
+            buffer += encoded
+    elif isinstance(value, float):
+        buffer.append(NEW_FLOAT_EXT)
+        buffer += struct.pack('>d', value)
+    elif isinstance(value, dict):
+        buffer.append(MAP_EXT)
+        buffer += struct.pack('>I', len(value))
+        for map_key, map_value in value.items():
+            _encode(map_key, buffer)
+            _encode(map_value, buffer)
+    elif isinstance(value, (list, tuple)):
+        if value:
+            buffer.append(LIST_EXT)
+            buffer += struct.pack('>I', len(value))
+            for term in value:
+                _encode(term, buffer)
+        buffer.append(NIL_EXT)
+    else:
+        raise TypeError(f"Can not encode {type(value).__name__} to ETF")
+
+
+def etf_dumps(value: typing.Any) -> bytes:
+    """
+    Encodes value to Erlang external term format. str is encoded as binary, dict as map,
+    list and tuple as list, None, True and False as atoms.
+    """
+    buffer = bytearray((FORMAT_VERSION,))
+    _encode(value, buffer)
+    return bytes(buffer)
@@ -0,0 +1,62 @@
+import json
+import typing
+
+JSON_LIBRARIES = ('orjson', 'ujson', 'rapidjson', 'json')
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder used by REST transports and the gateway socket.
+
+    Picks the fastest of orjson, ujson and python-rapidjson that is installed,
+    standard library json is used if none of them is.
+    Output is compact and not ASCII escaped with every library.
+    All the libraries raise ValueError subclasses on invalid JSON.
+    """
+
+    def __init__(self, library: str = None):
+        self.library: str = None
+        self.loads: typing.Callable[[typing.Union[str, bytes]], typing.Any] = None
+        self.dumps: typing.Callable[[typing.Any], str] = None
+        self.dumps_bytes: typing.Callable[[typing.Any], bytes] = None
+        self.library_set(library)
+
+    def library_set(self, library: str = None) -> None:
+        """
+        :param library: one of JSON_LIBRARIES, first installed one is picked if None
+        """
+        if library is None:
+            for library_name in JSON_LIBRARIES:
+                try:
+                    self.library_set(library_name)
+                    return
+                except ImportError:
+                    continue
+
+        if library == 'orjson':
+            import orjson
+            # NOTE: orjson produces bytes only, str is needed for text websocket frames
+            self.loads = orjson.loads
+            self.dumps_bytes = orjson.dumps
+            self.dumps = lambda x: orjson.dumps(x).decode()
+        elif library == 'ujson':
+            import ujson
+            self.loads = ujson.loads
+            self.dumps = lambda x: ujson.dumps(x, ensure_ascii=False, escape_forward_slashes=False)
+            self.dumps_bytes = lambda x: self.dumps(x).encode()
+        elif library == 'rapidjson':
+            import rapidjson
+            self.loads = rapidjson.loads
+            self.dumps = lambda x: rapidjson.dumps(x, ensure_ascii=False)
+            self.dumps_bytes = lambda x: self.dumps(x).encode()
+        elif library == 'json':
+            self.loads = json.loads
+            self.dumps = lambda x: json.dumps(x, ensure_ascii=False, separators=(',', ':'))
+            self.dumps_bytes = lambda x: self.dumps(x).encode()
+        else:
+            raise ValueError(f"Unknown JSON library: {library}")
+
+        self.library = library
+
+
+json_codec = JsonCodec()
@@ -0,0 +1,22 @@
+from time import time
+
+DISCORD_EPOCH = 1420070400000
+
+
+def snowflake_to_timestamp(snowflake: str) -> float:
+    """
+    Returns unix time in seconds the snowflake was generated at.
+    """
+    return ((int(snowflake) >> 22) + DISCORD_EPOCH) / 1000
+
+
+def timestamp_to_snowflake(timestamp: float) -> str:
+    """
+    Returns the smallest snowflake generated at the unix time in seconds.
+    Can be used as before= and after= cursors of the paginated calls.
+    """
+    return str(max(int(timestamp * 1000) - DISCORD_EPOCH, 0) << 22)
+
+
+def snowflake_age(snowflake: str) -> float:
+    return time() - snowflake_to_timestamp(snowflake)
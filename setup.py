@@ -4,7 +4,8 @@ setup(
     name='discordobjects',
     version='0',
     description='Simple and easy to use Discord library',
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     packages=['discordobjects'],
-    install_requires=['websockets', 'requests']
+    install_requires=['websockets', 'requests'],
+    extras_require={'aiohttp': ['aiohttp'], 'zstd': ['zstandard'], 'orjson': ['orjson']}
 )
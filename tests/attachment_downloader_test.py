@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from discordobjects.client import AttachmentDownloader
+from .helpers import AsyncTestCase
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class AttachmentDownloaderTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.received_requests = []
+
+        async def attachment_get(request: 'web.Request'):
+            self.received_requests.append(request)
+            return web.Response(body=request.match_info['name'].encode() * 100)
+
+        application = web.Application()
+        application.router.add_get('/attachments/{name}', attachment_get)
+        self.runner = web.AppRunner(application)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/attachments/"
+
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.downloader = AttachmentDownloader(self.cache_directory.name, max_size=250, index_save_delay=0.01)
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.downloader.executor.shutdown()
+        self.cache_directory.cleanup()
+
+    async def test_read(self):
+        contents = await asyncio.gather(*(self.downloader.read(self.url + 'a') for _ in range(3)))
+        self.assertEqual(contents, [b'a' * 100] * 3)
+        self.assertEqual(len(self.received_requests), 1)
+
+    async def test_evict(self):
+        first_path = await self.downloader.download(self.url + 'a')
+        await self.downloader.download(self.url + 'b')
+        await self.downloader.download(self.url + 'c')
+        self.assertFalse(os.path.exists(first_path))
+        self.assertEqual(self.downloader.size, 200)
+        self.assertIsNone(await self.downloader.cached_path_get(self.url + 'a'))
+
+    async def test_removed_from_outside(self):
+        file_path = await self.downloader.download(self.url + 'a')
+        os.remove(file_path)
+        self.assertIsNone(await self.downloader.cached_path_get(self.url + 'a'))
+        self.assertEqual(self.downloader.size, 0)
+        self.assertEqual(await self.downloader.read(self.url + 'a'), b'a' * 100)
+        self.assertEqual(len(self.received_requests), 2)
+
+    async def test_evicted_contents_downloaded_again(self):
+        first_path = await self.downloader.download(self.url + 'a')
+        await self.downloader.download(self.url + 'b')
+        # NOTE: contents of 'a' are evicted and written again by another URL before the removal runs
+        evicted_hashes = self.downloader._evict()
+        self.downloader.max_size = 1000
+        self.assertEqual(await self.downloader.download(self.url + 'a?again'), first_path)
+        self.downloader._files_remove(evicted_hashes)
+        self.assertTrue(os.path.exists(first_path))
+
+    async def test_index_saved(self):
+        for name in ('a', 'b'):
+            await self.downloader.download(self.url + name)
+        await asyncio.sleep(0.1)
+
+        loaded_downloader = AttachmentDownloader(self.cache_directory.name, max_size=250)
+        self.assertEqual(loaded_downloader.url_index, self.downloader.url_index)
+        self.assertEqual(await loaded_downloader.read(self.url + 'b'), b'b' * 100)
+        self.assertEqual(len(self.received_requests), 2)
+        loaded_downloader.executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
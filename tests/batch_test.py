@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from collections import Counter
+
+from discordobjects import exceptions
+from discordobjects.client.batch import batch_map
+from .helpers import AsyncTestCase
+
+
+class FakeMethod:
+    """
+    Stands in for a client method with guild_id major parameter. Records the most calls of one guild
+    in flight at the same time and raises for the user ids in failing_user_ids.
+    """
+
+    def __init__(self):
+        self.running = Counter()
+        self.max_running = Counter()
+        self.started_guild_ids = []
+        self.failing_user_ids = set()
+
+    async def __call__(self, guild_id: str, user_id: str) -> str:
+        self.started_guild_ids.append(guild_id)
+        self.running[guild_id] += 1
+        self.max_running[guild_id] = max(self.max_running[guild_id], self.running[guild_id])
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running[guild_id] -= 1
+        if user_id in self.failing_user_ids:
+            raise exceptions.MissingPermissions()
+        return f"{guild_id}:{user_id}"
+
+
+class BatchMapTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.method = FakeMethod()
+
+    async def test_results_ordered(self):
+        arguments = [(str(x % 3), str(x)) for x in range(30)]
+        results = await batch_map(self.method, arguments)
+        self.assertEqual(results, [f"{x % 3}:{x}" for x in range(30)])
+
+    async def test_keyword_arguments(self):
+        arguments = [{'user_id': str(x), 'guild_id': 'a'} for x in range(5)]
+        results = await batch_map(self.method, arguments)
+        self.assertEqual(results, [f"a:{x}" for x in range(5)])
+
+    async def test_group_concurrency(self):
+        arguments = [('a', str(x)) for x in range(20)] + [{'guild_id': 'b', 'user_id': str(x)} for x in range(20)]
+        await batch_map(self.method, arguments, concurrency=2, group_concurrency=4)
+        self.assertEqual(self.method.max_running, Counter({'a': 4, 'b': 4}))
+
+    async def test_groups_parallel(self):
+        # NOTE: large group does not delay calls of the small one
+        arguments = [('a', str(x)) for x in range(20)] + [('b', '0')]
+        await batch_map(self.method, arguments, concurrency=2, group_concurrency=1)
+        self.assertEqual(self.method.started_guild_ids[:2], ['a', 'b'])
+
+    async def test_groups_serial(self):
+        arguments = [('a', '0'), ('b', '0'), ('a', '1'), ('b', '1')]
+        await batch_map(self.method, arguments, concurrency=1, group_concurrency=1)
+        self.assertEqual(self.method.started_guild_ids, ['a', 'a', 'b', 'b'])
+        self.assertEqual(self.method.max_running, Counter({'a': 1, 'b': 1}))
+
+    async def test_exceptions_returned(self):
+        self.method.failing_user_ids = {'1', '3'}
+        results = await batch_map(self.method, [('a', str(x)) for x in range(5)])
+        self.assertEqual([type(x) for x in results],
+                         [str, exceptions.MissingPermissions, str, exceptions.MissingPermissions, str])
+
+    async def test_progress_callback(self):
+        progress = []
+        await batch_map(self.method, [('a', str(x)) for x in range(5)],
+                        progress_callback=lambda completed, total: progress.append((completed, total)))
+        self.assertEqual(progress, [(x, 5) for x in range(1, 6)])
+
+    async def test_empty(self):
+        self.assertEqual(await batch_map(self.method, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
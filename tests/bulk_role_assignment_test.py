@@ -0,0 +1,120 @@
+import contextlib
+import json
+import os
+import tempfile
+import unittest
+
+from discordobjects import exceptions
+from discordobjects.client.batch import batch_map
+from discordobjects.dynamic.bulk_role_assignment import BulkRoleAssignment
+from .helpers import AsyncTestCase
+
+
+class FakeClient:
+    """
+    Guild with members 1 to 20 without roles. Role add fails for the user ids in failing_user_ids
+    with the exception in failure_exception.
+    """
+
+    def __init__(self):
+        self.member_ids = [str(x) for x in range(1, 21)]
+        self.failing_user_ids = set()
+        self.failure_exception = exceptions.DiscordUnavailable
+        self.role_add_calls = []
+
+    @staticmethod
+    def priority(_) -> contextlib.AbstractContextManager:
+        return contextlib.nullcontext()
+
+    async def map(self, method, arguments_iterable) -> list:
+        return await batch_map(method, arguments_iterable)
+
+    async def guild_member_role_add(self, guild_id: str, user_id: str, role_id: str) -> bool:
+        self.role_add_calls.append(user_id)
+        if user_id in self.failing_user_ids:
+            raise self.failure_exception()
+        return True
+
+    async def guild_member_modify(self, guild_id: str, user_id: str, new_roles: list) -> bool:
+        return True
+
+    async def guild_member_get(self, guild_id: str, user_id: str) -> dict:
+        if user_id not in self.member_ids:
+            raise exceptions.UnknownMember()
+        return {'user': {'id': user_id}, 'roles': []}
+
+    async def guild_member_iter(self, guild_id: str, after: str = None):
+        for user_id in self.member_ids:
+            if after is None or int(user_id) > int(after):
+                yield {'user': {'id': user_id}, 'roles': []}
+
+
+class BulkRoleAssignmentTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.client = FakeClient()
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    def assignment_make(self) -> BulkRoleAssignment:
+        return BulkRoleAssignment(self.client, 'guild', ['role'], self.checkpoint_path, page_size=5)
+
+    async def test_resumed_after_outage(self):
+        self.client.failing_user_ids = {'7'}
+        with self.assertLogs(level='WARNING') as logs, self.assertRaises(exceptions.DiscordUnavailable):
+            await self.assignment_make().run_from_rest()
+        self.assertEqual(len(logs.output), 1)
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        self.assertEqual(checkpoint['last_member_id'], '10')
+        self.assertEqual(checkpoint['failed_member_ids'], ['7'])
+        self.assertEqual(checkpoint['changed_count'], 9)
+
+        self.client.failing_user_ids = set()
+        self.client.role_add_calls.clear()
+        self.assertEqual(await self.assignment_make().run_from_rest(), 20)
+        self.assertEqual(self.client.role_add_calls, ['7'] + [str(x) for x in range(11, 21)])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    async def test_failures_logged_per_page(self):
+        self.client.failing_user_ids = {'1', '2', '3'}
+        self.client.failure_exception = exceptions.MissingPermissions
+        with self.assertLogs(level='WARNING') as logs:
+            await self.assignment_make().run_from_rest()
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('failed for 3 members', logs.output[0])
+
+        assignment = self.assignment_make()
+        self.assertEqual(assignment.failed_member_ids, {'1', '2', '3'})
+
+    async def test_failed_members_dropped(self):
+        self.client.failing_user_ids = {'1', '2', '3'}
+        self.client.failure_exception = exceptions.MissingPermissions
+        with self.assertLogs(level='WARNING'):
+            await self.assignment_make().run_from_rest()
+
+        # NOTE: member 1 left the guild, member 2 no longer passes the filter
+        self.client.member_ids.remove('1')
+        self.client.failing_user_ids = set()
+        self.client.role_add_calls.clear()
+        assignment = self.assignment_make()
+        await assignment.run_from_rest(lambda member_dict: member_dict['user']['id'] != '2')
+        self.assertEqual(self.client.role_add_calls, ['3'])
+        self.assertEqual(assignment.failed_member_ids, set())
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    async def test_departed_member_not_failed(self):
+        self.client.failing_user_ids = {'4'}
+        self.client.failure_exception = exceptions.UnknownMember
+        assignment = self.assignment_make()
+        self.assertEqual(await assignment.run_from_rest(), 19)
+        self.assertEqual(assignment.failed_member_ids, set())
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
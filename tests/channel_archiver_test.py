@@ -0,0 +1,106 @@
+import contextlib
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from discordobjects.dynamic.channel_archiver import ChannelArchiver, zstandard
+from .helpers import AsyncTestCase
+
+
+class FakeClient:
+    """
+    Channels with messages 1 to message_count. Listing channel in failing_channel_ids raises ConnectionError.
+    """
+
+    def __init__(self, message_count: int = 25):
+        self.message_ids = {'channel': [str(x) for x in range(1, message_count + 1)]}
+        self.failing_channel_ids = set()
+
+    @staticmethod
+    def priority(_) -> contextlib.AbstractContextManager:
+        return contextlib.nullcontext()
+
+    async def channel_message_list(self, channel_id: str, limit: int = 100, after: str = None) -> list:
+        if channel_id in self.failing_channel_ids:
+            raise ConnectionError()
+        # NOTE: oldest messages after the cursor, returned newest first like Discord does
+        message_ids = [x for x in self.message_ids[channel_id] if after is None or int(x) > int(after)][:limit]
+        return [{'id': x} for x in reversed(message_ids)]
+
+
+class ChannelArchiverTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.client = FakeClient()
+        self.directory = tempfile.TemporaryDirectory()
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    def archiver_make(self, **kwargs) -> ChannelArchiver:
+        return ChannelArchiver(self.client, self.directory.name, step_size=10, **kwargs)
+
+    def archived_files_read(self, channel_id: str) -> list:
+        """
+        Returns message ids of every archive file of the channel, files ordered by their first message.
+        """
+        channel_directory = os.path.join(self.directory.name, channel_id)
+        file_names = sorted((x for x in os.listdir(channel_directory) if x.endswith('.gz')),
+                            key=lambda x: int(x.split('.')[0]))
+        files_message_ids = []
+        for file_name in file_names:
+            with gzip.open(os.path.join(channel_directory, file_name)) as archive_file:
+                files_message_ids.append([json.loads(x)['id'] for x in archive_file])
+        return files_message_ids
+
+    async def test_archived_oldest_first(self):
+        archiver = self.archiver_make(compression='gzip')
+        self.assertEqual(await archiver.archive_channel('channel'), 25)
+        self.assertEqual(self.archived_files_read('channel'), [[str(x) for x in range(1, 26)]])
+        self.assertEqual(archiver.cursor_get('channel'), '25')
+
+    async def test_resumed_after_cursor(self):
+        await self.archiver_make(compression='gzip').archive_channel('channel')
+        self.client.message_ids['channel'].extend(str(x) for x in range(26, 31))
+
+        archiver = self.archiver_make(compression='gzip')
+        self.assertEqual(await archiver.archive_channel('channel'), 5)
+        self.assertEqual(self.archived_files_read('channel'),
+                         [[str(x) for x in range(1, 26)], [str(x) for x in range(26, 31)]])
+        self.assertEqual(archiver.cursor_get('channel'), '30')
+        self.assertEqual(await archiver.archive_channel('channel'), 0)
+
+    async def test_files_split(self):
+        await self.archiver_make(compression='gzip', max_file_size=100).archive_channel('channel')
+        files_message_ids = self.archived_files_read('channel')
+        self.assertGreater(len(files_message_ids), 1)
+        self.assertEqual(sum(files_message_ids, []), [str(x) for x in range(1, 26)])
+
+    async def test_failed_channel_logged(self):
+        self.client.message_ids['failing'] = ['1']
+        self.client.failing_channel_ids = {'failing'}
+        with self.assertLogs(level='WARNING') as logs:
+            results = await self.archiver_make(compression='gzip').archive(['channel', 'failing'])
+        self.assertEqual(results['channel'], 25)
+        self.assertIsInstance(results['failing'], ConnectionError)
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(self.archiver_make().cursor_get('failing'), '0')
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed')
+    async def test_zstd(self):
+        await self.archiver_make(compression='zstd').archive_channel('channel')
+        channel_directory = os.path.join(self.directory.name, 'channel')
+        file_name, = (x for x in os.listdir(channel_directory) if x.endswith('.zst'))
+        with open(os.path.join(channel_directory, file_name), 'rb') as archive_file:
+            lines = zstandard.ZstdDecompressor().stream_reader(archive_file).read().splitlines()
+        self.assertEqual([json.loads(x)['id'] for x in lines], [str(x) for x in range(1, 26)])
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            ChannelArchiver(FakeClient(), tempfile.gettempdir(), compression='lzma')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import asyncio
+import functools
+import typing
+import unittest
+
+from requests import Response
+
+
+def response_make(status_code: int = 200, content: bytes = b'{}', headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    if headers is not None:
+        response.headers.update(headers)
+    return response
+
+
+class AsyncTestCase(unittest.TestCase):
+    """
+    Runs coroutine test methods in a new event loop each, IsolatedAsyncioTestCase requires Python 3.8.
+    asyncSetUp and asyncTearDown run in the same event loop as the test.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if name.startswith('test') and asyncio.iscoroutinefunction(value):
+                setattr(cls, name, cls._test_wrap(value))
+
+    @staticmethod
+    def _test_wrap(test_function: typing.Callable[..., typing.Awaitable]) -> typing.Callable[..., None]:
+        @functools.wraps(test_function)
+        def test_run(self: 'AsyncTestCase') -> None:
+            async def test_with_set_up() -> None:
+                await self.asyncSetUp()
+                try:
+                    await test_function(self)
+                finally:
+                    await self.asyncTearDown()
+
+            asyncio.run(test_with_set_up())
+
+        return test_run
+
+    async def asyncSetUp(self) -> None:
+        pass
+
+    async def asyncTearDown(self) -> None:
+        pass
@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+
+from discordobjects.client import DiscordClientAsync
+from discordobjects.client.history_scan import history_scan, windows_get
+from .helpers import AsyncTestCase
+
+START_ID = '1000000000000000000'
+END_ID = '1100000000000000000'
+
+
+def boundary_ids_get(window_count: int) -> list:
+    """
+    Returns snowflakes on and around every boundary between the windows.
+    """
+    message_ids = []
+    for after_id, _ in windows_get(START_ID, END_ID, window_count)[:-1]:
+        message_ids.extend(str(int(after_id) + x) for x in (-1, 0, 1))
+    return message_ids
+
+
+class FakeHistory:
+    """
+    Channel history with the message ids, paged newest first like channel_message_list.
+    """
+
+    def __init__(self, message_ids: list):
+        self.message_ids = sorted(set(message_ids), key=int, reverse=True)
+        self.failing_before_id = None
+
+    async def message_list(self, channel_id: str = None, limit: int = 100, before: str = None) -> list:
+        await asyncio.sleep(0)
+        if before is not None and before == self.failing_before_id:
+            raise ConnectionError()
+        return [{'id': x} for x in self.message_ids if before is None or int(x) < int(before)][:limit]
+
+    async def window_iter(self, after_id: str, before_id: str):
+        for message_dict in await self.message_list(limit=len(self.message_ids), before=before_id):
+            yield message_dict
+
+
+class WindowsGetTest(unittest.TestCase):
+
+    def test_every_snowflake_in_one_window(self):
+        windows = windows_get(START_ID, END_ID, 4)
+        self.assertEqual(len(windows), 4)
+        self.assertEqual(windows[0][1], END_ID)
+        self.assertEqual(windows[-1][0], START_ID)
+
+        message_ids = boundary_ids_get(4) + [str(int(START_ID) + 1), str(int(END_ID) - 1)]
+        for message_id in message_ids:
+            with self.subTest(message_id=message_id):
+                containing_windows = [x for x in windows if int(x[0]) < int(message_id) < int(x[1])]
+                self.assertEqual(len(containing_windows), 1)
+
+    def test_ends_excluded(self):
+        for after_id, before_id in windows_get(START_ID, END_ID, 3):
+            self.assertNotEqual(after_id, END_ID)
+            self.assertNotEqual(before_id, START_ID)
+
+    def test_single_window(self):
+        self.assertEqual(windows_get(START_ID, END_ID, 1), [(START_ID, END_ID)])
+
+
+class HistoryScanTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.message_ids = boundary_ids_get(4) + [str(int(START_ID) + 1), str(int(END_ID) - 1)]
+        self.history = FakeHistory(self.message_ids + [START_ID, END_ID])
+
+    async def test_ordered(self):
+        message_ids = [x['id'] async for x in history_scan(self.history.window_iter, START_ID, END_ID, 4)]
+        self.assertEqual(message_ids, sorted(self.message_ids, key=int, reverse=True))
+
+    async def test_unordered(self):
+        message_ids = [x['id'] async for x in history_scan(self.history.window_iter, START_ID, END_ID, 4,
+                                                           ordered=False)]
+        self.assertEqual(sorted(message_ids, key=int), sorted(self.message_ids, key=int))
+
+    async def test_exception_raised(self):
+        self.history.failing_before_id = windows_get(START_ID, END_ID, 4)[2][1]
+        with self.assertRaises(ConnectionError):
+            async for _ in history_scan(self.history.window_iter, START_ID, END_ID, 4):
+                pass
+
+
+class ChannelMessageScanTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.client = DiscordClientAsync('token', use_socket=False, event_loop=asyncio.get_running_loop())
+        self.message_ids = boundary_ids_get(4) + [str(int(START_ID) + x) for x in range(1, 8)]
+        self.history = FakeHistory(self.message_ids)
+        self.client.channel_message_list = self.history.message_list
+
+    async def asyncTearDown(self):
+        self.client.rest_session.close()
+
+    async def test_boundary_messages_scanned_once(self):
+        message_ids = [x['id'] async for x in self.client.channel_message_scan(START_ID, 4, before=END_ID,
+                                                                               step_size=2)]
+        self.assertEqual(message_ids, sorted(self.message_ids, key=int, reverse=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from _functools import partial as f_partial
+
+from discordobjects import exceptions
+from discordobjects.client import NegativeCache
+from discordobjects.discordrest import DiscordSession, ROUTES
+
+
+class NegativeCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = DiscordSession('token')
+        self.negative_cache = NegativeCache()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_departed_member_can_be_banned(self):
+        self.negative_cache.remember(f_partial(self.session.guild_member_get, 'g', 'u'), exceptions.UnknownMember())
+
+        with self.assertRaises(exceptions.UnknownMember):
+            self.negative_cache.check(f_partial(self.session.guild_member_modify, 'g', 'u', new_nick='a'))
+        with self.assertRaises(exceptions.UnknownMember):
+            self.negative_cache.check(f_partial(self.session.guild_member_role_add, 'g', 'u', 'r'))
+
+        self.negative_cache.check(f_partial(self.session.guild_ban_create, 'g', 'u', 7))
+        self.negative_cache.check(f_partial(self.session.guild_ban_remove, 'g', 'u'))
+        self.negative_cache.check(f_partial(self.session.guild_member_add, 'g', 'u', 'access_token'))
+
+    def test_unknown_user_scope(self):
+        self.negative_cache.remember(f_partial(self.session.user_get, 'u'), exceptions.UnknownUser())
+
+        with self.assertRaises(exceptions.UnknownUser):
+            self.negative_cache.check(f_partial(self.session.user_get, 'u'))
+        self.negative_cache.check(f_partial(self.session.guild_ban_create, 'g', 'u', 7))
+        self.negative_cache.check(f_partial(self.session.channel_message_reaction_delete, 'c', 'm', 'u', 'e'))
+
+    def test_not_remembered_from_other_routes(self):
+        self.negative_cache.remember(f_partial(self.session.guild_ban_create, 'g', 'u', 7), exceptions.UnknownMember())
+        self.negative_cache.check(f_partial(self.session.guild_member_get, 'g', 'u'))
+
+    def test_routes_exist(self):
+        for route_names in NegativeCache.RESOURCE_ROUTES.values():
+            self.assertLessEqual(route_names, ROUTES.keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
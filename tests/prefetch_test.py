@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+
+from discordobjects.client.prefetch import prefetch_pages
+from .helpers import AsyncTestCase
+
+
+class FakePages:
+    """
+    Paginated endpoint with items 0 to item_count - 1, cursor is the last item of the previous page.
+    """
+
+    def __init__(self, item_count: int = 50, page_size: int = 10):
+        self.item_count = item_count
+        self.page_size = page_size
+        self.requested_cursors = []
+        self.failing_cursor = None
+
+    async def page_get(self, cursor):
+        self.requested_cursors.append(cursor)
+        await asyncio.sleep(0)
+        if cursor is not None and cursor == self.failing_cursor:
+            raise ConnectionError()
+        first_item = 0 if cursor is None else cursor + 1
+        return list(range(first_item, min(first_item + self.page_size, self.item_count)))
+
+    @staticmethod
+    def next_cursor_get(page: list):
+        return page[-1]
+
+
+class PrefetchPagesTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.pages = FakePages()
+
+    async def items_get(self, depth: int, **kwargs) -> list:
+        items = []
+        async for page in prefetch_pages(self.pages.page_get, self.pages.next_cursor_get, depth=depth, **kwargs):
+            items.extend(page)
+        return items
+
+    async def test_pages_ordered(self):
+        for depth in (0, 1, 3):
+            with self.subTest(depth=depth):
+                self.pages.requested_cursors.clear()
+                self.assertEqual(await self.items_get(depth), list(range(50)))
+                # NOTE: empty page after the last full one ends the pagination
+                self.assertEqual(self.pages.requested_cursors, [None, 9, 19, 29, 39, 49])
+
+    async def test_last_cursor_none(self):
+        items = []
+        async for page in prefetch_pages(self.pages.page_get, lambda page: None if page[-1] >= 19 else page[-1]):
+            items.extend(page)
+        self.assertEqual(items, list(range(20)))
+        self.assertEqual(self.pages.requested_cursors, [None, 9])
+
+    async def test_depth_limited(self):
+        async for _ in prefetch_pages(self.pages.page_get, self.pages.next_cursor_get, depth=2):
+            for _ in range(10):
+                await asyncio.sleep(0)
+            break
+        # NOTE: the consumed page, two queued pages and one waiting for space in the queue
+        self.assertEqual(self.pages.requested_cursors, [None, 9, 19, 29])
+
+    async def test_depth_zero_not_ahead(self):
+        async for _ in prefetch_pages(self.pages.page_get, self.pages.next_cursor_get, depth=0):
+            for _ in range(10):
+                await asyncio.sleep(0)
+            break
+        self.assertEqual(self.pages.requested_cursors, [None])
+
+    async def test_max_items_limited(self):
+        async for _ in prefetch_pages(self.pages.page_get, self.pages.next_cursor_get, depth=10, max_items=15):
+            for _ in range(10):
+                await asyncio.sleep(0)
+            break
+        # NOTE: stops once the two waiting pages hold 20 items, the consumed page is not counted
+        self.assertEqual(self.pages.requested_cursors, [None, 9, 19])
+
+    async def test_exception_raised(self):
+        self.pages.failing_cursor = 29
+        items = []
+        with self.assertRaises(ConnectionError):
+            async for page in prefetch_pages(self.pages.page_get, self.pages.next_cursor_get, depth=2):
+                items.extend(page)
+        self.assertEqual(items, list(range(30)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from time import time
+
+from discordobjects import exceptions
+from discordobjects.client import DiscordClientAsync
+from discordobjects.util import timestamp_to_snowflake
+from .helpers import AsyncTestCase
+
+DAY = 24 * 60 * 60
+
+
+class FakeChannel:
+    """
+    Channel history with 150 messages of the last hour and 20 messages older than 14 days.
+    """
+
+    def __init__(self):
+        new_ids = [str(int(timestamp_to_snowflake(time() - 3600)) + x) for x in range(150)]
+        old_ids = [str(int(timestamp_to_snowflake(time() - 30 * DAY)) + x) for x in range(20)]
+        self.message_ids = sorted(new_ids + old_ids, key=int, reverse=True)
+        self.new_ids = sorted(new_ids, key=int, reverse=True)
+        self.old_ids = sorted(old_ids, key=int, reverse=True)
+        self.bulk_deleted = []
+        self.deleted = []
+        self.failing_ids = set()
+
+    async def message_list(self, channel_id: str, limit: int = 100, before: str = None) -> list:
+        await asyncio.sleep(0)
+        return [{'id': x} for x in self.message_ids if before is None or int(x) < int(before)][:limit]
+
+    async def message_delete(self, channel_id: str, message_id: str) -> bool:
+        await asyncio.sleep(0)
+        if message_id in self.failing_ids:
+            raise exceptions.UnknownMessage()
+        self.deleted.append(message_id)
+        return True
+
+    async def message_bulk_delete(self, channel_id: str, message_ids: list) -> bool:
+        await asyncio.sleep(0)
+        if self.failing_ids.intersection(message_ids):
+            raise exceptions.MissingPermissions()
+        self.bulk_deleted.append(list(message_ids))
+        return True
+
+
+class ChannelMessagePurgeTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.client = DiscordClientAsync('token', use_socket=False, event_loop=asyncio.get_running_loop())
+        self.channel = FakeChannel()
+        self.client.channel_message_list = self.channel.message_list
+        self.client.channel_message_delete = self.channel.message_delete
+        self.client.channel_message_bulk_delete = self.channel.message_bulk_delete
+
+    async def asyncTearDown(self):
+        self.client.rest_session.close()
+
+    async def test_new_bulk_old_single(self):
+        self.assertEqual(await self.client.channel_message_purge('channel'), 170)
+        self.assertEqual(self.channel.bulk_deleted, [self.channel.new_ids[:100], self.channel.new_ids[100:]])
+        self.assertEqual(sorted(self.channel.deleted, key=int), sorted(self.channel.old_ids, key=int))
+
+    async def test_filter_and_limit(self):
+        deleted_count = await self.client.channel_message_purge(
+            'channel', lambda message_dict: int(message_dict['id']) % 2 == 0, limit=30)
+        self.assertEqual(deleted_count, 30)
+        self.assertEqual(self.channel.bulk_deleted, [[x for x in self.channel.new_ids if int(x) % 2 == 0][:30]])
+        self.assertEqual(self.channel.deleted, [])
+
+    async def test_single_message_not_bulk(self):
+        self.assertEqual(await self.client.channel_message_purge('channel', limit=1), 1)
+        self.assertEqual(self.channel.bulk_deleted, [])
+        self.assertEqual(self.channel.deleted, self.channel.new_ids[:1])
+
+    async def test_before(self):
+        deleted_count = await self.client.channel_message_purge('channel', before=self.channel.old_ids[9])
+        self.assertEqual(deleted_count, 10)
+        self.assertEqual(sorted(self.channel.deleted, key=int), sorted(self.channel.old_ids[10:], key=int))
+
+    async def test_failed_single_deletes_not_counted(self):
+        self.channel.failing_ids = set(self.channel.old_ids[:5])
+        self.assertEqual(await self.client.channel_message_purge('channel', before=self.channel.new_ids[-1]), 15)
+
+    async def test_bulk_delete_error_raised(self):
+        self.channel.failing_ids = {self.channel.new_ids[0]}
+        with self.assertRaises(exceptions.MissingPermissions):
+            await self.client.channel_message_purge('channel')
+
+
+if __name__ == '__main__':
+    unittest.main()
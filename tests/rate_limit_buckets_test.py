@@ -0,0 +1,160 @@
+import asyncio
+import unittest
+from _functools import partial as f_partial
+from time import time
+
+from requests import Response
+
+from discordobjects.client.priority import Priority, request_priority
+from discordobjects.client.rate_limit_buckets import RateLimitBucket, RateLimitBuckets
+from .helpers import AsyncTestCase, response_make
+
+
+class RateLimitBucketsTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.rate_limit = RateLimitBuckets(asyncio.get_running_loop(), asynchronous_transport=True)
+        self.running_calls = 0
+        self.max_running_calls = 0
+        self.call_times = []
+
+    async def fake_call(self, response: Response, duration: float = 0.05) -> Response:
+        self.call_times.append(time())
+        self.running_calls += 1
+        self.max_running_calls = max(self.max_running_calls, self.running_calls)
+        await asyncio.sleep(duration)
+        self.running_calls -= 1
+        return response
+
+    async def test_buckets_parallel(self):
+        await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response_make()), (x, ()))
+                               for x in ('a', 'b', 'c')))
+        self.assertEqual(self.max_running_calls, 3)
+
+    async def test_bucket_serial_without_limits(self):
+        results = await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response_make()), ('a', ()))
+                                         for _ in range(3)))
+        self.assertEqual(results, [{}] * 3)
+        self.assertEqual(self.max_running_calls, 1)
+
+    async def test_bucket_runs_remaining_calls(self):
+        response = response_make(headers={'X-RateLimit-Remaining': '3', 'X-RateLimit-Reset': str(time() + 10)})
+        await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response), ('a', ())) for _ in range(8)))
+        self.assertEqual(self.max_running_calls, 3)
+
+    async def test_remaining_exhausted(self):
+        reset_time = time() + 0.2
+        response = response_make(headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset_time)})
+        await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response, 0), ('a', ())) for _ in range(2)))
+        self.assertGreaterEqual(self.call_times[1], reset_time)
+
+    async def test_route_bucket_hash(self):
+        response = response_make(headers={'X-RateLimit-Bucket': 'abc'})
+        await self.rate_limit(f_partial(self.fake_call, response, 0))
+        self.assertEqual(self.rate_limit.route_buckets[self.fake_call], 'abc')
+        self.assertEqual(self.rate_limit.bucket_key_get(f_partial(self.fake_call, response)), ('abc', ()))
+
+    async def test_idle_bucket_cleanup(self):
+        reset_time = time() + 10
+        response = response_make(headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': str(reset_time)})
+        await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response), ('a', ())) for _ in range(2)))
+        self.assertEqual(self.rate_limit.buckets, {})
+        # NOTE: limit is kept until its reset passes so new bucket starts with it
+        self.assertEqual(self.rate_limit.rate_limit_table[('a', ())], (4, reset_time))
+
+        response = response_make(headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': str(time() - 1)})
+        await self.rate_limit(f_partial(self.fake_call, response, 0), ('a', ()))
+        self.assertEqual(self.rate_limit.buckets, {})
+        self.assertNotIn(('a', ()), self.rate_limit.rate_limit_table)
+
+    async def test_expired_limits_swept(self):
+        self.rate_limit.TABLE_SWEEP_PERIOD = 0
+        self.rate_limit.table_sweep_time = time()
+        response = response_make(headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': str(time() + 0.05)})
+        await asyncio.gather(*(self.rate_limit(f_partial(self.fake_call, response, 0), (x, ())) for x in 'abc'))
+        self.assertEqual(len(self.rate_limit.rate_limit_table), 4)
+
+        await asyncio.sleep(0.1)
+        response = response_make(headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': str(time() + 10)})
+        await self.rate_limit(f_partial(self.fake_call, response, 0), ('d', ()))
+        self.assertEqual(set(self.rate_limit.rate_limit_table), {'global', ('d', ())})
+
+    async def test_sweep_throttled(self):
+        response = response_make(headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': str(time() + 0.05)})
+        await self.rate_limit(f_partial(self.fake_call, response, 0), ('a', ()))
+        await asyncio.sleep(0.1)
+        await self.rate_limit(f_partial(self.fake_call, response_make(), 0), ('b', ()))
+        # NOTE: swept only once TABLE_SWEEP_PERIOD passes since the client was created
+        self.assertIn(('a', ()), self.rate_limit.rate_limit_table)
+
+
+class PriorityTest(AsyncTestCase):
+
+    async def test_priority_order(self):
+        bucket = RateLimitBucket(aging_period=5)
+        await bucket.acquire(Priority.NORMAL)
+        served = []
+
+        async def waiter(priority: Priority) -> None:
+            await bucket.acquire(priority)
+            served.append(priority)
+            bucket.release()
+
+        waiter_tasks = [asyncio.ensure_future(waiter(x))
+                        for x in (Priority.BULK, Priority.NORMAL, Priority.INTERACTIVE)]
+        await asyncio.sleep(0)
+        bucket.release()
+        await asyncio.gather(*waiter_tasks)
+        self.assertEqual(served, [Priority.INTERACTIVE, Priority.NORMAL, Priority.BULK])
+
+    async def test_aging(self):
+        bucket = RateLimitBucket(aging_period=0.01)
+        await bucket.acquire(Priority.NORMAL)
+        served = []
+
+        async def waiter(priority: Priority) -> None:
+            await bucket.acquire(priority)
+            served.append(priority)
+            bucket.release()
+
+        # NOTE: bulk call waited longer than two aging periods, so it is served before the newer interactive one
+        bulk_task = asyncio.ensure_future(waiter(Priority.BULK))
+        await asyncio.sleep(0.05)
+        interactive_task = asyncio.ensure_future(waiter(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        bucket.release()
+        await asyncio.gather(bulk_task, interactive_task)
+        self.assertEqual(served, [Priority.BULK, Priority.INTERACTIVE])
+
+    async def test_cancelled_waiter(self):
+        bucket = RateLimitBucket(aging_period=5)
+        await bucket.acquire(Priority.NORMAL)
+        waiter_task = asyncio.ensure_future(bucket.acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        waiter_task.cancel()
+        await asyncio.sleep(0)
+        bucket.release()
+        self.assertEqual(bucket.running, 0)
+        await bucket.acquire(Priority.BULK)
+        self.assertEqual(bucket.running, 1)
+
+    async def test_request_priority(self):
+        rate_limit = RateLimitBuckets(asyncio.get_running_loop(), asynchronous_transport=True)
+        served = []
+
+        async def fake_call(name: str) -> Response:
+            served.append(name)
+            await asyncio.sleep(0.01)
+            return response_make()
+
+        async def prioritized_call(name: str, priority: Priority) -> dict:
+            with request_priority(priority):
+                return await rate_limit(f_partial(fake_call, name), ('a', ()))
+
+        await asyncio.gather(prioritized_call('first', Priority.BULK), prioritized_call('bulk', Priority.BULK),
+                             prioritized_call('interactive', Priority.INTERACTIVE))
+        self.assertEqual(served, ['first', 'interactive', 'bulk'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from _functools import partial as f_partial
+from time import time
+
+from requests import Response
+
+from discordobjects.client.rate_limit_buckets import RateLimitBuckets
+from discordobjects.client.rate_limit_global import GlobalRateLimit
+from .helpers import AsyncTestCase, response_make
+
+
+class GlobalRateLimitTest(AsyncTestCase):
+
+    async def test_token_refill(self):
+        global_limit = GlobalRateLimit(calls_per_second=20)
+        start_time = time()
+        for _ in range(25):
+            await global_limit.acquire()
+        # NOTE: first 20 tokens are available immediately, 5 more refill in 0.25 seconds
+        self.assertGreaterEqual(time() - start_time, 0.2)
+
+    async def test_pause(self):
+        global_limit = GlobalRateLimit()
+        reset_time = time() + 0.1
+        global_limit.pause(reset_time)
+        global_limit.pause(reset_time - 1)
+        await global_limit.acquire()
+        self.assertGreaterEqual(time(), reset_time)
+
+
+class TooManyRequestsTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.rate_limit = RateLimitBuckets(asyncio.get_running_loop(), asynchronous_transport=True)
+        self.call_times = []
+
+    async def fake_call(self, responses: list) -> Response:
+        self.call_times.append(time())
+        return responses.pop(0)
+
+    async def test_retry_after(self):
+        responses = [response_make(429, b'{"retry_after": 100, "global": false}'), response_make()]
+        self.assertEqual(await self.rate_limit(f_partial(self.fake_call, responses), ('a', ())), {})
+        self.assertEqual(len(self.call_times), 2)
+        self.assertGreaterEqual(self.call_times[1] - self.call_times[0], 0.1)
+        self.assertEqual(self.rate_limit.global_limit.paused_until, 0)
+
+    async def test_retry_period_without_body(self):
+        self.rate_limit.retry_period = 0.1
+        responses = [response_make(429, b''), response_make()]
+        self.assertEqual(await self.rate_limit(f_partial(self.fake_call, responses), ('a', ())), {})
+        self.assertGreaterEqual(self.call_times[1] - self.call_times[0], 0.1)
+
+    async def test_global_pause(self):
+        global_responses = [response_make(429, b'{"retry_after": 200, "global": true}'), response_make()]
+        other_responses = [response_make()]
+
+        async def other_call() -> dict:
+            # NOTE: starts after the global 429 was received
+            await asyncio.sleep(0.05)
+            return await self.rate_limit(f_partial(self.fake_call, other_responses), ('b', ()))
+
+        await asyncio.gather(self.rate_limit(f_partial(self.fake_call, global_responses), ('a', ())), other_call())
+        self.assertEqual(len(self.call_times), 3)
+        self.assertGreaterEqual(min(self.call_times[1:]) - self.call_times[0], 0.2)
+        self.assertEqual(self.rate_limit.rate_limit_table['global'][0], 0)
+
+    async def test_global_header(self):
+        responses = [response_make(429, b'{"retry_after": 100}', {'X-RateLimit-Global': 'true'}), response_make()]
+        await self.rate_limit(f_partial(self.fake_call, responses), ('a', ()))
+        self.assertGreater(self.rate_limit.global_limit.paused_until, self.call_times[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+
+from discordobjects.client.request_coalescing import RequestCoalescer
+from .helpers import AsyncTestCase
+
+
+class RequestCoalescerTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.request_coalescer = RequestCoalescer()
+        self.calls_count = 0
+
+    async def fake_call(self) -> list:
+        self.calls_count += 1
+        await asyncio.sleep(0.01)
+        return [{'name': 'original'}, {'name': 'second'}]
+
+    async def test_shared_call(self):
+        results = await asyncio.gather(*(self.request_coalescer('key', self.fake_call) for _ in range(3)))
+        self.assertEqual(self.calls_count, 1)
+        self.assertEqual(results, [[{'name': 'original'}, {'name': 'second'}]] * 3)
+        self.assertEqual(self.request_coalescer.in_flight, {})
+        self.assertEqual(self.request_coalescer.waiting_counts, {})
+
+    async def test_results_independent(self):
+        async def first_caller() -> list:
+            result = await self.request_coalescer('key', self.fake_call)
+            result[0]['name'] = 'mutated by first'
+            return result
+
+        # NOTE: first caller resumes and modifies its result before the second caller resumes
+        first_result, second_result = await asyncio.gather(
+            first_caller(), self.request_coalescer('key', self.fake_call))
+        self.assertEqual(first_result[0]['name'], 'mutated by first')
+        self.assertEqual(second_result, [{'name': 'original'}, {'name': 'second'}])
+
+    async def test_cancelled_caller(self):
+        cancelled_task = asyncio.ensure_future(self.request_coalescer('key', self.fake_call))
+        await asyncio.sleep(0)
+        cancelled_task.cancel()
+        self.assertEqual(await self.request_coalescer('key', self.fake_call),
+                         [{'name': 'original'}, {'name': 'second'}])
+        self.assertEqual(self.calls_count, 1)
+        self.assertEqual(self.request_coalescer.waiting_counts, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import mmap
+import pathlib
+import tempfile
+import unittest
+
+from discordobjects import exceptions
+from discordobjects.client import DiscordClientAsync, RestCache, NegativeCache
+from .helpers import AsyncTestCase
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class AiohttpTransportTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.received_requests = []
+
+        async def channel_get(request: 'web.Request'):
+            self.received_requests.append(request)
+            if request.match_info['channel_id'] == '0':
+                return web.json_response({'code': 10003, 'message': 'Unknown Channel'}, status=404)
+            return web.json_response({'id': request.match_info['channel_id']},
+                                     headers={'X-RateLimit-Remaining': '4', 'X-RateLimit-Reset': '0',
+                                              'X-RateLimit-Bucket': 'abc'})
+
+        async def message_create(request: 'web.Request'):
+            self.received_requests.append(request)
+            form = await request.post()
+            return web.json_response({'content': form['content'], 'file': form['file'].file.read().decode()})
+
+        async def typing_start(request: 'web.Request'):
+            self.received_requests.append(request)
+            return web.Response(status=204)
+
+        application = web.Application()
+        application.router.add_get('/api/v6/channels/{channel_id}', channel_get)
+        application.router.add_post('/api/v6/channels/{channel_id}/messages', message_create)
+        application.router.add_post('/api/v6/channels/{channel_id}/typing', typing_start)
+        self.runner = web.AppRunner(application)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.client = DiscordClientAsync('test_token', use_socket=False, event_loop=asyncio.get_running_loop(),
+                                         transport='aiohttp')
+        self.client.rest_session.API_URL = f'http://127.0.0.1:{port}/api/v6'
+
+    async def asyncTearDown(self):
+        await self.client.rest_session.close_async()
+        await self.runner.cleanup()
+
+    async def test_json_response(self):
+        channel_dicts = await asyncio.gather(*(self.client.channel_get(str(x)) for x in range(1, 5)))
+        self.assertEqual([x['id'] for x in channel_dicts], ['1', '2', '3', '4'])
+        self.assertEqual(self.received_requests[0].headers['Authorization'], 'Bot test_token')
+        self.assertEqual(self.client.rate_limit.route_buckets[('GET', '/channels/{channel_id}')], 'abc')
+
+    async def test_get_coalescing(self):
+        channel_dicts = await asyncio.gather(*(self.client.channel_get('1') for _ in range(5)))
+        self.assertEqual(len(self.received_requests), 1)
+        self.assertEqual(channel_dicts, [{'id': '1'}] * 5)
+        channel_dicts[1]['id'] = 'modified'
+        self.assertEqual(channel_dicts[0]['id'], '1')
+
+    async def test_cache(self):
+        self.client.cache = RestCache()
+        await self.client.channel_get('1')
+        (await self.client.channel_get('1'))['id'] = 'modified'
+        self.assertEqual(await self.client.channel_get('1'), {'id': '1'})
+        self.assertEqual(len(self.received_requests), 1)
+
+        self.client.cache.event_handle({'id': '1', 'guild_id': '2'}, 'CHANNEL_UPDATE')
+        await self.client.channel_get('1')
+        self.assertEqual(len(self.received_requests), 2)
+
+    async def test_negative_cache(self):
+        self.client.negative_cache = NegativeCache()
+        with self.assertRaises(exceptions.UnknownChannel):
+            await self.client.channel_get('0')
+        with self.assertRaises(exceptions.UnknownChannel):
+            await self.client.channel_typing_start('0')
+        self.assertEqual(len(self.received_requests), 1)
+
+        self.client.negative_cache.event_handle({'id': '0'}, 'CHANNEL_CREATE')
+        with self.assertRaises(exceptions.UnknownChannel):
+            await self.client.channel_get('0')
+        self.assertEqual(len(self.received_requests), 2)
+
+    async def test_empty_response(self):
+        self.assertTrue(await self.client.channel_typing_start('1'))
+
+    async def test_error_response(self):
+        with self.assertRaises(exceptions.UnknownChannel):
+            await self.client.channel_get('0')
+
+    async def test_multipart(self):
+        message_dict = await self.client.channel_message_create('1', 'text', files_tuples=[
+            ('file', ('test.txt', b'file contents'))])
+        self.assertEqual(message_dict, {'content': 'text', 'file': 'file contents'})
+
+    async def test_multipart_streamed_sources(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = pathlib.Path(directory, 'test.txt')
+            file_path.write_bytes(b'streamed contents')
+
+            with open(file_path, 'rb') as file:
+                file_mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                for source in (file_path, file, memoryview(b'streamed contents'), file_mmap):
+                    message_dict = await self.client.channel_message_create('1', 'text', files_tuples=[
+                        ('file', ('test.txt', source))])
+                    self.assertEqual(message_dict, {'content': 'text', 'file': 'streamed contents'})
+                file_mmap.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
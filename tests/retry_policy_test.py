@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from _functools import partial as f_partial
+from time import sleep, time
+
+from requests import Response
+from requests.exceptions import ConnectionError
+
+from discordobjects import exceptions
+from discordobjects.client.rate_limit_buckets import RateLimitBuckets
+from discordobjects.client.retry_policy import CircuitBreaker, RetryPolicy
+from .helpers import AsyncTestCase, response_make
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_backoff(self):
+        retry_policy = RetryPolicy(max_attempts=3, backoff_base=1, backoff_max=3)
+        deadline_time = retry_policy.deadline_get()
+        for attempt in range(1, 3):
+            self.assertLessEqual(retry_policy.delay_get(attempt, deadline_time, None), min(3, 2 ** attempt))
+
+        with self.assertRaises(exceptions.RetriesExhausted):
+            retry_policy.delay_get(3, deadline_time, None)
+
+    def test_deadline(self):
+        retry_policy = RetryPolicy(backoff_base=1)
+        with self.assertRaises(exceptions.RetriesExhausted):
+            retry_policy.delay_get(1, time() - 1, None)
+
+    def test_circuit_breaker(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+        circuit_breaker.failure()
+        circuit_breaker.check()
+        circuit_breaker.failure()
+        with self.assertRaises(exceptions.DiscordUnavailable):
+            circuit_breaker.check()
+
+        # NOTE: after recovery_time calls are let through, but the next failure opens the circuit again
+        sleep(0.05)
+        circuit_breaker.check()
+        circuit_breaker.failure()
+        with self.assertRaises(exceptions.DiscordUnavailable):
+            circuit_breaker.check()
+
+        circuit_breaker.success()
+        circuit_breaker.check()
+        self.assertEqual(circuit_breaker.consecutive_failures, 0)
+
+
+class RetryTest(AsyncTestCase):
+
+    async def asyncSetUp(self):
+        self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_time=0.1)
+        self.rate_limit = RateLimitBuckets(
+            asyncio.get_running_loop(), asynchronous_transport=True,
+            retry_policy=RetryPolicy(max_attempts=5, backoff_base=0.001, circuit_breaker=self.circuit_breaker))
+        self.calls_count = 0
+
+    async def fake_call(self, responses: list) -> Response:
+        self.calls_count += 1
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def test_recovered(self):
+        responses = [response_make(503), ConnectionError(), response_make()]
+        self.assertEqual(await self.rate_limit(f_partial(self.fake_call, responses), ('a', ())), {})
+        self.assertEqual(self.calls_count, 3)
+        self.assertEqual(self.circuit_breaker.consecutive_failures, 0)
+
+    async def test_retries_exhausted(self):
+        self.circuit_breaker.failure_threshold = 10
+        with self.assertRaises(exceptions.RetriesExhausted):
+            await self.rate_limit(f_partial(self.fake_call, [response_make(500)]), ('a', ()))
+        self.assertEqual(self.calls_count, 5)
+
+    async def test_client_errors_not_retried(self):
+        with self.assertRaises(exceptions.UnknownChannel):
+            await self.rate_limit(f_partial(self.fake_call, [response_make(
+                404, b'{"code": 10003, "message": "Unknown Channel"}')]), ('a', ()))
+        self.assertEqual(self.calls_count, 1)
+
+    async def test_circuit_open_and_recover(self):
+        with self.assertRaises(exceptions.DiscordUnavailable):
+            await self.rate_limit(f_partial(self.fake_call, [response_make(503)]), ('a', ()))
+        self.assertEqual(self.calls_count, 3)
+
+        # NOTE: open circuit fails calls of every bucket without reaching Discord
+        with self.assertRaises(exceptions.DiscordUnavailable):
+            await self.rate_limit(f_partial(self.fake_call, [response_make()]), ('b', ()))
+        self.assertEqual(self.calls_count, 3)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(await self.rate_limit(f_partial(self.fake_call, [response_make()]), ('b', ())), {})
+        self.assertFalse(self.circuit_breaker.is_open())
+        self.assertEqual(self.circuit_breaker.consecutive_failures, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import asyncio
+import gc
+import multiprocessing
+import threading
+import unittest
+from functools import partial
+from time import time
+from unittest.mock import patch
+
+from requests.exceptions import ConnectionError
+
+from discordobjects import exceptions
+from discordobjects.client.retry_policy import RetryPolicy
+from discordobjects.discordrest import DiscordSession
+from discordobjects import shard_manager
+from discordobjects.shard_manager import gateway_bot_get, ProcessShardManager
+from .helpers import response_make
+
+GATEWAY_BOT = b'{"url": "wss://gateway.discord.gg", "shards": 1, "session_start_limit": {"remaining": 1000}}'
+
+
+class GatewayBotGetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.retry_policy = RetryPolicy(max_attempts=4, backoff_base=0.001)
+
+    def test_retried(self):
+        responses = [response_make(503), ConnectionError(), response_make(429, b'{"retry_after": 10}'),
+                     response_make(200, GATEWAY_BOT)]
+        with patch.object(DiscordSession, 'gateway_bot_get', side_effect=responses) as gateway_bot_get_mock:
+            self.assertEqual(gateway_bot_get('token', self.retry_policy)['shards'], 1)
+        self.assertEqual(gateway_bot_get_mock.call_count, 4)
+
+    def test_retries_exhausted(self):
+        with patch.object(DiscordSession, 'gateway_bot_get', return_value=response_make(502)):
+            with self.assertRaises(exceptions.RetriesExhausted):
+                gateway_bot_get('token', self.retry_policy)
+
+    def test_client_error_not_retried(self):
+        with patch.object(DiscordSession, 'gateway_bot_get',
+                          return_value=response_make(401, b'{"code": 0, "message": "401: Unauthorized"}')
+                          ) as gateway_bot_get_mock:
+            with self.assertRaises(exceptions.DiscordObjectsException):
+                gateway_bot_get('token', self.retry_policy)
+        self.assertEqual(gateway_bot_get_mock.call_count, 1)
+
+    def test_stopped(self):
+        with patch.object(DiscordSession, 'gateway_bot_get', return_value=response_make(502)):
+            self.assertIsNone(gateway_bot_get('token', RetryPolicy(backoff_base=10), lambda: False))
+
+
+
+class FakeSocket:
+    """
+    Stands in for DiscordSocket in the worker. Runs init_function instead of connecting
+    and then stays connected until the worker is stopped.
+    """
+
+    def __init__(self, init_function, token: str, socket_url: str, shard_num: int, shard_total: int,
+                 event_loop: asyncio.AbstractEventLoop, event_handler, identify_throttle, event_filter, **kwargs):
+        self.init_function = init_function
+        self.shard_num = shard_num
+        self.event_handler = event_handler
+        self.event_filter = event_filter
+        self.running = True
+
+    async def init(self):
+        await self.init_function(self)
+        await asyncio.sleep(60)
+
+
+def event_payload_make(event_name: str, number: int) -> dict:
+    return {'op': 0, 't': event_name, 's': number, 'd': {'number': number}}
+
+
+class ShardProcessTest(unittest.TestCase):
+
+    def worker_run(self, init_function, subscribed_event_names: frozenset, event_buffer_size: int = 100):
+        """
+        Runs the worker in a thread of this process. Returns the worker thread, event and command connections.
+        """
+        event_receive_connection, event_send_connection = multiprocessing.Pipe(duplex=False)
+        command_receive_connection, command_send_connection = multiprocessing.Pipe(duplex=False)
+        socket_patch = patch.object(shard_manager.discordsocket, 'DiscordSocket', partial(FakeSocket, init_function))
+        socket_patch.start()
+        self.addCleanup(socket_patch.stop)
+
+        worker_thread = threading.Thread(target=shard_manager._shard_process_main, args=(
+            'token', 'wss://gateway', [0], 1, None, event_send_connection, command_receive_connection,
+            subscribed_event_names, {}, event_buffer_size, {}))
+        worker_thread.start()
+        return worker_thread, event_receive_connection, command_send_connection
+
+    def worker_stop(self, worker_thread: threading.Thread, event_connection, command_connection) -> list:
+        """
+        Stops the worker and returns the events it sent that were not received yet.
+        """
+        command_connection.send(None)
+        worker_thread.join(timeout=10)
+        self.assertFalse(worker_thread.is_alive())
+
+        events = []
+        try:
+            while event_connection.poll(5):
+                events.append(event_connection.recv())
+        except EOFError:
+            pass
+        return events
+
+    def test_subscriptions_sync(self):
+        async def init(socket: FakeSocket):
+            socket.event_handler(event_payload_make('MESSAGE_CREATE', 0))
+            socket.event_handler(event_payload_make('TYPING_START', 1))
+            while not socket.event_filter('TYPING_START'):
+                await asyncio.sleep(0.01)
+            socket.event_handler(event_payload_make('MESSAGE_CREATE', 2))
+            socket.event_handler(event_payload_make('TYPING_START', 3))
+
+        worker_thread, event_connection, command_connection = self.worker_run(init, frozenset({'MESSAGE_CREATE'}))
+        self.assertTrue(event_connection.poll(5))
+        self.assertEqual(event_connection.recv(), ('MESSAGE_CREATE', {'number': 0}, 0))
+
+        command_connection.send(frozenset({'TYPING_START'}))
+        self.assertTrue(event_connection.poll(5))
+        self.assertEqual(event_connection.recv(), ('TYPING_START', {'number': 3}, 0))
+        self.assertEqual(self.worker_stop(worker_thread, event_connection, command_connection), [])
+
+    def test_full_buffer_drops(self):
+        events_emitted = threading.Event()
+
+        async def init(socket: FakeSocket):
+            # NOTE: emitted without returning to the event loop, faster than the thread sends them
+            for number in range(1000):
+                socket.event_handler(event_payload_make('MESSAGE_CREATE', number))
+            events_emitted.set()
+
+        with self.assertLogs(level='WARNING') as logs:
+            worker_thread, event_connection, command_connection = self.worker_run(
+                init, frozenset({'MESSAGE_CREATE'}), event_buffer_size=2)
+            self.assertTrue(events_emitted.wait(5))
+            events = self.worker_stop(worker_thread, event_connection, command_connection)
+
+        self.assertLess(len(events), 1000)
+        self.assertEqual(events[0], ('MESSAGE_CREATE', {'number': 0}, 0))
+        self.assertTrue(any('dropping events' in x for x in logs.output))
+
+
+class ProcessShardManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        # NOTE: manager dispatches events to the event loop of the thread that created it
+        self.event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.event_loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.event_loop.close()
+
+    def test_queue_removal_sent(self):
+        with patch.object(shard_manager, 'gateway_bot_get', return_value=None):
+            manager = ProcessShardManager('token', 1)
+        command_receive_connection, command_send_connection = multiprocessing.Pipe(duplex=False)
+        manager.command_connections.append(command_send_connection)
+
+        event_queue = asyncio.Queue()
+        manager.event_queue_add_multiple(event_queue, ('MESSAGE_CREATE',))
+        self.assertEqual(command_receive_connection.recv(), frozenset({'MESSAGE_CREATE'}))
+
+        del event_queue
+        gc.collect()
+        manager._subscriptions_sync()
+        self.assertEqual(command_receive_connection.recv(), frozenset())
+
+        manager.stop()
+        self.assertIsNone(command_receive_connection.recv())
+
+    def test_stop_during_session_start_wait(self):
+        gateway_bot = {'url': 'wss://gateway', 'shards': 1,
+                       'session_start_limit': {'remaining': 0, 'reset_after': 3600 * 1000}}
+        with patch.object(shard_manager, 'gateway_bot_get', return_value=gateway_bot):
+            manager = ProcessShardManager('token', 1)
+            stop_time = time()
+            manager.stop()
+        self.assertLess(time() - stop_time, 5)
+        self.assertEqual(manager.processes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
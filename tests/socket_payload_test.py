@@ -0,0 +1,117 @@
+import json
+import unittest
+import zlib
+
+from discordobjects.discordsocketnew import DiscordSocket, ZlibStreamInflator
+from discordobjects.util import etf_loads, etf_dumps
+
+# NOTE: fields are in the same order as the gateway sends them
+RECORDED_PAYLOADS = [
+    {'t': None, 's': None, 'op': 10, 'd': {'heartbeat_interval': 41250}},
+    {'t': 'READY', 's': 1, 'op': 0,
+     'd': {'session_id': 'abc', 'guilds': [{'id': str(x), 'unavailable': True} for x in range(200)]}},
+    {'t': 'TYPING_START', 's': 2, 'op': 0, 'd': {'channel_id': '1', 'user_id': '2', 'timestamp': 1500000000}},
+    {'t': None, 's': None, 'op': 11, 'd': None},
+]
+
+
+def frames_record(payloads: list, frame_size: int = None) -> list:
+    """
+    Compresses payloads the same way gateway does with zlib-stream and splits them into frames.
+    """
+    compressor = zlib.compressobj()
+    frames = []
+    for payload in payloads:
+        data = compressor.compress(json.dumps(payload).encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if frame_size is None:
+            frames.append(data)
+        else:
+            frames.extend(data[x:x + frame_size] for x in range(0, len(data), frame_size))
+    return frames
+
+
+class ZlibStreamTest(unittest.TestCase):
+
+    def test_whole_frames(self):
+        inflator = ZlibStreamInflator()
+        self.assertEqual([json.loads(inflator.feed(x)) for x in frames_record(RECORDED_PAYLOADS)],
+                         RECORDED_PAYLOADS)
+
+    def test_split_frames(self):
+        inflator = ZlibStreamInflator()
+        decoded = [inflator.feed(x) for x in frames_record(RECORDED_PAYLOADS, frame_size=16)]
+        self.assertEqual([json.loads(x) for x in decoded if x is not None], RECORDED_PAYLOADS)
+
+    def test_socket_decode(self):
+        socket = DiscordSocket('token', event_loop=None)
+        self.assertTrue(socket.socket_url.endswith('compress=zlib-stream'))
+
+        socket.inflator = ZlibStreamInflator()
+        payloads = [socket._payload_decode(x) for x in frames_record(RECORDED_PAYLOADS, frame_size=64)]
+        self.assertEqual([x for x in payloads if x is not None], RECORDED_PAYLOADS)
+
+        # NOTE: text frames are never compressed
+        self.assertEqual(socket._payload_decode(json.dumps(RECORDED_PAYLOADS[0])), RECORDED_PAYLOADS[0])
+
+    def test_unsubscribed_events_skipped(self):
+        socket = DiscordSocket('token', event_loop=None, event_filter=lambda x: x == 'MESSAGE_CREATE')
+        socket.inflator = ZlibStreamInflator()
+        payloads = RECORDED_PAYLOADS + [
+            {'t': 'PRESENCE_UPDATE', 's': 3, 'op': 0, 'd': {'user': {'id': '1'}, 'status': 'online'}},
+            {'t': 'MESSAGE_CREATE', 's': 4, 'op': 0, 'd': {'id': '5', 'content': '"t":"PRESENCE_UPDATE"'}},
+        ]
+
+        decoded = [socket._payload_decode(x) for x in frames_record(payloads)]
+        self.assertEqual(decoded[:2], payloads[:2])
+        self.assertIsNone(decoded[2])
+        self.assertEqual(decoded[3], payloads[3])
+        self.assertIsNone(decoded[4])
+        self.assertEqual(socket.heartbeat_sequence, 3)
+        self.assertEqual(decoded[5], payloads[5])
+
+        # NOTE: payloads with fields in other order are decoded
+        self.assertEqual(socket._payload_decode(json.dumps({'d': {}, 'op': 0, 's': 6, 't': 'TYPING_START'})),
+                         {'d': {}, 'op': 0, 's': 6, 't': 'TYPING_START'})
+
+
+class EtfTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for payload in RECORDED_PAYLOADS:
+            self.assertEqual(etf_loads(etf_dumps(payload)), payload)
+
+        payload = {'float': 0.5, 'negative': -70000, 'empty': [], 'tuple': (1, 'a'), 'flags': [True, False, None]}
+        self.assertEqual(etf_loads(etf_dumps(payload)),
+                         dict(payload, tuple=[1, 'a']))
+
+    def test_erlang_terms(self):
+        # NOTE: term_to_binary(#{t => 'MESSAGE_CREATE', d => #{id => 392800398843183104, content => <<"hi">>}})
+        data = (b'\x83t\x00\x00\x00\x02w\x01tw\x0eMESSAGE_CREATEw\x01dt\x00\x00\x00\x02'
+                b'w\x02idn\x08\x00\x00\x00\xae\xb0\xe1\x81\x73\x05w\x07contentm\x00\x00\x00\x02hi')
+        self.assertEqual(etf_loads(data),
+                         {'t': 'MESSAGE_CREATE', 'd': {'id': '392800398843183104', 'content': 'hi'}})
+
+        with self.assertRaises(ValueError):
+            etf_loads(data[:-1])
+
+    def test_integers(self):
+        # NOTE: term_to_binary([1, 2, 3]) is sent as STRING_EXT
+        self.assertEqual(etf_loads(b'\x83k\x00\x03\x01\x02\x03'), [1, 2, 3])
+
+        payload = {'timestamp': 1500000000000, 'negative': -1500000000000, 'id': 392800398843183104}
+        self.assertEqual(etf_loads(etf_dumps(payload)),
+                         {'timestamp': 1500000000000, 'negative': -1500000000000, 'id': '392800398843183104'})
+
+    def test_socket_decode(self):
+        socket = DiscordSocket('token', event_loop=None, encoding='etf')
+        self.assertIn('encoding=etf', socket.socket_url)
+
+        compressor = zlib.compressobj()
+        socket.inflator = ZlibStreamInflator()
+        for payload in RECORDED_PAYLOADS:
+            frame = compressor.compress(etf_dumps(payload)) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.assertEqual(socket._payload_decode(frame), payload)
+
+
+if __name__ == '__main__':
+    unittest.main()